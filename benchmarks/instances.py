@@ -0,0 +1,105 @@
+"""
+Instancias reproducibles para medir el rendimiento del solver.
+
+Cada instancia es una función sin argumentos que devuelve ``(piezas, base, altura)``.
+Las mezclas de figuras predeterminadas usan un generador aleatorio con semilla fija,
+así que producen siempre las mismas piezas.
+"""
+import random
+
+from src.models import PolygonPiece
+from src.utils.helpers import FIGURAS_PREDETERMINADAS, crear_pieza
+
+
+def mezcla_figuras(cantidad: int, base: float, altura: float, semilla: int = 0):
+    """
+    Mezcla de las doce figuras predeterminadas con tamaños aleatorios reproducibles.
+    """
+    rng = random.Random(semilla)
+    piezas = []
+    for i in range(cantidad):
+        nombre = FIGURAS_PREDETERMINADAS[i % len(FIGURAS_PREDETERMINADAS)]
+        pieza = crear_pieza(nombre, rng.uniform(6, 18), rng.uniform(5, 14))
+        pieza.etiqueta = f"Pieza {i+1}"
+        piezas.append(pieza)
+    return piezas, base, altura
+
+
+def _desde_vertices(tipos: list[tuple[str, list[tuple[float, float]], int]]):
+    piezas = []
+    for nombre, vertices, cantidad in tipos:
+        for _ in range(cantidad):
+            pieza = PolygonPiece(nombre, vertices)
+            pieza.etiqueta = f"Pieza {len(piezas)+1}"
+            piezas.append(pieza)
+    return piezas
+
+
+def estilo_jakobs():
+    """
+    Conjunto al estilo de las instancias Jakobs (rectángulos y piezas en L/T),
+    adaptado a nuestro formato; no es una copia exacta del conjunto original.
+    """
+    tipos = [
+        ("rect_a", [(0, 0), (12, 0), (12, 6), (0, 6)], 4),
+        ("rect_b", [(0, 0), (8, 0), (8, 8), (0, 8)], 3),
+        ("ele", [(0, 0), (10, 0), (10, 4), (4, 4), (4, 10), (0, 10)], 4),
+        ("te", [(0, 0), (12, 0), (12, 4), (8, 4), (8, 10), (4, 10), (4, 4), (0, 4)], 3),
+    ]
+    return _desde_vertices(tipos), 40, 40
+
+
+def estilo_shapes():
+    """
+    Conjunto al estilo de Shapes0/Shapes1 (piezas no convexas con entrantes),
+    adaptado a nuestro formato; no es una copia exacta del conjunto original.
+    """
+    tipos = [
+        ("cruz", [(4, 0), (8, 0), (8, 4), (12, 4), (12, 8), (8, 8), (8, 12), (4, 12), (4, 8), (0, 8), (0, 4), (4, 4)], 3),
+        ("u", [(0, 0), (12, 0), (12, 10), (8, 10), (8, 4), (4, 4), (4, 10), (0, 10)], 4),
+        ("flecha", [(0, 3), (8, 3), (8, 0), (14, 6), (8, 12), (8, 9), (0, 9)], 4),
+        ("triangulo", [(0, 0), (10, 0), (5, 9)], 5),
+    ]
+    return _desde_vertices(tipos), 50, 40
+
+
+def estilo_dighe():
+    """
+    Conjunto al estilo de Dighe (rompecabezas de piezas que encajan en un rectángulo),
+    adaptado a nuestro formato; no es una copia exacta del conjunto original.
+    """
+    tipos = [
+        ("dighe_a", [(0, 0), (10, 0), (10, 4), (6, 6), (10, 8), (10, 10), (0, 10)], 2),
+        ("dighe_b", [(0, 0), (10, 0), (10, 10), (0, 10), (0, 8), (4, 6), (0, 4)], 2),
+        ("dighe_c", [(0, 0), (20, 0), (20, 5), (0, 5)], 2),
+    ]
+    return _desde_vertices(tipos), 30, 30
+
+
+def encaje_exacto():
+    """
+    Dos cuadrados de 10 x 10 en una plancha de 20 x 10: la única posición del segundo
+    es un encaje exacto, al ras del primero y de los bordes. Debe resolverse en una
+    sola plancha con aprovechamiento del 100 %.
+    """
+    return _desde_vertices([("cuadrado", [(0, 0), (10, 0), (10, 10), (0, 10)], 2)]), 20, 10
+
+
+# Instancias de la suite rápida (pensada para ejecutarse en cada cambio)
+QUICK = {
+    "mezcla_12_60x60": lambda: mezcla_figuras(12, 60, 60, semilla=1),
+    "mezcla_24_60x60": lambda: mezcla_figuras(24, 60, 60, semilla=2),
+    "estilo_jakobs": estilo_jakobs,
+    "estilo_dighe": estilo_dighe,
+    "encaje_exacto": encaje_exacto,
+}
+
+# Instancias adicionales de la suite completa
+FULL = dict(QUICK, **{
+    "mezcla_36_80x60": lambda: mezcla_figuras(36, 80, 60, semilla=3),
+    "mezcla_48_100x100": lambda: mezcla_figuras(48, 100, 100, semilla=4),
+    "mezcla_72_60x60": lambda: mezcla_figuras(72, 60, 60, semilla=5),
+    "estilo_shapes": estilo_shapes,
+})
+
+SUITES = {"rapida": QUICK, "completa": FULL}
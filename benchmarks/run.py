@@ -0,0 +1,174 @@
+"""
+Ejecuta la suite de benchmarks y compara los resultados con una línea base.
+
+Uso::
+
+    python -m benchmarks.run                       # suite rápida, compara con baseline.json
+    python -m benchmarks.run --suite completa --salida resultados.json
+    python -m benchmarks.run --guardar-base        # registra la línea base actual
+    python -m benchmarks.run --motor genetico      # otro motor, con su propia línea base
+
+Termina con código 1 si alguna métrica empeora más allá de su umbral.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from src.core import SOLVER_VERSION
+from src.core.multi_sheet import solve_sheets
+from src.core.solvers import SOLVERS
+from src.core.stats import merge_stats
+from .instances import SUITES
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def baseline_path(motor: str):
+    """
+    Línea base de un motor: ``baseline.json`` para GRASP y ``baseline_<motor>.json``
+    para los demás.
+    """
+    if motor == "grasp":
+        return BASELINE_PATH
+    return os.path.join(os.path.dirname(__file__), f"baseline_{motor}.json")
+
+# Umbrales de regresión por métrica: (dirección, tolerancia relativa, tolerancia absoluta).
+# "menor" significa que un valor más bajo es mejor.
+THRESHOLDS = {
+    "tiempo": ("menor", 0.30, 0.05),
+    "llamadas_nfp": ("menor", 0.10, 0),
+    "planchas": ("menor", 0.0, 0),
+    "aprovechamiento": ("mayor", 0.0, 1.0),
+}
+
+
+def run_instance(nombre: str, fabrica, seed: int = 0, iterations: int = 3, motor: str = "grasp"):
+    """
+    Resuelve una instancia con semilla fija y devuelve sus métricas.
+
+    :rtype: dict
+    """
+    piezas, base, altura = fabrica()
+    area_plancha = base * altura
+    start = time.perf_counter()
+    resultados = [r for _, r in solve_sheets(
+        piezas, base, altura, solver=motor, seed=seed, iterations=iterations, stats=True
+    )]
+    elapsed = time.perf_counter() - start
+    stats = merge_stats([r["stats"] for r in resultados])
+
+    desperdicio = sum(r["waste"] for r in resultados)
+    return {
+        "instancia": nombre,
+        "piezas": len(piezas),
+        "tiempo": elapsed,
+        "llamadas_nfp": stats["contadores"].get("nfp_calculados", 0),
+        "contadores": stats["contadores"],
+        "planchas": len(resultados),
+        "aprovechamiento": (1 - desperdicio / (area_plancha * len(resultados))) * 100 if resultados else 0.0,
+        "sin_colocar": len(resultados[-1]["not_placed"]) if resultados else len(piezas),
+    }
+
+
+def run_suite(suite: str, seed: int = 0, iterations: int = 3, repeticiones: int = 1, motor: str = "grasp"):
+    """
+    Ejecuta todas las instancias de una suite. Con varias repeticiones se conserva
+    el menor tiempo (las demás métricas son deterministas con semilla fija).
+
+    :rtype: dict
+    """
+    metricas = {}
+    for nombre, fabrica in SUITES[suite].items():
+        mejor = None
+        for _ in range(repeticiones):
+            medida = run_instance(nombre, fabrica, seed, iterations, motor)
+            if mejor is None or medida["tiempo"] < mejor["tiempo"]:
+                mejor = medida
+        metricas[nombre] = mejor
+        print(
+            f"{nombre:<22} {mejor['tiempo']:8.3f} s  nfp={mejor['llamadas_nfp']:<7} "
+            f"planchas={mejor['planchas']:<3} aprovechamiento={mejor['aprovechamiento']:.2f}%"
+        )
+    return {
+        "suite": suite,
+        "motor": motor,
+        "semilla": seed,
+        "iteraciones": iterations,
+        "version_solver": SOLVER_VERSION,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "instancias": metricas,
+    }
+
+
+def compare(actual: dict, base: dict):
+    """
+    Compara las métricas actuales con la línea base.
+
+    :return: Lista de regresiones encontradas (mensajes legibles)
+    :rtype: list[str]
+    """
+    regresiones = []
+    for nombre, medida in actual["instancias"].items():
+        referencia = base.get("instancias", {}).get(nombre)
+        if referencia is None:
+            continue
+        for metrica, (direccion, relativa, absoluta) in THRESHOLDS.items():
+            valor, previo = medida[metrica], referencia[metrica]
+            margen = max(abs(previo) * relativa, absoluta)
+            if direccion == "menor" and valor > previo + margen:
+                regresiones.append(f"{nombre}: {metrica} subió de {previo:.3f} a {valor:.3f}")
+            elif direccion == "mayor" and valor < previo - margen:
+                regresiones.append(f"{nombre}: {metrica} bajó de {previo:.3f} a {valor:.3f}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento del solver de cortes.")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="rapida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--motor", choices=sorted(SOLVERS), default="grasp", help="Motor de colocación")
+    parser.add_argument("--iterations", type=int, default=3, help="Iteraciones (o generaciones) del motor por plancha")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Repeticiones por instancia (se usa el menor tiempo)")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde escribir los resultados")
+    parser.add_argument("--base", default=None, help="Línea base con la que comparar (por defecto, la del motor)")
+    parser.add_argument("--guardar-base", action="store_true", help="Guardar los resultados como nueva línea base")
+    args = parser.parse_args(argv)
+
+    actual = run_suite(args.suite, args.seed, args.iterations, args.repeticiones, args.motor)
+    if args.base is None:
+        args.base = baseline_path(args.motor)
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump(actual, f, indent=4)
+
+    if args.guardar_base:
+        with open(args.base, "w") as f:
+            json.dump(actual, f, indent=4)
+        print(f"Línea base guardada en {args.base}")
+        return 0
+
+    if not os.path.exists(args.base):
+        print("No hay línea base; ejecuta con --guardar-base para registrarla.")
+        return 0
+    with open(args.base, "r") as f:
+        base = json.load(f)
+    clave = (base.get("suite"), base.get("motor", "grasp"), base.get("semilla"), base.get("iteraciones"))
+    if clave != (args.suite, args.motor, args.seed, args.iterations):
+        print("La línea base se registró con otra suite, motor, semilla o iteraciones; no se compara.")
+        return 0
+
+    regresiones = compare(actual, base)
+    for mensaje in regresiones:
+        print(f"REGRESIÓN {mensaje}")
+    if not regresiones:
+        print("Sin regresiones respecto de la línea base.")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
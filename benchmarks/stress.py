@@ -0,0 +1,196 @@
+"""
+Arnés de escalamiento y memoria para el solver.
+
+Genera cargas sintéticas (polígonos convexos y cóncavos aleatorios con cantidad de
+vértices configurable) y mide tiempo y memoria pico (tracemalloc) de cada etapa para
+distintas cantidades de piezas. Cuando una etapa supera el límite de tiempo deja de
+medirse para cantidades mayores.
+
+tracemalloc solo registra memoria reservada por Python; la geometría interna de
+GEOS (shapely) no aparece en la memoria pico.
+
+Uso::
+
+    python -m benchmarks.stress --cantidades 100 500 2000 --salida escalamiento.csv --grafico escalamiento.png
+"""
+import argparse
+import csv
+import math
+import random
+import time
+import tracemalloc
+
+from src.core import GraspSolver
+from src.core.multi_sheet import solve_sheets
+from src.models import Frame, PolygonPiece
+
+
+DEFAULT_COUNTS = [100, 200, 500, 1000, 2000, 5000, 10000, 20000]
+
+
+def poligono_convexo(rng: random.Random, vertices: int, tamano: float):
+    """
+    Polígono convexo aleatorio: puntos sobre una elipse en ángulos ordenados.
+    """
+    angulos = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertices))
+    rx, ry = tamano / 2, tamano / 2 * rng.uniform(0.5, 1.0)
+    return [(rx + rx * math.cos(a), ry + ry * math.sin(a)) for a in angulos]
+
+
+def poligono_concavo(rng: random.Random, vertices: int, tamano: float):
+    """
+    Polígono cóncavo aleatorio en forma de estrella: radios alternos grandes y pequeños.
+    """
+    vertices = max(vertices, 6)
+    r = tamano / 2
+    puntos = []
+    for i in range(vertices):
+        a = 2 * math.pi * i / vertices
+        radio = r if i % 2 == 0 else r * rng.uniform(0.35, 0.7)
+        puntos.append((r + radio * math.cos(a), r + radio * math.sin(a)))
+    return puntos
+
+
+def generar_piezas(
+    cantidad: int,
+    semilla: int = 0,
+    vertices: tuple[int, int] = (3, 12),
+    tamano: tuple[float, float] = (4.0, 14.0),
+    proporcion_concavas: float = 0.3,
+):
+    """
+    Genera una carga sintética reproducible de piezas poligonales.
+
+    :param cantidad: Número de piezas
+    :param semilla: Semilla del generador aleatorio
+    :param vertices: Rango (mínimo, máximo) de vértices por pieza
+    :param tamano: Rango (mínimo, máximo) del tamaño de cada pieza
+    :param proporcion_concavas: Fracción de piezas cóncavas
+    :rtype: list[PolygonPiece]
+    """
+    rng = random.Random(semilla)
+    piezas = []
+    for i in range(cantidad):
+        n = rng.randint(*vertices)
+        lado = rng.uniform(*tamano)
+        if rng.random() < proporcion_concavas:
+            nombre, coords = "concava", poligono_concavo(rng, n, lado)
+        else:
+            nombre, coords = "convexa", poligono_convexo(rng, max(n, 3), lado)
+        pieza = PolygonPiece(nombre, coords)
+        pieza.scale_to_size(lado, lado)
+        pieza.etiqueta = f"Pieza {i+1}"
+        piezas.append(pieza)
+    return piezas
+
+
+def medir(etapa, funcion):
+    """
+    Ejecuta ``funcion`` midiendo tiempo y memoria pico con tracemalloc.
+
+    :return: Tupla ``(resultado, fila)``
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        resultado = funcion()
+    finally:
+        elapsed = time.perf_counter() - start
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return resultado, {"etapa": etapa, "tiempo": elapsed, "memoria_pico_mb": pico / 2**20}
+
+
+def run(
+    cantidades: list[int],
+    base: float = 200.0,
+    altura: float = 200.0,
+    limite: float = 120.0,
+    semilla: int = 0,
+    vertices: tuple[int, int] = (3, 12),
+):
+    """
+    Mide cada etapa para cada cantidad de piezas.
+
+    Etapas: generación de la carga, una plancha con ``GraspSolver`` (una iteración)
+    y el flujo completo de múltiples planchas.
+
+    :return: Filas con ``piezas``, ``etapa``, ``tiempo`` y ``memoria_pico_mb``
+    :rtype: list[dict]
+    """
+    filas = []
+    agotadas = set()
+    for cantidad in sorted(cantidades):
+        piezas, fila = medir("generacion", lambda: generar_piezas(cantidad, semilla, vertices))
+        etapas = [
+            ("grasp_una_plancha", lambda: GraspSolver(piezas, [Frame(base, altura)], iterations=1, seed=semilla).solve()),
+            ("multiplancha", lambda: list(solve_sheets(piezas, base, altura, iterations=1, seed=semilla))),
+        ]
+        mediciones = [fila]
+        for etapa, funcion in etapas:
+            if etapa in agotadas:
+                continue
+            _, fila = medir(etapa, funcion)
+            mediciones.append(fila)
+            if fila["tiempo"] > limite:
+                agotadas.add(etapa)
+
+        for fila in mediciones:
+            fila["piezas"] = cantidad
+            filas.append(fila)
+            print(f"{cantidad:>6} {fila['etapa']:<18} {fila['tiempo']:10.3f} s {fila['memoria_pico_mb']:10.2f} MB")
+    return filas
+
+
+def graficar(filas: list[dict], path: str):
+    """
+    Dibuja las curvas de escalamiento (tiempo y memoria pico frente a piezas, en escala log-log).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_t, ax_m) = plt.subplots(1, 2, figsize=(12, 5))
+    for etapa in dict.fromkeys(f["etapa"] for f in filas):
+        puntos = [f for f in filas if f["etapa"] == etapa]
+        x = [f["piezas"] for f in puntos]
+        ax_t.plot(x, [f["tiempo"] for f in puntos], marker="o", label=etapa)
+        ax_m.plot(x, [f["memoria_pico_mb"] for f in puntos], marker="o", label=etapa)
+
+    for ax, titulo, unidad in ((ax_t, "Tiempo por etapa", "s"), (ax_m, "Memoria pico por etapa", "MB")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_title(titulo)
+        ax.set_xlabel("Piezas")
+        ax.set_ylabel(unidad)
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arnés de escalamiento y memoria del solver.")
+    parser.add_argument("--cantidades", type=int, nargs="+", default=DEFAULT_COUNTS)
+    parser.add_argument("--base", type=float, default=200.0)
+    parser.add_argument("--altura", type=float, default=200.0)
+    parser.add_argument("--vertices", type=int, nargs=2, default=(3, 12), metavar=("MIN", "MAX"))
+    parser.add_argument("--limite", type=float, default=120.0, help="Segundos a partir de los cuales una etapa deja de medirse")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--salida", default="escalamiento.csv", help="CSV con las mediciones")
+    parser.add_argument("--grafico", default=None, help="Imagen con las curvas de escalamiento")
+    args = parser.parse_args(argv)
+
+    filas = run(args.cantidades, args.base, args.altura, args.limite, args.seed, tuple(args.vertices))
+    with open(args.salida, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["piezas", "etapa", "tiempo", "memoria_pico_mb"])
+        writer.writeheader()
+        writer.writerows(filas)
+    if args.grafico:
+        graficar(filas, args.grafico)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,33 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from src.core.grasp_solver import GraspSolver
-from src.models import Frame, PolygonPiece
+from src.core.common_line import common_line_savings
+from src.core.costing import CostIndex
+from src.core.multi_sheet import solve_sheets
+from src.core.repair import repair_solution
+from src.core.result_cache import ResultCache
+from src.core.toolpath import plan_sheet
+from src.models import PieceLibrary, PolygonPiece
 from src.core.placement_visualizer import PlacementVisualizer
+from src.utils.cad_import import importar_cad
+from src.utils.cnc_export import exportar_dxf, exportar_gcode
+from src.utils.helpers import FIGURAS_PREDETERMINADAS, cabe_en_plancha, cordenada_forma, crear_pieza, firma_tipo
+from src.utils.order_import import expandir_tipos, importar_pedido
+from src.utils.pdf_export import exportar_pdf
+from src.utils.solution_io import load_solution, save_solution
+from src.utils.xlsx_export import exportar_xlsx
 from shapely.geometry import Polygon
 import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
 
 
 from openpyxl import Workbook
 from tkinter import filedialog
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
-from io import BytesIO
 from tkinter import messagebox
 
 # Lista global para almacenar las piezas añadidas al sistema
@@ -26,32 +38,17 @@ figuras_en_sistema = []
 planchas = []  # Lista de frames (plancha)
 resultados_planchas = []  # Lista de resultados por plancha
 indice_plancha_actual = 0  # Índice de la plancha mostrada
-
-def cordenada_forma(name):
-    """
-    Retorna las coordenadas de los vértices para cada tipo de figura predeterminada.
-    Las coordenadas están normalizadas para que todas las figuras tengan un tamaño similar.
-    
-    :param name: Nombre de la figura
-    :type name: str
-    :return: Lista de tuplas (x,y) representando los vértices de la figura
-    :rtype: list[tuple[float, float]]
-    """
-    shapes = {
-        "rectangulo": [(10, 10), (70, 10), (70, 40), (10, 40)],
-        "cuadrado": [(10, 10), (50, 10), (50, 50), (10, 50)],
-        "triangulo": [(30, 5), (55, 50), (5, 50)],
-        "pentagono": [(30, 5), (60, 20), (50, 50), (10, 50), (0, 20)],
-        "hexagono": [(20, 5), (60, 5), (75, 30), (60, 55), (20, 55), (5, 30)],
-        "rombo": [(30, 5), (55, 30), (30, 55), (5, 30)],
-        "punta": [(30, 5), (60, 15), (30, 25), (0, 15)],
-        "trapecio": [(20, 10), (50, 10), (60, 50), (10, 50)],
-        "trapezoide": [(10, 10), (60, 10), (50, 50), (20, 50)],
-        "trapecio_inclinado": [(10, 10), (70, 10), (60, 50), (0, 50)],
-        "escalera": [(10, 10), (40, 10), (40, 25), (70, 25), (70, 50), (10, 50)],
-        "figura_L": [(10, 10), (30, 10), (30, 40), (60, 40), (60, 60), (10, 60)]
-    }
-    return shapes.get(name, [])
+simulacion_en_curso = None  # Simulación cuyo hilo sigue calculando planchas (cola y señal de cancelación)
+cache_resultados = None  # Caché en disco de trabajos ya resueltos (se crea al simular)
+exportacion_en_curso = False  # Evita lanzar dos exportaciones de PDF a la vez
+biblioteca_piezas = None  # Biblioteca de formas personalizadas (se abre al usarla)
+indice_costos = None  # Precios de las piezas del sistema (se recrea al cambiar la lista)
+vistas_planchas = {}  # Figuras ya dibujadas, por índice de plancha
+vista_actual = None  # Figura de la plancha visible
+controles_grafico = None  # Botones de zoom y pan (se crean con la primera plancha)
+TOLERANCIA_LINEA_COMUN = 0.01  # Distancia (cm) para considerar dos aristas la misma línea de corte
+MOTORES = {"GRASP": "grasp", "Genético": "genetico", "Portafolio": "portafolio"}  # Etiqueta -> motor del registro
+TIEMPO_PORTAFOLIO = 30.0  # Plazo (s) del portafolio cuando no se indica un tiempo máximo
 
 def agregar_figura_sistema(nombre, ancho=None, alto=None, cantidad=1):
     """
@@ -73,34 +70,39 @@ def agregar_figura_sistema(nombre, ancho=None, alto=None, cantidad=1):
         messagebox.showerror("Error", "Debes ingresar primero la base y altura  de la plancha antes de agregar piezas.")
         return
 
-    for _ in range(int(cantidad)):
-        pieza = PolygonPiece(nombre, coords)
-        # Escalar al tamaño especificado
-        if ancho is not None and alto is not None:
-            pieza.scale_to_size(float(ancho), float(alto))
-        else:
-            pieza.scale_to_size(8, 8)  # Tamaño por defecto
-        # Asignar precio por metro cuadrado
-        try:
-            precio_plancha = float(entry_precio_m2.get())
-        except:
-            precio_plancha = 0
-        pieza.precio_m2 = precio_plancha
+    # Asignar precio por metro cuadrado
+    try:
+        precio_plancha = float(entry_precio_m2.get())
+    except:
+        precio_plancha = 0
 
-        # Etiqueta opcional (puedes ajustarla si quieres)
-        pieza.etiqueta = f"Pieza {len(figuras_en_sistema)+1}"
+    nuevas = []
+    for _ in range(int(cantidad)):
+        pieza = crear_pieza(nombre, ancho, alto, precio_plancha)
 
-        # Validar que la pieza cabe en la plancha
-        minx, miny, maxx, maxy = pieza.polygon.bounds
-        if maxx > base_plancha or maxy > altura_plancha or minx < 0 or miny < 0:
+        # Validar que la pieza cabe en la plancha (todas las copias son iguales)
+        if not cabe_en_plancha(pieza, base_plancha, altura_plancha):
             messagebox.showerror(
                 "Error",
-                f"La pieza '{pieza.etiqueta}' excede los límites de la plancha ({base_plancha} x {altura_plancha}).\nNo se agregará."
+                f"La pieza '{nombre}' excede los límites de la plancha ({base_plancha} x {altura_plancha}).\nNo se agregará."
             )
-            continue
+            break
 
-        figuras_en_sistema.append(pieza)
+        nuevas.append(pieza)
+
+    agregar_piezas_sistema(nuevas)
 
+def agregar_piezas_sistema(piezas):
+    """
+    Agrega varias piezas al sistema de una vez, asignándoles su identificador
+    (Pieza 1, Pieza 2, ...), y refresca la lista una sola vez al final.
+
+    :param piezas: Piezas ya creadas y validadas
+    :type piezas: list[PolygonPiece]
+    """
+    for pieza in piezas:
+        pieza.etiqueta = f"Pieza {len(figuras_en_sistema)+1}"
+        figuras_en_sistema.append(pieza)
     actualizar_lista_piezas()
 
 def crear_label_figura(parent, nombre, color):
@@ -276,12 +278,53 @@ def abrir_ventana_datos(nombre_figura):
             messagebox.showerror("Error", "Por favor ingrese valores numéricos válidos")
     tk.Button(ventana, text="Aceptar", command=calcular_dimensiones).pack(pady=10)
 
+def obtener_separacion():
+    """
+    Distancia mínima entre piezas ingresada (ancho de corte más separación); 0 si
+    el campo está vacío o no es un número.
+
+    :rtype: float
+    """
+    try:
+        return max(float(entry_separacion.get()), 0.0)
+    except ValueError:
+        return 0.0
+
+def obtener_motor():
+    """
+    Motor elegido para la simulación y sus parámetros adicionales. El genético y el
+    portafolio reparten el trabajo en un pool de procesos cuando el sistema usa
+    ``fork`` (con ``spawn`` el arranque de los procesos cuesta más de lo que ahorra).
+
+    :return: Tupla ``(motor, parametros)`` para ``solve_sheets``
+    :rtype: tuple[str, dict]
+    """
+    motor = MOTORES.get(combo_motor.get(), "grasp")
+    if motor == "grasp":
+        return motor, {}
+    workers = min(4, os.cpu_count() or 1) if multiprocessing.get_start_method() == "fork" else 0
+    return motor, {"workers": workers}
+
+def obtener_tiempo_limite(motor):
+    """
+    Tiempo máximo de la simulación en segundos (para todas las planchas). Vacío
+    significa sin límite, salvo en el portafolio, que sin plazo esperaría siempre al
+    motor más lento y usa ``TIEMPO_PORTAFOLIO``.
+
+    :rtype: float or None
+    """
+    try:
+        return max(float(entry_tiempo.get()), 0.0)
+    except ValueError:
+        return TIEMPO_PORTAFOLIO if motor == "portafolio" else None
+
 def guardar_json():
     datos = {
         "plancha": {
             "base": float(entry_base.get()),
             "altura": float(entry_altura.get()),
-            "precio_m2": float(entry_precio_m2.get())
+            "precio_m2": float(entry_precio_m2.get()),
+            "separacion": obtener_separacion()
         },
         "piezas": [
             {
@@ -315,21 +358,194 @@ def cargar_json():
         if "precio_m2" in datos["plancha"]:
             entry_precio_m2.delete(0, tk.END)
             entry_precio_m2.insert(0, datos["plancha"]["precio_m2"])
-
-        # Cargar piezas
+        entry_separacion.delete(0, tk.END)
+        entry_separacion.insert(0, datos["plancha"].get("separacion", 0))
+
+        # Cargar piezas (la lista se refresca una sola vez al final)
+        base = float(datos["plancha"]["base"])
+        altura = float(datos["plancha"]["altura"])
+        precio_m2 = float(datos["plancha"].get("precio_m2", 0))
+        piezas, rechazadas = [], []
+        for i, pieza_data in enumerate(datos["piezas"]):
+            pieza = crear_pieza(pieza_data["nombre"], pieza_data["ancho"], pieza_data["alto"], precio_m2)
+            if pieza is None or not cabe_en_plancha(pieza, base, altura):
+                rechazadas.append(f"{i+1}: {pieza_data['nombre']}")
+                continue
+            piezas.append(pieza)
         figuras_en_sistema.clear()
-        for pieza_data in datos["piezas"]:
-            agregar_figura_sistema(
-                pieza_data["nombre"],
-                pieza_data["ancho"],
-                pieza_data["alto"]
+        agregar_piezas_sistema(piezas)
+        if rechazadas:
+            messagebox.showwarning(
+                "Advertencia",
+                f"No se agregaron {len(rechazadas)} piezas (figura desconocida o más grande que la plancha):\n"
+                + "\n".join(rechazadas[:20]) + ("\n..." if len(rechazadas) > 20 else "")
             )
-        actualizar_lista_piezas()
         messagebox.showinfo("Éxito", "Datos cargados desde JSON.")
     except Exception as e:
         messagebox.showerror("Error", f"No se pudo cargar el archivo: {str(e)}")
 
 
+def importar_pedido_archivo():
+    """
+    Agrega al sistema las piezas de un pedido CSV o XLSX. Las filas con problemas
+    se informan juntas al final, en un solo mensaje.
+    """
+    archivo = filedialog.askopenfilename(
+        filetypes=[("Pedidos", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")],
+        title="Importar pedido"
+    )
+    if not archivo:
+        return
+    try:
+        base = float(entry_base.get())
+        altura = float(entry_altura.get())
+    except ValueError:
+        messagebox.showerror("Error", "Debes ingresar primero la base y altura  de la plancha antes de agregar piezas.")
+        return
+    try:
+        precio_m2 = float(entry_precio_m2.get())
+    except ValueError:
+        precio_m2 = 0.0
+
+    try:
+        tipos, errores = importar_pedido(archivo, base, altura, precio_m2)
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo importar el pedido: {str(e)}")
+        return
+
+    piezas = expandir_tipos(tipos)
+    agregar_piezas_sistema(piezas)
+    mensaje = f"Se agregaron {len(piezas)} piezas de {len(tipos)} tipos."
+    if errores:
+        mensaje += f"\n\n{len(errores)} filas con errores:\n" + "\n".join(errores[:20])
+        if len(errores) > 20:
+            mensaje += "\n..."
+        messagebox.showwarning("Pedido importado con errores", mensaje)
+    else:
+        messagebox.showinfo("Éxito", mensaje)
+
+def importar_cad_archivo():
+    """
+    Agrega al sistema las piezas de un archivo SVG o DXF. Las curvas se aplanan y cada
+    contorno se simplifica hacia afuera a un máximo de vértices, para que los NFP no
+    se vuelvan costosos. Las formas también se guardan en la biblioteca.
+    """
+    archivo = filedialog.askopenfilename(
+        filetypes=[("Dibujos CAD", "*.svg *.dxf"), ("SVG", "*.svg"), ("DXF", "*.dxf")],
+        title="Importar piezas CAD"
+    )
+    if not archivo:
+        return
+    try:
+        base = float(entry_base.get())
+        altura = float(entry_altura.get())
+    except ValueError:
+        messagebox.showerror("Error", "Debes ingresar primero la base y altura  de la plancha antes de agregar piezas.")
+        return
+    try:
+        precio_m2 = float(entry_precio_m2.get())
+    except ValueError:
+        precio_m2 = 0.0
+
+    try:
+        piezas, avisos = importar_cad(archivo)
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo importar el archivo: {str(e)}")
+        return
+
+    aceptadas = []
+    for pieza in piezas:
+        if cabe_en_plancha(pieza, base, altura):
+            pieza.precio_m2 = precio_m2
+            aceptadas.append(pieza)
+        else:
+            avisos.append(f"{pieza.name}: excede la plancha ({base} x {altura})")
+    agregar_piezas_sistema(aceptadas)
+    if aceptadas:
+        obtener_biblioteca().save_many(aceptadas)
+    mensaje = f"Se agregaron {len(aceptadas)} piezas."
+    if avisos:
+        mensaje += "\n\n" + "\n".join(avisos[:20]) + ("\n..." if len(avisos) > 20 else "")
+        messagebox.showwarning("Piezas importadas con avisos", mensaje)
+    else:
+        messagebox.showinfo("Éxito", mensaje)
+
+def guardar_solucion():
+    """
+    Guarda la solución completa (planchas y colocaciones) para poder abrirla después
+    sin volver a simular. Con extensión ``.npz`` se usa el formato binario para trabajos grandes.
+    """
+    if not resultados_planchas:
+        messagebox.showwarning("Advertencia", "Primero ejecuta una simulación.")
+        return
+    if simulacion_en_curso is not None:
+        messagebox.showinfo("Simulación en curso", "Espera a que termine la simulación para guardar la solución.")
+        return
+    archivo = filedialog.asksaveasfilename(
+        defaultextension=".json",
+        filetypes=[("Solución JSON", "*.json"), ("Solución binaria", "*.npz")],
+        title="Guardar solución"
+    )
+    if not archivo:
+        return
+    try:
+        try:
+            precio_m2 = float(entry_precio_m2.get())
+        except ValueError:
+            precio_m2 = 0.0
+        save_solution(archivo, planchas, resultados_planchas, precio_m2)
+        messagebox.showinfo("Éxito", "Solución guardada.")
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo guardar la solución: {str(e)}")
+
+def cargar_solucion():
+    """
+    Carga una solución guardada y la muestra directamente, sin ejecutar el solver.
+    Las piezas del sistema se reconstruyen a partir de la solución.
+    """
+    global planchas, resultados_planchas, indice_plancha_actual
+    archivo = filedialog.askopenfilename(
+        filetypes=[("Solución", "*.json *.npz")],
+        title="Cargar solución"
+    )
+    if not archivo:
+        return
+    try:
+        frames, results, meta = load_solution(archivo)
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo cargar la solución: {str(e)}")
+        return
+
+    cancelar_simulacion()
+    planchas = frames
+    resultados_planchas = results
+    indice_plancha_actual = 0
+    invalidar_vistas()
+
+    for entry, valor in (
+        (entry_base, meta["plancha"]["base"]),
+        (entry_altura, meta["plancha"]["altura"]),
+        (entry_precio_m2, meta["plancha"]["precio_m2"]),
+    ):
+        entry.delete(0, tk.END)
+        entry.insert(0, valor)
+
+    # Las piezas colocadas vuelven a su posición original para poder re-simular
+    figuras_en_sistema.clear()
+    for result in results:
+        for p in result["placements"]:
+            pieza = p.piece.move(-p.position[0], -p.position[1])
+            pieza.precio_m2 = p.piece.precio_m2
+            p.source = pieza
+            figuras_en_sistema.append(pieza)
+    if results:
+        figuras_en_sistema.extend(results[-1]["not_placed"])
+    actualizar_lista_piezas()
+
+    if resultados_planchas:
+        mostrar_plancha(0)
+
+
 def dibujar_figura(canvas, nombre, color):
     """
     Dibuja una figura en el canvas especificado.
@@ -346,67 +562,108 @@ def dibujar_figura(canvas, nombre, color):
 def actualizar_lista_piezas():
     """
     Muestra las piezas con su nombre, área y dibujo a color en el panel 'Piezas del sistema'.
+
+    La lista es virtual: solo se dibujan en el canvas las filas visibles, así que
+    refrescarla cuesta lo mismo con diez piezas que con miles.
+    """
+    global indice_costos
+    indice_costos = None
+    canvas_piezas.configure(scrollregion=(0, 0, ANCHO_LISTA, len(figuras_en_sistema) * ALTO_FILA))
+    filas_dibujadas["rango"] = None
+    dibujar_filas_visibles()
+
+def miniatura_pieza(pieza):
+    """
+    Coordenadas del dibujo de la pieza dentro de una fila, calculadas una sola vez
+    por tipo de pieza (misma forma y tamaño).
+
+    :rtype: list[tuple[float, float]]
+    """
+    minx, miny, maxx, maxy = pieza.polygon.bounds
+    clave = firma_tipo(pieza, (minx, miny))
+    coords = miniaturas_piezas.get(clave)
+    if coords is None:
+        scale = min(60 / (maxx - minx + 1e-5), 50 / (maxy - miny + 1e-5))
+        coords = [
+            ((x - minx) * scale + 10, (y - miny) * scale + 5)
+            for x, y in pieza.polygon.exterior.coords
+        ]
+        miniaturas_piezas[clave] = coords
+    return coords
+
+def dibujar_filas_visibles():
+    """
+    Dibuja solo las filas de la lista de piezas que están dentro del área visible.
     """
     colores = [
         "#FF9999", "#99CCFF", "#99FF99", "#FFCC99", "#CCCCFF", "#FFD699",
         "#E0B0FF", "#F7BE81", "#82CAFA", "#FFB6C1", "#B0E0E6", "#C3FDB8"
     ]
+    arriba = canvas_piezas.canvasy(0)
+    alto = max(canvas_piezas.winfo_height(), ALTO_FILA)
+    primera = max(int(arriba // ALTO_FILA), 0)
+    ultima = min(int((arriba + alto) // ALTO_FILA) + 1, len(figuras_en_sistema))
+    if filas_dibujadas["rango"] == (primera, ultima):
+        return
+    filas_dibujadas["rango"] = (primera, ultima)
 
-    for widget in scrollable_piezas.winfo_children():
-        widget.destroy()
-
-    for i, pieza in enumerate(figuras_en_sistema):
+    canvas_piezas.delete("fila")
+    for i in range(primera, ultima):
+        pieza = figuras_en_sistema[i]
         color = colores[i % len(colores)]
-        contenedor = tk.Frame(scrollable_piezas, bd=1, relief="solid", padx=4, pady=2)
-        contenedor.pack(fill="x", pady=3)
+        y0 = i * ALTO_FILA
+        etiquetas = ("fila", f"fila_{i}")
+        canvas_piezas.create_rectangle(2, y0 + 3, ANCHO_LISTA - 2, y0 + ALTO_FILA - 3, outline="black", tags=etiquetas)
 
         # Dibujo de la figura
-        canvas = tk.Canvas(contenedor, width=80, height=60, bg="white")
-        canvas.pack(side="left", padx=4)
-
-        # Obtener coordenadas normalizadas al canvas
-        coords = pieza.polygon.exterior.coords
-        min_x = min(x for x, y in coords)
-        min_y = min(y for x, y in coords)
-        max_x = max(x for x, y in coords)
-        max_y = max(y for x, y in coords)
-        scale = min(60 / (max_x - min_x + 1e-5), 50 / (max_y - min_y + 1e-5))
-
-        desplazada = [
-            ((x - min_x) * scale + 10, (y - min_y) * scale + 5)
-            for x, y in coords
-        ]
-
-        canvas.create_polygon(desplazada, fill=color, outline="black")
+        canvas_piezas.create_rectangle(6, y0 + 6, 86, y0 + 66, fill="white", tags=etiquetas)
+        desplazada = [(x, y + y0 + 6) for x, y in miniatura_pieza(pieza)]
+        canvas_piezas.create_polygon(desplazada, fill=color, outline="black", tags=etiquetas)
 
-        # Info textual y botón
-        info_frame = tk.Frame(contenedor)
-        info_frame.pack(side="left", fill="both", expand=True)
-
-        tk.Label(info_frame, text=f"Pieza {i+1}: {pieza.name}", font=("Arial", 9, "bold")).pack(anchor="w")
-        tk.Label(info_frame, text=f"Área: {pieza.polygon.area:.2f}", font=("Arial", 8)).pack(anchor="w")
+        # Info textual
         precio_total = pieza.polygon.area * getattr(pieza, "precio_m2", 0)
-        tk.Label(info_frame, text=f"Precio: {precio_total:.2f}", font=("Arial", 8)).pack(anchor="w")
-
+        canvas_piezas.create_text(92, y0 + 8, anchor="nw", text=f"Pieza {i+1}: {pieza.name}", font=("Arial", 9, "bold"), tags=etiquetas)
+        canvas_piezas.create_text(92, y0 + 24, anchor="nw", text=f"Área: {pieza.polygon.area:.2f}", font=("Arial", 8), tags=etiquetas)
+        canvas_piezas.create_text(92, y0 + 38, anchor="nw", text=f"Precio: {precio_total:.2f}", font=("Arial", 8), tags=etiquetas)
 
-        # Frame de botones
-        btn_frame = tk.Frame(info_frame)
-        btn_frame.pack(anchor="e", pady=2)
+        # Botones Editar y Eliminar
+        for x, texto, fondo, accion in ((170, "✏️", "#1E90FF", "btn_editar"), (200, "❌", "red", "btn_eliminar")):
+            canvas_piezas.create_rectangle(x, y0 + 44, x + 26, y0 + 66, fill=fondo, outline=fondo, tags=etiquetas + (accion,))
+            canvas_piezas.create_text(x + 13, y0 + 55, text=texto, fill="white", font=("Segoe UI Emoji", 10, "bold"), tags=etiquetas + (accion,))
 
-        def eliminar(idx=i):
-            confirm = messagebox.askyesno("Eliminar", f"¿Eliminar pieza {idx+1} ({pieza.name})?")
-            if confirm:
-                del figuras_en_sistema[idx]
-                actualizar_lista_piezas()
+def fila_seleccionada():
+    """
+    Índice de la pieza cuya fila contiene el elemento bajo el cursor.
+    """
+    for etiqueta in canvas_piezas.gettags("current"):
+        if etiqueta.startswith("fila_"):
+            return int(etiqueta[len("fila_"):])
+    return None
+
+def eliminar_pieza_seleccionada(event=None):
+    idx = fila_seleccionada()
+    if idx is None:
+        return
+    confirm = messagebox.askyesno("Eliminar", f"¿Eliminar pieza {idx+1} ({figuras_en_sistema[idx].name})?")
+    if confirm:
+        del figuras_en_sistema[idx]
+        actualizar_lista_piezas()
+        reparar_resultados()
 
-        def editar(idx=i):
-            editar_pieza(idx)
+def editar_pieza_seleccionada(event=None):
+    idx = fila_seleccionada()
+    if idx is not None:
+        editar_pieza(idx)
 
-        # Botón Editar
-        tk.Button(btn_frame, text="✏️", command=editar, fg="white", bg="#1E90FF", font=("Segoe UI Emoji", 10, "bold")).pack(side="left", padx=2)
+def desplazar_lista(*args):
+    canvas_piezas.yview(*args)
+    dibujar_filas_visibles()
 
-        # Botón Eliminar
-        tk.Button(btn_frame, text="❌", command=eliminar,  fg="white", bg="red", font=("Segoe UI Emoji", 10, "bold")).pack(side="left", padx=2)
+def rueda_lista(event):
+    if event.num == 4 or event.delta > 0:
+        desplazar_lista("scroll", -1, "units")
+    else:
+        desplazar_lista("scroll", 1, "units")
 
 def editar_pieza(idx):
     pieza = figuras_en_sistema[idx]
@@ -512,6 +769,7 @@ def editar_pieza(idx):
 
             ventana.destroy()
             actualizar_lista_piezas()
+            reparar_resultados()
 
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo guardar: {str(e)}")
@@ -519,6 +777,31 @@ def editar_pieza(idx):
     tk.Button(ventana, text="Guardar cambios", command=guardar_cambios).pack(pady=10)
 
 
+def reparar_resultados():
+    """
+    Actualiza la simulación mostrada después de editar o eliminar una pieza.
+    Solo se mueven las piezas afectadas; si la solución no se puede reparar
+    se vuelve a simular todo.
+    """
+    global planchas, resultados_planchas
+    if not resultados_planchas or simulacion_en_curso is not None:
+        return
+    try:
+        reparada = repair_solution(planchas, resultados_planchas, figuras_en_sistema, spacing=obtener_separacion())
+    except Exception:
+        reparada = None
+    if reparada is None:
+        simular()
+        return
+
+    planchas, resultados_planchas = reparada
+    invalidar_vistas()
+    if not resultados_planchas:
+        for widget in frame_resultados.winfo_children():
+            widget.destroy()
+        return
+    mostrar_plancha(min(indice_plancha_actual, len(resultados_planchas) - 1))
+
 def abrir_ventana_dibujo():
     ventana = tk.Toplevel()
     ventana.title("Dibujar figura personalizada")
@@ -581,91 +864,282 @@ def abrir_ventana_datos_personalizada(puntos_canvas, canvas_size):
             pieza.scale_to_unit()
             pieza.scale_to_size(width, height)
 
-            figuras_en_sistema.append(pieza)
-            actualizar_lista_piezas()
+            if guardar_en_biblioteca.get() and nombre:
+                obtener_biblioteca().save(pieza)
+            agregar_piezas_sistema([pieza])
             ventana.destroy()
 
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un problema: {str(e)}")
 
+    guardar_en_biblioteca = tk.BooleanVar(value=True)
+    tk.Checkbutton(ventana, text="Guardar en la biblioteca de piezas", variable=guardar_en_biblioteca).pack()
+
     tk.Button(ventana, text="Agregar figura", command=agregar_figura).pack(pady=5)
 
+def obtener_biblioteca():
+    """
+    Biblioteca de formas personalizadas del usuario (se abre la primera vez que se usa).
+
+    :rtype: PieceLibrary
+    """
+    global biblioteca_piezas
+    if biblioteca_piezas is None:
+        biblioteca_piezas = PieceLibrary()
+    return biblioteca_piezas
+
+def abrir_ventana_biblioteca():
+    """
+    Lista las formas de la biblioteca para agregarlas al sistema con el tamaño y la
+    cantidad indicados. También permite importar y exportar el formato de texto.
+    """
+    try:
+        biblioteca = obtener_biblioteca()
+    except Exception as e:
+        messagebox.showerror("Error", f"No se pudo abrir la biblioteca de piezas: {str(e)}")
+        return
+
+    ventana = tk.Toplevel()
+    ventana.title("Biblioteca de piezas")
+
+    lista = tk.Listbox(ventana, width=40, height=15)
+    lista.pack(padx=10, pady=5)
+
+    def refrescar():
+        lista.delete(0, tk.END)
+        for entrada in biblioteca.entries():
+            lista.insert(tk.END, entrada["nombre"])
+
+    entradas = {}
+    for campo in ("ancho", "alto", "cantidad"):
+        tk.Label(ventana, text=f"{campo.capitalize()}:").pack()
+        entradas[campo] = tk.Entry(ventana)
+        entradas[campo].pack()
+    entradas["cantidad"].insert(0, "1")
+
+    def agregar():
+        seleccion = lista.curselection()
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Selecciona una pieza de la biblioteca.")
+            return
+        try:
+            ancho = float(entradas["ancho"].get())
+            alto = float(entradas["alto"].get())
+            cantidad = int(entradas["cantidad"].get())
+            base_plancha = float(entry_base.get())
+            altura_plancha = float(entry_altura.get())
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingrese valores numéricos válidos (y las dimensiones de la plancha)")
+            return
+        try:
+            precio_m2 = float(entry_precio_m2.get())
+        except ValueError:
+            precio_m2 = 0.0
+
+        forma = biblioteca.get(lista.get(seleccion[0]))
+        forma.scale_to_size(ancho, alto)
+        if not cabe_en_plancha(forma, base_plancha, altura_plancha):
+            messagebox.showerror("Error", f"La pieza '{forma.name}' excede los límites de la plancha ({base_plancha} x {altura_plancha}).")
+            return
+        piezas = []
+        for _ in range(cantidad):
+            pieza = PolygonPiece(forma.name, list(forma.vertices))
+            pieza.precio_m2 = precio_m2
+            piezas.append(pieza)
+        agregar_piezas_sistema(piezas)
+
+    def importar_txt():
+        archivo = filedialog.askopenfilename(filetypes=[("Texto", "*.txt")], title="Importar formas")
+        if not archivo:
+            return
+        try:
+            n = biblioteca.import_txt(archivo)
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo importar el archivo: {str(e)}")
+            return
+        refrescar()
+        messagebox.showinfo("Éxito", f"Se importaron {n} formas.")
+
+    def exportar_txt():
+        archivo = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Texto", "*.txt")], title="Exportar formas")
+        if archivo:
+            n = biblioteca.export_txt(archivo)
+            messagebox.showinfo("Éxito", f"Se exportaron {n} formas.")
+
+    tk.Button(ventana, text="Agregar al sistema", command=agregar).pack(pady=5)
+    botones = tk.Frame(ventana)
+    botones.pack(pady=5)
+    tk.Button(botones, text="Importar .txt", command=importar_txt).pack(side="left", padx=2)
+    tk.Button(botones, text="Exportar .txt", command=exportar_txt).pack(side="left", padx=2)
+    refrescar()
+
 
 def simular():
     """
-    Ejecuta la simulación de colocación de piezas usando el algoritmo GRASP.
+    Ejecuta la simulación de colocación de piezas con el motor elegido (GRASP, genético
+    o el portafolio, que hace competir a varios motores en paralelo).
     Ahora soporta múltiples planchas: si una pieza no cabe en la plancha actual,
     se crea una nueva plancha y se intenta colocar ahí solo las piezas no colocadas.
+    Las planchas se calculan de una en una en un hilo aparte: la primera se muestra
+    apenas termina mientras las siguientes se siguen calculando, sin bloquear la ventana.
     La visualización permite navegar entre planchas generadas.
     """
-    global planchas, resultados_planchas, indice_plancha_actual
+    global planchas, resultados_planchas, indice_plancha_actual, simulacion_en_curso, cache_resultados, indice_costos
     if not figuras_en_sistema:
         messagebox.showwarning("Advertencia", "No hay piezas para simular")
         return
 
+    # Obtener dimensiones de la plancha ingresadas por el usuario
     try:
-        # Obtener dimensiones de la plancha ingresadas por el usuario
+        base = float(entry_base.get())
+        altura = float(entry_altura.get())
+    except ValueError:
+        messagebox.showerror("Error", "Ingresa valores numéricos válidos para base y altura de la plancha.")
+        return
+
+    # Si la plancha no cambió, la simulación anterior sirve de semilla para el solver
+    semillas = None
+    if planchas and planchas[0].width == base and planchas[0].height == altura:
+        semillas = resultados_planchas
+
+    # Inicializar variables para el manejo de múltiples planchas
+    planchas = []  # Lista de frames (una por cada plancha usada)
+    resultados_planchas = []  # Resultados de la simulación por plancha
+    indice_plancha_actual = 0  # Índice de la plancha mostrada
+    indice_costos = None  # El precio por m² pudo cambiar
+    invalidar_vistas()
+
+    # Los trabajos repetidos se recuperan de la caché sin volver a resolver
+    if cache_resultados is None:
         try:
-            base = float(entry_base.get())
-            altura = float(entry_altura.get())
-        except ValueError:
-            messagebox.showerror("Error", "Ingresa valores numéricos válidos para base y altura de la plancha.")
-            return
+            cache_resultados = ResultCache()
+        except OSError:
+            cache_resultados = None
+
+    # Solo se intentan colocar las piezas que no han sido colocadas en planchas anteriores
+    motor, parametros = obtener_motor()
+    generador = solve_sheets(
+        figuras_en_sistema[:], base, altura, cache=cache_resultados, seed_results=semillas,
+        time_limit=obtener_tiempo_limite(motor), solver=motor, spacing=obtener_separacion(), **parametros,
+    )
+    # El solver corre en un hilo aparte y entrega cada plancha por la cola; la
+    # interfaz la revisa con ``root.after`` y sigue respondiendo mientras tanto
+    simulacion = {"cola": queue.Queue(), "cancelada": threading.Event()}
+    simulacion_en_curso = simulacion
+    habilitar_acciones_simulacion(False)
+    threading.Thread(target=calcular_planchas, args=(generador, simulacion), daemon=True).start()
+    root.after(50, paso_simulacion, simulacion)
+
+def calcular_planchas(generador, simulacion):
+    """
+    Cuerpo del hilo de la simulación: recorre el generador de ``solve_sheets`` y pone
+    cada plancha en la cola. No toca la interfaz.
+    """
+    try:
+        for frame, result in generador:
+            if simulacion["cancelada"].is_set():
+                return
+            simulacion["cola"].put(("plancha", (frame, result)))
+        simulacion["cola"].put(("fin", None))
+    except Exception as e:
+        simulacion["cola"].put(("error", e))
+
+def cancelar_simulacion():
+    """
+    Descarta la simulación en curso: su hilo termina después de la plancha que está
+    calculando y sus resultados ya no se agregan.
+    """
+    global simulacion_en_curso
+    if simulacion_en_curso is not None:
+        simulacion_en_curso["cancelada"].set()
+    simulacion_en_curso = None
+    habilitar_acciones_simulacion(True)
+
+def habilitar_acciones_simulacion(habilitar):
+    """
+    Habilita o deshabilita los botones que no pueden usarse mientras el hilo de la
+    simulación sigue calculando planchas (simular de nuevo y guardar la solución).
+    Los botones de exportación del panel de resultados se revisan al redibujarlo.
+    """
+    estado = "normal" if habilitar else "disabled"
+    btn_simular.config(state=estado)
+    btn_guardar_solucion.config(state=estado)
 
-        # Inicializar variables para el manejo de múltiples planchas
-        piezas_restantes = figuras_en_sistema[:]  # Copia de las piezas a colocar
-        planchas = []  # Lista de frames (una por cada plancha usada)
-        resultados_planchas = []  # Resultados de la simulación por plancha
-        indice_plancha_actual = 0  # Índice de la plancha mostrada
-
-        # Límite de iteraciones para evitar bucles infinitos
-        max_iter = len(piezas_restantes)
-        iter_count = 0
-        while piezas_restantes and iter_count < max_iter:
-            # Crear una nueva plancha con las dimensiones del usuario
-            frame = Frame(base, altura)
-            # Solo se intentan colocar las piezas que no han sido colocadas en planchas anteriores
-            solver = GraspSolver(pieces=piezas_restantes, frames=[frame])
-            result = solver.solve()
-            planchas.append(frame)
-            resultados_planchas.append(result)
-            piezas_restantes = result["not_placed"]
-            if not result["placements"]:
-                break
-            iter_count += 1
-
-        # Mostrar la primera plancha si hay resultados
+def avanzar_simulacion():
+    """
+    Agrega a los resultados la siguiente plancha que terminó el hilo de la simulación,
+    sin esperarla: si todavía no hay ninguna lista se lanza ``queue.Empty``.
+
+    :return: True si se obtuvo una plancha nueva, False si la simulación terminó
+    :rtype: bool
+    """
+    global simulacion_en_curso
+    if simulacion_en_curso is None:
+        return False
+    tipo, valor = simulacion_en_curso["cola"].get_nowait()
+    if tipo == "plancha":
+        frame, result = valor
+        planchas.append(frame)
+        resultados_planchas.append(result)
+        return True
+    simulacion_en_curso = None
+    habilitar_acciones_simulacion(True)
+    if tipo == "error":
+        raise valor
+    return False
+
+def paso_simulacion(simulacion):
+    """
+    Revisa la cola de la simulación y se vuelve a programar con ``root.after``
+    mientras el hilo siga calculando; cada plancha nueva se muestra apenas llega.
+    """
+    if simulacion_en_curso is not simulacion:
+        return  # Simulación cancelada o reemplazada
+    try:
+        hay_nueva = avanzar_simulacion()
+    except queue.Empty:
+        root.after(50, paso_simulacion, simulacion)
+        return
+    except Exception as e:
+        messagebox.showerror("Error", f"Error durante la simulación: {str(e)}")
         if resultados_planchas:
+            actualizar_panel_resultados()
+        return
+
+    if hay_nueva:
+        if len(resultados_planchas) == 1:
             mostrar_plancha(0)
         else:
-            messagebox.showinfo("Resultado", "No se pudo colocar ninguna pieza")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error durante la simulación: {str(e)}")
+            actualizar_panel_resultados()
+        root.after(1, paso_simulacion, simulacion)
+    elif resultados_planchas:
+        actualizar_panel_resultados()
+    else:
+        messagebox.showinfo("Resultado", "No se pudo colocar ninguna pieza")
 
-def mostrar_plancha(indice):
+def invalidar_vistas():
     """
-    Muestra la visualización y resultados de la plancha en la posición 'indice'.
-    Permite navegar entre planchas usando los botones 'Anterior' y 'Siguiente'.
+    Descarta las figuras guardadas de las planchas. Se llama cuando los resultados
+    cambian (nueva simulación, reparación o carga de una solución).
     """
-    global indice_plancha_actual
-    if not resultados_planchas:
-        return
-    indice_plancha_actual = indice
-    result = resultados_planchas[indice]
-    frame = planchas[indice]
-    base = frame.width
-    altura = frame.height
-
-    # Limpiar el canvas del gráfico
+    global vista_actual, controles_grafico
+    for vista in vistas_planchas.values():
+        vista["canvas"].get_tk_widget().destroy()
+    vistas_planchas.clear()
+    vista_actual = None
     for widget in frame_grafico.winfo_children():
         widget.destroy()
+    controles_grafico = None
 
-    # Crear la visualización de la plancha actual
+def crear_vista_plancha(frame, result):
+    """
+    Crea la figura de una plancha con su propio canvas, zoom con la rueda del mouse
+    y los límites iniciales guardados para poder volver a ellos.
+
+    :rtype: dict
+    """
     fig = plt.Figure(figsize=(6, 6))
     canvas = FigureCanvasTkAgg(fig, master=frame_grafico)
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    # Guardar el eje para manipular el zoom
     ax = fig.add_subplot(111)
     visualizer = PlacementVisualizer(
         frames=[frame],
@@ -673,80 +1147,130 @@ def mostrar_plancha(indice):
         not_placed=result["not_placed"],
         waste=result["waste"]
     )
-    visualizer.visualize(fig, ax=ax)  # Modificamos PlacementVisualizer para aceptar ax opcional
+    visualizer.visualize(fig, ax=ax)
+    vista = {"canvas": canvas, "ax": ax, "result": result, "visualizer": visualizer}
+
+    def rueda(event):
+        # Zoom centrado en el cursor
+        if event.xdata is None or event.ydata is None:
+            return
+        zoom_vista(vista, 1.2 if event.button == "up" else 1/1.2, (event.xdata, event.ydata))
+
+    canvas.mpl_connect("scroll_event", rueda)
     canvas.draw()
+    return vista
 
-    # --- ZOOM Y PAN ---
-    # Estado de zoom y pan (guardado en el widget para persistencia entre clicks)
-    if not hasattr(canvas, 'zoom_level'):
-        canvas.zoom_level = 1.0
-    if not hasattr(canvas, 'zoom_xlim') or not hasattr(canvas, 'zoom_ylim'):
-        canvas.zoom_xlim = list(ax.get_xlim())
-        canvas.zoom_ylim = list(ax.get_ylim())
-
-    def zoom(factor):
-        canvas.zoom_level *= factor
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        xmid = (xlim[0] + xlim[1]) / 2
-        ymid = (ylim[0] + ylim[1]) / 2
-        xsize = (xlim[1] - xlim[0]) / factor
-        ysize = (ylim[1] - ylim[0]) / factor
-        new_xlim = [xmid - xsize/2, xmid + xsize/2]
-        new_ylim = [ymid - ysize/2, ymid + ysize/2]
-        ax.set_xlim(new_xlim)
-        ax.set_ylim(new_ylim)
-        canvas.zoom_xlim = new_xlim
-        canvas.zoom_ylim = new_ylim
-        canvas.draw()
-
-    def pan(dx, dy):
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        xsize = xlim[1] - xlim[0]
-        ysize = ylim[1] - ylim[0]
-        ax.set_xlim(xlim[0] + dx * xsize * 0.2, xlim[1] + dx * xsize * 0.2)
-        ax.set_ylim(ylim[0] + dy * ysize * 0.2, ylim[1] + dy * ysize * 0.2)
-        canvas.zoom_xlim = list(ax.get_xlim())
-        canvas.zoom_ylim = list(ax.get_ylim())
-        canvas.draw()
-
-    # Botones de zoom y pan
-    zoom_frame = tk.Frame(frame_grafico)
+def zoom_vista(vista, factor, centro=None):
+    """
+    Acerca (factor > 1) o aleja la vista cambiando solo los límites del eje;
+    el redibujado se agenda con ``draw_idle`` en lugar de hacerse en el momento.
+    """
+    ax = vista["ax"]
+    xlim = ax.get_xlim()
+    ylim = ax.get_ylim()
+    if centro is None:
+        centro = ((xlim[0] + xlim[1]) / 2, (ylim[0] + ylim[1]) / 2)
+    cx, cy = centro
+    ax.set_xlim(cx - (cx - xlim[0]) / factor, cx + (xlim[1] - cx) / factor)
+    ax.set_ylim(cy - (cy - ylim[0]) / factor, cy + (ylim[1] - cy) / factor)
+    vista["canvas"].draw_idle()
+
+def pan_vista(vista, dx, dy):
+    """
+    Desplaza la vista un 20% del tamaño visible en la dirección indicada.
+    """
+    ax = vista["ax"]
+    xlim = ax.get_xlim()
+    ylim = ax.get_ylim()
+    xsize = xlim[1] - xlim[0]
+    ysize = ylim[1] - ylim[0]
+    ax.set_xlim(xlim[0] + dx * xsize * 0.2, xlim[1] + dx * xsize * 0.2)
+    ax.set_ylim(ylim[0] + dy * ysize * 0.2, ylim[1] + dy * ysize * 0.2)
+    vista["canvas"].draw_idle()
+
+def crear_controles_grafico():
+    """
+    Crea una sola vez los botones de zoom y pan; actúan sobre la plancha visible.
+    """
+    controles = tk.Frame(frame_grafico)
+    controles.pack(side="bottom")
+    # Botones de zoom
+    zoom_frame = tk.Frame(controles)
     zoom_frame.pack()
-    btn_zoom_in = tk.Button(zoom_frame, text="+", command=lambda: zoom(1.2))
-    btn_zoom_in.pack(side="left")
-    btn_zoom_out = tk.Button(zoom_frame, text="-", command=lambda: zoom(1/1.2))
-    btn_zoom_out.pack(side="left")
+    tk.Button(zoom_frame, text="+", command=lambda: zoom_vista(vista_actual, 1.2)).pack(side="left")
+    tk.Button(zoom_frame, text="-", command=lambda: zoom_vista(vista_actual, 1/1.2)).pack(side="left")
     # Botones de pan
-    pan_frame = tk.Frame(frame_grafico)
+    pan_frame = tk.Frame(controles)
     pan_frame.pack()
-    btn_pan_up = tk.Button(pan_frame, text="↑", command=lambda: pan(0, 1))
-    btn_pan_up.grid(row=0, column=1)
-    btn_pan_left = tk.Button(pan_frame, text="←", command=lambda: pan(-1, 0))
-    btn_pan_left.grid(row=1, column=0)
-    btn_pan_right = tk.Button(pan_frame, text="→", command=lambda: pan(1, 0))
-    btn_pan_right.grid(row=1, column=2)
-    btn_pan_down = tk.Button(pan_frame, text="↓", command=lambda: pan(0, -1))
-    btn_pan_down.grid(row=2, column=1)
-
-    # Actualizar resultados y controles de navegación
+    tk.Button(pan_frame, text="↑", command=lambda: pan_vista(vista_actual, 0, 1)).grid(row=0, column=1)
+    tk.Button(pan_frame, text="←", command=lambda: pan_vista(vista_actual, -1, 0)).grid(row=1, column=0)
+    tk.Button(pan_frame, text="→", command=lambda: pan_vista(vista_actual, 1, 0)).grid(row=1, column=2)
+    tk.Button(pan_frame, text="↓", command=lambda: pan_vista(vista_actual, 0, -1)).grid(row=2, column=1)
+    return controles
+
+def mostrar_plancha(indice):
+    """
+    Muestra la visualización y resultados de la plancha en la posición 'indice'.
+    Permite navegar entre planchas usando los botones 'Anterior' y 'Siguiente'.
+
+    La figura de cada plancha se crea una sola vez y se guarda (con su zoom), así
+    que volver a una plancha ya vista solo cambia el canvas visible.
+    """
+    global indice_plancha_actual, vista_actual, controles_grafico
+    if not resultados_planchas:
+        return
+    indice_plancha_actual = indice
+    result = resultados_planchas[indice]
+    frame = planchas[indice]
+
+    if controles_grafico is None:
+        controles_grafico = crear_controles_grafico()
+
+    vista = vistas_planchas.get(indice)
+    if vista is not None and vista["result"] is not result:
+        vista["canvas"].get_tk_widget().destroy()
+        vista = None
+    if vista is None:
+        vista = crear_vista_plancha(frame, result)
+        vistas_planchas[indice] = vista
+
+    if vista is not vista_actual:
+        if vista_actual is not None:
+            vista_actual["canvas"].get_tk_widget().pack_forget()
+        vista["canvas"].get_tk_widget().pack(side="top", fill="both", expand=True)
+        vista_actual = vista
+
+    actualizar_panel_resultados()
+
+def actualizar_panel_resultados():
+    """
+    Actualiza los resultados y controles de navegación de la plancha mostrada.
+    Se vuelve a llamar cada vez que la simulación en curso entrega una plancha nueva.
+    """
+    indice = indice_plancha_actual
+    result = resultados_planchas[indice]
+    frame = planchas[indice]
+    base = frame.width
+    altura = frame.height
+
     for widget in frame_resultados.winfo_children():
         widget.destroy()
 
-    tk.Label(frame_resultados, text=f"Resultados - Plancha {indice+1} de {len(planchas)}", font=("Arial", 12, "bold")).pack(pady=10)
+    total_texto = f"{len(planchas)}+" if simulacion_en_curso is not None else f"{len(planchas)}"
+    tk.Label(frame_resultados, text=f"Resultados - Plancha {indice+1} de {total_texto}", font=("Arial", 12, "bold")).pack(pady=10)
+    if simulacion_en_curso is not None:
+        tk.Label(frame_resultados, text="Calculando planchas restantes...", fg="gray").pack()
     tk.Label(frame_resultados, text=f"Piezas colocadas: {len(result['placements'])}").pack()
     tk.Label(frame_resultados, text=f"Piezas no colocadas: {len(result['not_placed'])}").pack()
     tk.Label(frame_resultados, text=f"Área desperdiciada: {result['waste']:.2f}").pack()
     tk.Label(frame_resultados, text=f"Área total: {(base * altura):.2f}").pack()
     tk.Label(frame_resultados, text=f"Porcentaje de aprovechamiento: {((1 - (result['waste'] / (base * altura)))*100):.2f} %").pack()
-    total_dinero_usado = 0.0
-    for p in result["placements"]:
-        area = p.piece.polygon.area
-        pieza_original = next((f for f in figuras_en_sistema if f.name == p.piece.name), None)
-        precio_m2 = getattr(pieza_original, "precio_m2", 0) if pieza_original else 0
-        total_dinero_usado += area * precio_m2
-    print(f"[DEBUG] precio_m2 de {p.piece.name}: {precio_m2}")    
+    linea_comun = common_line_savings(result, tolerancia_linea_comun())
+    tk.Label(
+        frame_resultados,
+        text=f"Corte: {linea_comun['longitud_comun']:.2f} (ahorro por línea común: {linea_comun['ahorro']:.2f})"
+    ).pack()
+    total_dinero_usado = obtener_indice_costos().sheet(frame, result)["costo"]
     tk.Label(frame_resultados, text=f"Total dinero usado: {total_dinero_usado:.2f}", font=("Arial", 10, "bold")).pack(pady=5)
 
 
@@ -767,14 +1291,133 @@ def mostrar_plancha(indice):
         text="Exportar PDF de todas las planchas",
         command=exportar_todas_las_planchas_pdf
     ).pack(pady=10)
+    # La lista de cortes necesita todas las planchas: se habilita al terminar la simulación
+    tk.Button(
+        frame_resultados,
+        text="Exportar lista de cortes a Excel",
+        command=exportar_excel,
+        state="disabled" if simulacion_en_curso is not None else "normal"
+    ).pack(pady=(0, 10))
+    tk.Button(
+        frame_resultados,
+        text="Exportar trayectoria de corte (G-code/DXF)",
+        command=exportar_trayectoria
+    ).pack(pady=(0, 10))
+
+def obtener_indice_costos():
+    """
+    Índice de precios de las piezas del sistema. Se crea al pedirlo y se descarta
+    cada vez que cambia la lista de piezas.
+
+    :rtype: CostIndex
+    """
+    global indice_costos
+    if indice_costos is None:
+        try:
+            precio_m2 = float(entry_precio_m2.get())
+        except ValueError:
+            precio_m2 = 0.0
+        indice_costos = CostIndex(figuras_en_sistema, precio_m2)
+    return indice_costos
+
+def exportar_excel():
+    """
+    Exporta la lista de cortes de todas las planchas a un archivo Excel, con una hoja
+    por plancha y una hoja de resumen.
+    """
+    if simulacion_en_curso is not None:
+        messagebox.showinfo("Simulación en curso", "Espera a que termine la simulación para exportar la lista de cortes.")
+        return
+    archivo = filedialog.asksaveasfilename(
+        defaultextension=".xlsx",
+        filetypes=[("Excel", "*.xlsx")],
+        title="Guardar lista de cortes"
+    )
+    if not archivo:
+        return
+    try:
+        precio_m2 = float(entry_precio_m2.get())
+    except ValueError:
+        precio_m2 = 0.0
+    try:
+        exportar_xlsx(archivo, zip(planchas, resultados_planchas), obtener_indice_costos(), precio_m2)
+        messagebox.showinfo("Éxito", "Lista de cortes exportada a Excel.")
+    except Exception as e:
+        messagebox.showerror("Error", f"Error al exportar a Excel:\n{str(e)}")
+
+def tolerancia_linea_comun():
+    """
+    Distancia máxima entre aristas de piezas vecinas para cortarlas como una sola
+    línea: con separación igual al ancho de corte, las dos piezas comparten el corte.
+
+    :rtype: float
+    """
+    return obtener_separacion() + TOLERANCIA_LINEA_COMUN
+
+def exportar_trayectoria():
+    """
+    Exporta la secuencia de corte de la plancha mostrada, con el orden de los contornos
+    optimizado para reducir el recorrido en vacío. Las aristas compartidas por piezas
+    vecinas se cortan una sola vez. El formato (G-code o DXF) se elige por la
+    extensión; las coordenadas se pasan de cm a mm.
+    """
+    if not resultados_planchas:
+        return
+    archivo = filedialog.asksaveasfilename(
+        defaultextension=".nc",
+        filetypes=[("G-code", "*.nc *.gcode"), ("DXF", "*.dxf")],
+        title="Guardar trayectoria de corte"
+    )
+    if not archivo:
+        return
+    try:
+        toolpath = plan_sheet(resultados_planchas[indice_plancha_actual], common_line_tolerance=tolerancia_linea_comun())
+        if archivo.lower().endswith(".dxf"):
+            exportar_dxf(archivo, toolpath, escala=10.0)
+        else:
+            exportar_gcode(archivo, toolpath, escala=10.0, titulo=f"Plancha {indice_plancha_actual + 1}")
+        messagebox.showinfo(
+            "Éxito",
+            f"Trayectoria exportada: {len(toolpath.cuts)} contornos, "
+            f"{toolpath.travel:.1f} cm de recorrido en vacío."
+        )
+    except Exception as e:
+        messagebox.showerror("Error", f"Error al exportar la trayectoria:\n{str(e)}")
+
+def planchas_para_exportar(lista_planchas, lista_resultados, simulacion):
+    """
+    Recorre las planchas desde un hilo distinto al de la interfaz. Si la simulación
+    sigue en curso, espera a que ``paso_simulacion`` agregue las siguientes (solo la
+    interfaz toma las planchas de la cola de la simulación).
+
+    :return: Generador de tuplas ``(frame, result)``
+    :rtype: Iterator[tuple[Frame, dict]]
+    """
+    i = 0
+    while True:
+        if i < len(lista_resultados):
+            yield lista_planchas[i], lista_resultados[i]
+            i += 1
+        elif simulacion is not None and simulacion_en_curso is simulacion:
+            time.sleep(0.05)
+        elif i < len(lista_resultados):
+            continue
+        else:
+            return
 
 def exportar_todas_las_planchas_pdf():
     """
-    Exporta un PDF multipágina con mejor diseño:
-    - Imagen principal más grande y centrada
-    - Tabla de piezas solo si hay piezas colocadas
-    - Ajuste automático de tamaños
+    Exporta un PDF multipágina con todas las planchas, dibujadas como gráficos
+    vectoriales: encabezado, dibujo de la plancha, estadísticas y tabla de piezas
+    con su miniatura.
+
+    La exportación corre en un hilo aparte (las páginas se preparan en un pool de
+    procesos) y una ventana muestra el avance sin bloquear la interfaz.
     """
+    global exportacion_en_curso
+    if exportacion_en_curso:
+        messagebox.showinfo("Exportación en curso", "Espera a que termine la exportación actual.")
+        return
     archivo = filedialog.asksaveasfilename(
         defaultextension=".pdf",
         filetypes=[("Archivo PDF", "*.pdf")],
@@ -784,174 +1427,53 @@ def exportar_todas_las_planchas_pdf():
         return
 
     try:
-        c = canvas.Canvas(archivo, pagesize=A4)
-        ancho_pagina, alto_pagina = A4
-
-        for i, (frame, result) in enumerate(zip(planchas, resultados_planchas)):
-            # ========= 1. PREPARAR DATOS =========
-            total_area = frame.width * frame.height
-            porcentaje_aprovechamiento = (1 - (result['waste'] / total_area)) * 100
-            total_dinero_usado = sum(
-                p.piece.polygon.area * getattr(
-                    next((f for f in figuras_en_sistema if f.name == p.piece.name), None),
-                    "precio_m2", 0
-                )
-                for p in result["placements"]
-            )
-
-            # ========= 2. GENERAR IMAGEN PRINCIPAL =========
-            fig = plt.Figure(figsize=(8, 8), dpi=100)  # Tamaño aumentado
-            visualizer = PlacementVisualizer(
-                frames=[frame],
-                placements=result["placements"],
-                not_placed=result["not_placed"],
-                waste=result["waste"]
-            )
-            visualizer.visualize(fig)
-            
-            # Ajustar márgenes para que ocupe más espacio
-            fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-            
-            buf_plancha = BytesIO()
-            fig.savefig(buf_plancha, format='png', bbox_inches='tight')
-            buf_plancha.seek(0)
-
-            # ========= 3. DISEÑO DE PÁGINA =========
-            # --- Encabezado ---
-            c.setFont("Helvetica-Bold", 16)
-            c.drawCentredString(ancho_pagina/2, alto_pagina - 2*cm, f"Plancha {i+1} - Aprovechamiento: {porcentaje_aprovechamiento:.2f}%")
-            
-            # --- Imagen principal (más grande) ---
-            img_width = 14*cm  # Ancho fijo grande
-            img_height = min(14*cm, alto_pagina - 6*cm)  # Altura máxima disponible
-            
-            # Calcular posición centrada
-            img_x = (ancho_pagina - img_width) / 2
-            img_y = alto_pagina - 5*cm - img_height
-            
-            c.drawImage(
-                ImageReader(buf_plancha),
-                img_x, img_y,
-                width=img_width,
-                height=img_height,
-                preserveAspectRatio=True,
-                mask='auto'
-            )
-            
-            # --- Estadísticas debajo de la imagen ---
-            y_position = img_y - 1.5*cm
-            c.setFont("Helvetica", 10)
-            c.drawString(2*cm, y_position, f"● Dimensiones: {frame.width:.2f}m x {frame.height:.2f}m")
-            c.drawString(ancho_pagina/2, y_position, f"● Área utilizada: {total_area - result['waste']:.2f}m² de {total_area:.2f}m²")
-            y_position -= 0.7*cm
-            c.drawString(2*cm, y_position, f"● Piezas colocadas: {len(result['placements'])}")
-            c.drawString(ancho_pagina/2, y_position, f"● Piezas no colocadas: {len(result['not_placed'])}")
-            y_position -= 0.7*cm
-            c.drawString(2*cm, y_position, f"● Desperdicio: {result['waste']:.2f}m² ({result['waste']/total_area*100:.2f}%)")
-            c.drawString(ancho_pagina/2, y_position, f"● Costo total: {total_dinero_usado:.2f} Bs.")
-            y_position -= 0.7*cm
-            c.drawString(2*cm, y_position, f"● Precio plancha por m²: {float(entry_precio_m2.get()):.2f} Bs.")
-            c.drawString(ancho_pagina/2, y_position, f"● Precio total de la plancha: {(float(entry_precio_m2.get())*total_area):.2f} Bs.")
-            y_position -= 1.5*cm
-
-            # ========= 4. TABLA DE PIEZAS (solo si hay piezas) =========
-            if result["placements"]:
-                c.setFont("Helvetica-Bold", 12)
-                c.drawString(2*cm, y_position, "Detalle de todas las piezas colocadas:")
-                y_position -= 0.7*cm
-                
-                # Encabezados de tabla mejorados
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(2*cm, y_position, "Pieza")
-                c.drawString(4*cm, y_position, "Dimensión")
-                c.drawString(7*cm, y_position, "Área")
-                c.drawString(10*cm, y_position, "Costo")
-                c.drawString(13*cm, y_position, "Imagen")
-                y_position -= 0.7*cm
-                
-                # Línea divisoria
-                c.line(2*cm, y_position + 0.2*cm, ancho_pagina - 2*cm, y_position + 0.2*cm)
-                y_position -= 0.5*cm
+        precio_m2 = float(entry_precio_m2.get())
+    except ValueError:
+        precio_m2 = 0.0
+    # El índice se arma aquí: el hilo de exportación no debe tocar los widgets ni la
+    # lista de piezas, que la interfaz puede cambiar mientras exporta
+    costos = obtener_indice_costos()
+    # Los procesos se crean con fork: con spawn cada proceso volvería a ejecutar este
+    # script (y abriría otra ventana), así que en ese caso se prepara todo en el hilo.
+    workers = min(4, os.cpu_count() or 1) if multiprocessing.get_start_method() == "fork" else 0
+    # Las planchas que aún se están calculando se escriben a medida que llegan
+    planchas_origen = planchas_para_exportar(planchas, resultados_planchas, simulacion_en_curso)
+    avance = queue.Queue()
+
+    def exportar():
+        try:
+            n = exportar_pdf(archivo, planchas_origen, costos, precio_m2, workers, progreso=lambda k: avance.put(("avance", k)))
+            avance.put(("fin", n))
+        except Exception as e:
+            avance.put(("error", e))
+
+    ventana = tk.Toplevel(root)
+    ventana.title("Exportando PDF")
+    etiqueta_avance = tk.Label(ventana, text="Preparando páginas...", padx=20, pady=15)
+    etiqueta_avance.pack()
+
+    def revisar_avance():
+        global exportacion_en_curso
+        while True:
+            try:
+                tipo, valor = avance.get_nowait()
+            except queue.Empty:
+                root.after(100, revisar_avance)
+                return
+            if tipo == "avance":
+                etiqueta_avance.config(text=f"Planchas escritas: {valor}")
+                continue
+            exportacion_en_curso = False
+            ventana.destroy()
+            if tipo == "fin":
+                messagebox.showinfo("Éxito", "PDF generado correctamente con todas las planchas y piezas.")
+            else:
+                messagebox.showerror("Error", f"Error al generar PDF:\n{str(valor)}")
+            return
 
-                placements = result["placements"]
-                
-                # Mostrar TODAS las piezas colocadas
-                for i, p in enumerate(placements): #result["placements"]:
-                    es_ultimo = (i == len(placements) - 1)
-
-                    # Calcular dimensiones de la pieza
-                    bounds = p.piece.polygon.bounds
-                    ancho_pieza = bounds[2] - bounds[0]
-                    alto_pieza = bounds[3] - bounds[1]
-
-                    # Calcular área y costo
-                    area = p.piece.polygon.area
-                    pieza_original = next((f for f in figuras_en_sistema if f.name == p.piece.name), None)
-                    precio_m2 = getattr(pieza_original, "precio_m2", 0) if pieza_original else 0
-                    costo = area * precio_m2
-                    
-                    # Dibujar información en la tabla
-                    c.setFont("Helvetica", 10)
-                    c.drawString(2*cm, y_position, p.piece.name)
-                    c.drawString(4*cm, y_position, f"{ancho_pieza:.2f} x {alto_pieza:.2f}")
-                    c.drawString(7*cm, y_position, f"{area:.2f}")
-                    c.drawString(10*cm, y_position, f"{costo:.2f} Bs.")
-
-                    # ----- AÑADIR IMAGEN DE LA PIEZA -----
-                    # Crear figura con matplotlib
-                    fig_pieza = plt.Figure(figsize=(1, 1), dpi=50)
-                    ax = fig_pieza.add_subplot(111)
-
-                    # Obtener color original de la pieza (si existe)
-                    color = getattr(pieza_original, "color", "#CCCCCC")  # Gris por defecto
-                    
-                    # Dibujar la pieza con su color
-                    polygon = p.piece.polygon
-                    x, y = polygon.exterior.xy
-                    ax.fill(x, y, color=color)
-                    ax.plot(x, y, color='black', linewidth=0.5)
-                    ax.set_aspect('equal')
-                    ax.axis('off')
-                    
-                    # Guardar imagen temporal
-                    buf_pieza = BytesIO()
-                    fig_pieza.savefig(buf_pieza, format='png', bbox_inches='tight', pad_inches=0.1)
-                    buf_pieza.seek(0)
-                    
-                    # Dibujar imagen en PDF (tamaño pequeño)
-                    c.drawImage(ImageReader(buf_pieza), 13*cm, y_position - 0.5*cm, 
-                            width=1*cm, height=1*cm, preserveAspectRatio=True)
-                    buf_pieza.close()
-                    plt.close(fig_pieza)  # Liberar memoria de matplotlib
-                    # --------------------------------------
-
-                    y_position -= 0.7*cm
-                    
-                    # Nueva página si no hay espacio
-                    if y_position < 2*cm and not es_ultimo: 
-                        c.showPage()
-                        y_position = alto_pagina - 2*cm
-                        # Redibujar encabezados en nueva página
-                        c.setFont("Helvetica-Bold", 12)
-                        c.drawString(2*cm, y_position, "Detalle de piezas (continuación):")
-                        y_position -= 0.7*cm
-                        c.setFont("Helvetica-Bold", 10)
-                        c.drawString(2*cm, y_position, "Pieza")
-                        c.drawString(4*cm, y_position, "Dimimensión")
-                        c.drawString(7*cm, y_position, "Área")
-                        c.drawString(10*cm, y_position, "Costo")
-                        c.drawString(13*cm, y_position, "Imagen")
-                        y_position -= 0.7*cm
-                        c.line(2*cm, y_position + 0.2*cm, ancho_pagina - 2*cm, y_position + 0.2*cm)
-                        y_position -= 0.5*cm
-
-            buf_plancha.close()
-            c.showPage()
-
-        c.save()
-        messagebox.showinfo("Éxito", "PDF generado correctamente con todas las planchas y piezas.")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error al generar PDF:\n{str(e)}")
+    exportacion_en_curso = True
+    threading.Thread(target=exportar, daemon=True).start()
+    root.after(100, revisar_avance)
 
 # Configuración de la interfaz gráfica
 root = tk.Tk()
@@ -975,22 +1497,21 @@ frame_sistema = tk.Frame(root, width=270, bd=2, relief="groove")
 frame_sistema.pack(side="left", fill="y")
 tk.Label(frame_sistema, text="Piezas del sistema", font=("Arial", 10)).pack()
 
-# Lista de piezas
-# Scroll en "Piezas del sistema"
-canvas_piezas = tk.Canvas(frame_sistema, width=240, height=500)
-scrollbar_piezas = tk.Scrollbar(frame_sistema, orient="vertical", command=canvas_piezas.yview)
-scrollable_piezas = tk.Frame(canvas_piezas)
-
-# Vincular el redimensionamiento del frame al canvas
-scrollable_piezas.bind(
-    "<Configure>",
-    lambda e: canvas_piezas.configure(
-        scrollregion=canvas_piezas.bbox("all")
-    )
-)
-
-canvas_piezas.create_window((0, 0), window=scrollable_piezas, anchor="nw")
-canvas_piezas.configure(yscrollcommand=scrollbar_piezas.set)
+# Lista de piezas (virtual: solo se dibujan las filas visibles)
+ANCHO_LISTA = 240
+ALTO_FILA = 72
+miniaturas_piezas = {}  # Dibujo de cada tipo de pieza, por firma
+filas_dibujadas = {"rango": None}  # Filas actualmente dibujadas en el canvas
+
+canvas_piezas = tk.Canvas(frame_sistema, width=ANCHO_LISTA, height=500, yscrollincrement=ALTO_FILA // 2)
+scrollbar_piezas = tk.Scrollbar(frame_sistema, orient="vertical", command=desplazar_lista)
+canvas_piezas.configure(yscrollcommand=scrollbar_piezas.set, scrollregion=(0, 0, ANCHO_LISTA, 0))
+canvas_piezas.bind("<Configure>", lambda e: dibujar_filas_visibles())
+canvas_piezas.bind("<MouseWheel>", rueda_lista)
+canvas_piezas.bind("<Button-4>", rueda_lista)
+canvas_piezas.bind("<Button-5>", rueda_lista)
+canvas_piezas.tag_bind("btn_editar", "<Button-1>", editar_pieza_seleccionada)
+canvas_piezas.tag_bind("btn_eliminar", "<Button-1>", eliminar_pieza_seleccionada)
 
 canvas_piezas.pack(side="left", fill="both", expand=True)
 scrollbar_piezas.pack(side="right", fill="y")
@@ -1035,6 +1556,17 @@ entry_altura.pack()
 tk.Label(config_frame, text="Precio por cm² (Bs):").pack()
 entry_precio_m2 = tk.Entry(config_frame)
 entry_precio_m2.pack()
+tk.Label(config_frame, text="Separación entre piezas (cm):").pack()
+entry_separacion = tk.Entry(config_frame)
+entry_separacion.insert(0, "0")
+entry_separacion.pack()
+tk.Label(config_frame, text="Motor de colocación:").pack()
+combo_motor = ttk.Combobox(config_frame, values=list(MOTORES), state="readonly", width=17)
+combo_motor.current(0)
+combo_motor.pack()
+tk.Label(config_frame, text="Tiempo máximo (s, vacío = sin límite):").pack()
+entry_tiempo = tk.Entry(config_frame)
+entry_tiempo.pack()
 
 # Botón Guardar JSON (Verde = acción positiva)
 tk.Button(config_frame, text="💾 Guardar JSON", command=guardar_json,
@@ -1044,9 +1576,24 @@ tk.Button(config_frame, text="💾 Guardar JSON", command=guardar_json,
 tk.Button(config_frame, text="📂 Cargar JSON", command=cargar_json,
           fg="white", bg="#007BFF", font=("Arial", 10, "bold")).pack(pady=5)
 
+# Botón Importar pedido (Azul = acción de entrada)
+tk.Button(config_frame, text="📥 Importar pedido (CSV/XLSX)", command=importar_pedido_archivo,
+          fg="white", bg="#007BFF", font=("Arial", 10, "bold")).pack(pady=5)
+tk.Button(config_frame, text="📐 Importar piezas (SVG/DXF)", command=importar_cad_archivo,
+          fg="white", bg="#007BFF", font=("Arial", 10, "bold")).pack(pady=5)
+
+# Botones de solución completa (Verde azulado = resultados guardados)
+btn_guardar_solucion = tk.Button(config_frame, text="💾 Guardar solución", command=guardar_solucion,
+                                 fg="white", bg="#17A2B8", font=("Arial", 10, "bold"))
+btn_guardar_solucion.pack(pady=5)
+tk.Button(config_frame, text="📂 Cargar solución", command=cargar_solucion,
+          fg="white", bg="#17A2B8", font=("Arial", 10, "bold")).pack(pady=5)
+
 # Botón Dibujar figura personalizada (Morado = creativo)
 tk.Button(config_frame, text="🎨 Dibujar figura personalizada", command=abrir_ventana_dibujo,
           fg="white", bg="#8A2BE2", font=("Arial", 10, "bold")).pack(pady=5)
+tk.Button(config_frame, text="📚 Biblioteca de piezas", command=abrir_ventana_biblioteca,
+          fg="white", bg="#8A2BE2", font=("Arial", 10, "bold")).pack(pady=5)
 
 # Botón de Simulación (Gris oscuro = técnico, ejecución)
 btn_simular = tk.Button(config_frame, text="▶️ Simular", command=simular,
@@ -1054,11 +1601,7 @@ btn_simular = tk.Button(config_frame, text="▶️ Simular", command=simular,
 btn_simular.pack(pady=10)
 
 # Lista de figuras predeterminadas disponibles
-figuras = [
-    "rectangulo", "cuadrado", "triangulo", "pentagono", "hexagono",
-    "rombo", "punta","trapecio", "trapezoide",
-    "trapecio_inclinado", "escalera","figura_L"
-]
+figuras = FIGURAS_PREDETERMINADAS
 
 # Crear los widgets para cada figura predeterminada
 colores = [
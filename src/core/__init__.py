@@ -1,4 +1,16 @@
-from .grasp_solver import GraspSolver
+from .grasp_solver import SOLVER_VERSION, GraspSolver
+from .multi_sheet import solve_sheets
+from .sequence_solver import SequenceSolver
+from .solvers import SOLVERS, PortfolioSolver, get_solver, register_solver
 
 
-__all__ = ["GraspSolver"]
+__all__ = [
+    "SOLVER_VERSION",
+    "SOLVERS",
+    "GraspSolver",
+    "PortfolioSolver",
+    "SequenceSolver",
+    "get_solver",
+    "register_solver",
+    "solve_sheets",
+]
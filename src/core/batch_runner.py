@@ -0,0 +1,338 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.utils.helpers import cabe_en_plancha, crear_pieza
+from src.utils.solution_io import save_solution
+from .costing import CostIndex
+from .multi_sheet import solve_sheets
+from .result_cache import DEFAULT_MAX_BYTES, ResultCache
+from .solvers import SOLVERS
+
+
+RESULT_SUFFIX = ".resultado.json"
+SUMMARY_FIELDS = [
+    "archivo",
+    "estado",
+    "planchas",
+    "piezas",
+    "piezas_colocadas",
+    "piezas_sin_colocar",
+    "piezas_rechazadas",
+    "aprovechamiento",
+    "desperdicio",
+    "costo",
+    "tiempo",
+    "tiempo_excedido",
+    "error",
+]
+
+
+def load_job(path: str):
+    """
+    Lee un pedido guardado con el formato de ``guardar_json`` y construye sus piezas.
+
+    Las piezas que exceden la plancha se descartan igual que en la interfaz. La
+    separación mínima entre piezas (``separacion``) es opcional y vale 0 por defecto.
+
+    :param path: Ruta del archivo JSON
+    :type path: str
+    :return: Tupla ``(plancha, piezas, rechazadas)``
+    :rtype: tuple[dict, list[PolygonPiece], list[str]]
+    """
+    with open(path, "r") as f:
+        datos = json.load(f)
+
+    plancha = datos["plancha"]
+    base = float(plancha["base"])
+    altura = float(plancha["altura"])
+    precio_m2 = float(plancha.get("precio_m2", 0) or 0)
+
+    piezas = []
+    rechazadas = []
+    for pieza_data in datos["piezas"]:
+        pieza = crear_pieza(pieza_data["nombre"], pieza_data["ancho"], pieza_data["alto"], precio_m2)
+        if pieza is None or not cabe_en_plancha(pieza, base, altura):
+            rechazadas.append(pieza_data["nombre"])
+            continue
+        pieza.etiqueta = f"Pieza {len(piezas)+1}"
+        piezas.append(pieza)
+
+    separacion = float(plancha.get("separacion", 0) or 0)
+    return {"base": base, "altura": altura, "precio_m2": precio_m2, "separacion": separacion}, piezas, rechazadas
+
+
+def run_job(
+    path: str,
+    time_limit: float | None = None,
+    solver_kwargs: dict | None = None,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+):
+    """
+    Resuelve un pedido y escribe su resultado junto al archivo de entrada.
+
+    Está pensada para ejecutarse dentro de un proceso del pool, por lo que nunca
+    lanza excepciones: los errores se informan en la fila de resumen.
+
+    :param path: Ruta del pedido JSON
+    :type path: str
+    :param time_limit: Tiempo máximo en segundos para el pedido completo. Es un límite
+        blando: el solver lo respeta entre iteraciones, pero una iteración en curso no se
+        interrumpe; los pedidos que lo superan se marcan en ``tiempo_excedido``
+    :type time_limit: float or None
+    :param solver_kwargs: Parámetros adicionales para ``solve_sheets`` (``solver`` elige el motor)
+    :type solver_kwargs: dict or None
+    :param cache_dir: Directorio de la caché de resultados (None = sin caché)
+    :type cache_dir: str or None
+    :param cache_max_bytes: Tamaño máximo de la caché en bytes
+    :type cache_max_bytes: int
+    :return: Fila del resumen con las métricas del pedido
+    :rtype: dict
+    """
+    fila = {campo: "" for campo in SUMMARY_FIELDS}
+    fila["archivo"] = os.path.basename(path)
+    start = time.perf_counter()
+    try:
+        plancha, piezas, rechazadas = load_job(path)
+        cache = ResultCache(cache_dir, cache_max_bytes) if cache_dir else None
+        costing = CostIndex(piezas, plancha["precio_m2"])
+
+        frames = []
+        results = []
+        hojas = []
+        sin_colocar = piezas
+        for frame, result in solve_sheets(
+            piezas, plancha["base"], plancha["altura"], time_limit=time_limit, cache=cache,
+            **{"spacing": plancha["separacion"], **(solver_kwargs or {})},
+        ):
+            datos = costing.sheet(frame, result)
+            frames.append(frame)
+            results.append(result)
+            hojas.append({
+                "indice": len(hojas) + 1,
+                "piezas": datos["colocadas"],
+                "desperdicio": datos["desperdicio"],
+                "aprovechamiento": datos["aprovechamiento"],
+                "costo": datos["costo"],
+            })
+            sin_colocar = result["not_placed"]
+
+        elapsed = time.perf_counter() - start
+        colocadas = sum(h["piezas"] for h in hojas)
+        totales = costing.job(frames, results)
+        desperdicio = totales["desperdicio"]
+        resumen = {
+            "entrada": os.path.basename(path),
+            "planchas": hojas,
+            "piezas_sin_colocar": [getattr(p, "etiqueta", p.name) for p in sin_colocar],
+            "piezas_rechazadas": rechazadas,
+            "aprovechamiento": totales["aprovechamiento"],
+            "costo_total": totales["costo"],
+            "tiempo": elapsed,
+        }
+        # El resultado es una solución completa: se puede abrir en la interfaz sin volver a resolver
+        save_solution(result_path(path), frames, results, plancha["precio_m2"], extra=resumen)
+
+        fila.update({
+            "estado": "ok",
+            "planchas": len(hojas),
+            "piezas": len(piezas),
+            "piezas_colocadas": colocadas,
+            "piezas_sin_colocar": len(sin_colocar),
+            "piezas_rechazadas": len(rechazadas),
+            "aprovechamiento": f"{resumen['aprovechamiento']:.2f}",
+            "desperdicio": f"{desperdicio:.2f}",
+            "costo": f"{resumen['costo_total']:.2f}",
+            "tiempo": f"{elapsed:.2f}",
+            "tiempo_excedido": time_limit is not None and elapsed > time_limit,
+        })
+    except Exception as e:
+        fila.update({
+            "estado": "error",
+            "tiempo": f"{time.perf_counter() - start:.2f}",
+            "error": str(e),
+        })
+    return fila
+
+
+def result_path(path: str):
+    """
+    Devuelve la ruta del archivo de resultado que corresponde a un pedido.
+    """
+    root, _ = os.path.splitext(path)
+    return root + RESULT_SUFFIX
+
+
+def find_jobs(directory: str, skip_solved: bool = True):
+    """
+    Lista los pedidos JSON de un directorio, ignorando los archivos de resultado.
+
+    :param directory: Directorio a explorar
+    :type directory: str
+    :param skip_solved: Omitir los pedidos que ya tienen un resultado escrito
+    :type skip_solved: bool
+    :rtype: list[str]
+    """
+    jobs = []
+    for nombre in sorted(os.listdir(directory)):
+        path = os.path.join(directory, nombre)
+        if not nombre.endswith(".json") or nombre.endswith(RESULT_SUFFIX) or not os.path.isfile(path):
+            continue
+        if skip_solved and os.path.exists(result_path(path)):
+            continue
+        jobs.append(path)
+    return jobs
+
+
+class BatchRunner:
+    """
+    Resuelve en paralelo todos los pedidos JSON de un directorio usando un pool de procesos.
+
+    :var directory: Directorio de entrada (y de salida de los resultados).
+    :vartype directory: str
+    :var workers: Número de procesos del pool (None = número de CPUs).
+    :vartype workers: int or None
+    :var time_limit: Tiempo máximo en segundos por pedido (límite blando, ver ``run_job``).
+    :vartype time_limit: float or None
+    :var summary_path: Ruta del CSV de resumen.
+    :vartype summary_path: str
+    :var cache_dir: Directorio de la caché de resultados compartida por los procesos (None = sin caché).
+    :vartype cache_dir: str or None
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        workers: int | None = None,
+        time_limit: float | None = None,
+        summary_path: str | None = None,
+        solver_kwargs: dict | None = None,
+        cache_dir: str | None = None,
+        cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.workers = workers
+        self.time_limit = time_limit
+        self.summary_path = summary_path or os.path.join(directory, "resumen.csv")
+        self.solver_kwargs = solver_kwargs or {}
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+
+    def run(self, jobs: list[str] | None = None, executor: ProcessPoolExecutor | None = None):
+        """
+        Resuelve los pedidos indicados (por defecto, los pendientes del directorio)
+        y agrega una fila por pedido al CSV de resumen a medida que terminan.
+
+        :return: Filas del resumen en el orden en que terminaron los pedidos
+        :rtype: list[dict]
+        """
+        if jobs is None:
+            jobs = find_jobs(self.directory)
+        if not jobs:
+            return []
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        filas = []
+        try:
+            futures = [
+                executor.submit(
+                    run_job, job, self.time_limit, self.solver_kwargs, self.cache_dir, self.cache_max_bytes
+                )
+                for job in jobs
+            ]
+            for future in as_completed(futures):
+                fila = future.result()
+                self._append_summary(fila)
+                filas.append(fila)
+                print(f"[{fila['estado']}] {fila['archivo']} ({fila['tiempo']} s)")
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return filas
+
+    def watch(self, interval: float = 5.0):
+        """
+        Vigila el directorio como carpeta de spool y resuelve cada pedido nuevo que aparezca.
+        Se detiene con Ctrl+C.
+
+        Un pedido se encola recién cuando su tamaño y fecha de modificación no cambiaron
+        durante una revisión completa, para no leer archivos que todavía se están
+        escribiendo. Los pedidos que fallan se vuelven a intentar si el archivo cambia.
+
+        :param interval: Segundos entre cada revisión del directorio
+        :type interval: float
+        """
+        vistos = {}
+        procesados = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while True:
+                    actuales = {}
+                    for job in find_jobs(self.directory):
+                        try:
+                            estado = os.stat(job)
+                        except OSError:
+                            continue
+                        actuales[job] = (estado.st_size, estado.st_mtime_ns)
+                    estables = [
+                        job for job, firma in actuales.items()
+                        if vistos.get(job) == firma and procesados.get(job) != firma
+                    ]
+                    for job in estables:
+                        procesados[job] = actuales[job]
+                    vistos = actuales
+                    self.run(estables, executor=executor)
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                pass
+
+    def _append_summary(self, fila: dict):
+        nuevo = not os.path.exists(self.summary_path)
+        with open(self.summary_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            if nuevo:
+                writer.writeheader()
+            writer.writerow(fila)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve por lotes los pedidos JSON de un directorio.")
+    parser.add_argument("directorio", help="Directorio con los pedidos en formato JSON")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, CPUs)")
+    parser.add_argument(
+        "--time-limit", type=float, default=None,
+        help="Segundos máximos por pedido (límite blando: la iteración en curso termina y se marca tiempo_excedido)",
+    )
+    parser.add_argument("--resumen", default=None, help="Ruta del CSV de resumen")
+    parser.add_argument("--motor", choices=sorted(SOLVERS), default="grasp", help="Motor de colocación")
+    parser.add_argument("--iterations", type=int, default=10, help="Iteraciones del motor por plancha")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla del solver para resultados reproducibles")
+    parser.add_argument("--cache", default=None, help="Directorio de la caché de resultados")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20, help="Tamaño máximo de la caché en MB")
+    parser.add_argument("--watch", action="store_true", help="Vigilar el directorio como carpeta de spool")
+    parser.add_argument("--interval", type=float, default=5.0, help="Segundos entre revisiones en modo --watch")
+    args = parser.parse_args(argv)
+
+    runner = BatchRunner(
+        args.directorio,
+        workers=args.workers,
+        time_limit=args.time_limit,
+        summary_path=args.resumen,
+        solver_kwargs={"solver": args.motor, "iterations": args.iterations, "seed": args.seed},
+        cache_dir=args.cache,
+        cache_max_bytes=int(args.cache_max_mb * 2**20),
+    )
+    if args.watch:
+        runner.watch(args.interval)
+    else:
+        runner.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import numpy as np
+import shapely
+from shapely.geometry.polygon import orient
+
+
+def _edges(rings: list[list[tuple[float, float]]]):
+    """
+    Aristas de todos los anillos como arreglos de inicio, fin y anillo dueño.
+    """
+    inicios, fines, owners = [], [], []
+    for k, ring in enumerate(rings):
+        puntos = np.asarray(ring, dtype=float)
+        inicios.append(puntos)
+        fines.append(np.roll(puntos, -1, axis=0))
+        owners.append(np.full(len(puntos), k))
+    return np.vstack(inicios), np.vstack(fines), np.concatenate(owners)
+
+
+# Distancia por debajo de la cual dos aristas se consideran la misma línea
+_COINCIDENT = 1e-9
+
+
+def _merge_intervals(intervalos: list[tuple[float, float]]):
+    intervalos = sorted(intervalos)
+    unidos = [list(intervalos[0])]
+    for t0, t1 in intervalos[1:]:
+        if t0 <= unidos[-1][1]:
+            unidos[-1][1] = max(unidos[-1][1], t1)
+        else:
+            unidos.append([t0, t1])
+    return unidos
+
+
+def find_common_lines(rings: list[list[tuple[float, float]]], tolerance: float = 1e-6):
+    """
+    Busca los tramos de arista compartidos por dos anillos: aristas colineales (a
+    menos de ``tolerance``) que se superponen. Las aristas se indexan en un
+    ``STRtree``, así que solo se comparan las que están cerca.
+
+    Si las aristas coinciden, el tramo se asigna al anillo de menor índice y el otro
+    anillo lo pierde. Si hay un hueco entre ellas (piezas separadas por el ancho de
+    corte), ninguno de los dos conserva su arista: el corte común es la línea media
+    del hueco, que deja ambas piezas a medida.
+
+    :param rings: Contornos de las piezas (sin repetir el primer vértice)
+    :param tolerance: Distancia máxima entre aristas para considerarlas la misma línea
+    :return: Tupla ``(omitidos, medias)``: ``omitidos`` es un diccionario
+        ``{(anillo, arista): [(t0, t1), ...]}`` con los tramos que cada arista no
+        necesita cortar, como distancias desde el inicio de la arista, y ``medias`` una
+        lista de ``(anillo, (p, q))`` con las líneas medias a cortar en su lugar
+    :rtype: tuple[dict[tuple[int, int], list[tuple[float, float]]], list]
+    """
+    if len(rings) < 2:
+        return {}, []
+    inicios, fines, owners = _edges(rings)
+    base = np.cumsum([0] + [len(r) for r in rings])
+    vectores = fines - inicios
+    largos = np.hypot(vectores[:, 0], vectores[:, 1])
+    lineas = shapely.linestrings(np.stack([inicios, fines], axis=1))
+    arbol = shapely.STRtree(lineas)
+    a, b = arbol.query(lineas, predicate="dwithin", distance=tolerance)
+    # Solo pares de anillos distintos; la arista del anillo mayor es la que se omite
+    mask = owners[a] > owners[b]
+    a, b = a[mask], b[mask]
+
+    omitidos = {}
+    medias = []
+    for e, f in zip(a.tolist(), b.tolist()):
+        if largos[e] <= tolerance or largos[f] <= tolerance:
+            continue
+        u = vectores[e] / largos[e]
+        extremos = np.stack([inicios[f], fines[f]]) - inicios[e]
+        distancias = np.abs(extremos[:, 0] * u[1] - extremos[:, 1] * u[0])
+        if (distancias > tolerance).any():
+            continue
+        t = extremos @ u
+        t0, t1 = max(t.min(), 0.0), min(t.max(), largos[e])
+        if t1 - t0 <= tolerance:
+            continue
+        clave = (int(owners[e]), int(e - base[owners[e]]))
+        omitidos.setdefault(clave, []).append((float(t0), float(t1)))
+        if distancias.max() <= _COINCIDENT:
+            continue
+        # Hay un hueco: la arista del anillo menor tampoco se corta y se corta la media
+        v = vectores[f] / largos[f]
+        p, q = inicios[e] + u * t0, inicios[e] + u * t1
+        s = sorted(((p - inicios[f]) @ v, (q - inicios[f]) @ v))
+        s0, s1 = max(s[0], 0.0), min(s[1], largos[f])
+        clave = (int(owners[f]), int(f - base[owners[f]]))
+        omitidos.setdefault(clave, []).append((float(s0), float(s1)))
+        pf, qf = inicios[f] + v * ((p - inicios[f]) @ v), inicios[f] + v * ((q - inicios[f]) @ v)
+        medias.append((int(owners[f]), (tuple(((p + pf) / 2).tolist()), tuple(((q + qf) / 2).tolist()))))
+    omitidos = {clave: [tuple(i) for i in _merge_intervals(v)] for clave, v in omitidos.items()}
+    return omitidos, medias
+
+
+def merge_common_lines(rings: list[list[tuple[float, float]]], tolerance: float = 1e-6):
+    """
+    Divide los contornos para que cada línea compartida se corte una sola vez.
+
+    Los anillos sin tramos compartidos quedan cerrados; los demás se convierten en
+    polilíneas abiertas con lo que queda por cortar. Entre piezas separadas por un
+    hueco el corte común es la línea media del hueco (ver ``find_common_lines``); se
+    agrega como un trazo abierto más.
+
+    :param rings: Contornos de las piezas (sin repetir el primer vértice)
+    :param tolerance: Distancia máxima entre aristas para considerarlas la misma línea
+    :return: Tupla ``(trazos, ahorro)``: ``trazos`` es una lista de
+        ``(anillo, vertices, cerrado)`` y ``ahorro`` la longitud de corte que se evita
+    :rtype: tuple[list[tuple[int, list[tuple[float, float]], bool]], float]
+    """
+    omitidos, medias = find_common_lines(rings, tolerance)
+    trazos = []
+    ahorro = 0.0
+    for k, ring in enumerate(rings):
+        n = len(ring)
+        if not any((k, i) in omitidos for i in range(n)):
+            trazos.append((k, list(ring), True))
+            continue
+        # Tramos que se conservan, en orden a lo largo del anillo
+        tramos = []
+        for i in range(n):
+            p, q = np.asarray(ring[i], dtype=float), np.asarray(ring[(i + 1) % n], dtype=float)
+            largo = float(np.hypot(*(q - p)))
+            cortes = [0.0]
+            for t0, t1 in omitidos.get((k, i), []):
+                ahorro += t1 - t0
+                cortes.extend((t0, t1))
+            cortes.append(largo)
+            for t0, t1 in zip(cortes[0::2], cortes[1::2]):
+                if t1 - t0 > tolerance:
+                    u = (q - p) / largo
+                    inicio = ring[i] if t0 == 0.0 else tuple((p + u * t0).tolist())
+                    fin = ring[(i + 1) % n] if t1 == largo else tuple((p + u * t1).tolist())
+                    tramos.append((inicio, fin))
+        # Se encadenan los tramos contiguos en polilíneas
+        cadenas = []
+        for inicio, fin in tramos:
+            if cadenas and cadenas[-1][-1] == inicio:
+                cadenas[-1].append(fin)
+            else:
+                cadenas.append([inicio, fin])
+        if len(cadenas) > 1 and cadenas[-1][-1] == cadenas[0][0]:
+            cadenas[0] = cadenas.pop()[:-1] + cadenas[0]
+        trazos.extend((k, cadena, False) for cadena in cadenas)
+    for k, (p, q) in medias:
+        ahorro -= float(np.hypot(q[0] - p[0], q[1] - p[1]))
+        trazos.append((k, [p, q], False))
+    return trazos, ahorro
+
+
+def sheet_rings(result: dict):
+    """
+    Contornos reales de las piezas colocadas en una plancha, en sentido horario.
+
+    :rtype: list[list[tuple[float, float]]]
+    """
+    return [
+        list(orient(p.piece.polygon, -1.0).exterior.coords[:-1])
+        for p in result["placements"] or []
+    ]
+
+
+def common_line_savings(result: dict, tolerance: float = 1e-6):
+    """
+    Longitud de corte de una plancha con y sin corte en línea común.
+
+    :return: Diccionario con ``longitud`` (corte de todos los contornos), ``ahorro``
+        (longitud compartida que se corta una sola vez) y ``longitud_comun``
+    :rtype: dict
+    """
+    rings = sheet_rings(result)
+    longitud = float(sum(shapely.length(shapely.linearrings(r)) for r in rings)) if rings else 0.0
+    _, ahorro = merge_common_lines(rings, tolerance)
+    return {"longitud": longitud, "ahorro": ahorro, "longitud_comun": longitud - ahorro}
@@ -0,0 +1,69 @@
+import time
+
+from src.models import Frame, Placement, PolygonPiece
+
+
+def compact_layout(
+    solver,
+    frames: list[Frame],
+    placements: list[Placement],
+    pending: list[PolygonPiece],
+    max_passes: int = 3,
+):
+    """
+    Compactación por gravedad después de la construcción.
+
+    Cada colocación se desliza hacia abajo y a la izquierda dentro de la región libre
+    que la contiene (marco menos los NFP de las demás piezas) hasta el contacto más
+    bajo posible. Se procesan de abajo hacia arriba, así que cada pieza se apoya sobre
+    las que ya se asentaron, y cada movimiento se valida antes de aplicarlo, de modo
+    que la distribución sigue siendo factible en todo momento. Después se vuelve a
+    intentar colocar las piezas pendientes en el espacio que quedó libre.
+
+    :param solver: Solver que aporta la caché de NFP, los contornos de separación y
+        la prueba de solapamiento (``GraspSolver``)
+    :param frames: Marcos de la solución
+    :param placements: Colocaciones de la solución (se modifica)
+    :param pending: Piezas sin colocar
+    :param max_passes: Pasadas máximas de compactación por marco
+    :return: Tupla ``(placements, pendientes)`` con las piezas que siguen sin lugar
+    :rtype: tuple[list[Placement], list[PolygonPiece]]
+    """
+    stats = solver.stats
+    t0 = time.perf_counter()
+    for frame in frames:
+        for _ in range(max_passes):
+            movidas = 0
+            indices = [i for i, p in enumerate(placements) if p.frame is frame]
+            indices.sort(key=lambda i: placements[i].piece.polygon.bounds[1::-1])
+            for i in indices:
+                p = placements[i]
+                otras = placements[:i] + placements[i + 1:]
+                delta = solver.bottom_left_position(frame, otras, p.piece, slide=True)
+                if delta is None:
+                    continue
+                dx, dy = delta
+                placements[i] = Placement(
+                    p.piece.move(dx, dy),
+                    frame,
+                    (p.position[0] + dx, p.position[1] + dy),
+                    p.rotation,
+                    source=p.source,
+                )
+                movidas += 1
+            stats.count("compactaciones", movidas)
+            if not movidas:
+                break
+
+    restantes = []
+    for piece in sorted(pending, key=lambda p: p.polygon.area, reverse=True):
+        for frame in frames:
+            pos = solver.bottom_left_position(frame, placements, piece)
+            if pos is not None:
+                placements.append(Placement(piece.move(*pos), frame, pos, source=piece))
+                stats.count("recolocadas")
+                break
+        else:
+            restantes.append(piece)
+    stats.add_time("compactacion", time.perf_counter() - t0)
+    return placements, restantes
@@ -0,0 +1,99 @@
+import numpy as np
+import shapely
+
+from src.models import Frame, Placement, PolygonPiece
+
+
+class CostIndex:
+    """
+    Índice de precios por pieza para calcular áreas, desperdicio y costos de planchas.
+
+    Los precios se indexan una sola vez por instancia de pieza (no por nombre): cada
+    colocación se asocia con su pieza original a través de ``Placement.source``, y
+    las áreas y costos de una plancha se calculan de una vez sobre arreglos.
+
+    :var precio_m2: Precio por m² de la plancha (y de las piezas sin precio propio)
+    :vartype precio_m2: float
+    """
+
+    def __init__(self, pieces: list[PolygonPiece], precio_m2: float = 0.0):
+        """
+        :param pieces: Piezas del trabajo, con su ``precio_m2``
+        :type pieces: list[PolygonPiece]
+        :param precio_m2: Precio por m² de la plancha
+        :type precio_m2: float
+        """
+        self.precio_m2 = precio_m2
+        self._precios = {id(p): getattr(p, "precio_m2", precio_m2) for p in pieces}
+        # Mantiene vivas las piezas indexadas para que sus id no se reutilicen
+        self._pieces = list(pieces)
+        self._sheets = {}
+
+    def price(self, placement: Placement):
+        """
+        Precio por m² de una colocación según su pieza original.
+
+        :rtype: float
+        """
+        original = placement.source if placement.source is not None else placement.piece
+        precio = self._precios.get(id(original))
+        if precio is None:
+            precio = getattr(original, "precio_m2", self.precio_m2)
+        return precio
+
+    def sheet(self, frame: Frame, result: dict):
+        """
+        Áreas, costos y totales de una plancha. El resultado se guarda, así que volver a
+        pedir la misma plancha (por ejemplo, al redibujar el panel) no recalcula nada.
+
+        :return: Diccionario con ``areas`` y ``costos`` (arreglos, uno por colocación),
+            ``area_total``, ``area_usada``, ``desperdicio``, ``aprovechamiento``,
+            ``costo``, ``precio_plancha``, ``colocadas`` y ``no_colocadas``
+        :rtype: dict
+        """
+        guardado = self._sheets.get(id(result))
+        if guardado is not None and guardado[0] is result:
+            return guardado[1]
+
+        placements = result["placements"] or []
+        polygons = np.asarray([p.piece.polygon for p in placements], dtype=object)
+        areas = shapely.area(polygons) if len(polygons) else np.zeros(0)
+        precios = np.fromiter((self.price(p) for p in placements), dtype=float, count=len(placements))
+        costos = areas * precios
+        area_total = frame.width * frame.height
+        datos = {
+            "areas": areas,
+            "costos": costos,
+            "area_total": area_total,
+            "area_usada": float(areas.sum()),
+            "desperdicio": result["waste"],
+            "aprovechamiento": (1 - result["waste"] / area_total) * 100,
+            "costo": float(costos.sum()),
+            "precio_plancha": self.precio_m2 * area_total,
+            "colocadas": len(placements),
+            "no_colocadas": len(result["not_placed"] or []),
+        }
+        self._sheets[id(result)] = (result, datos)
+        return datos
+
+    def job(self, frames: list[Frame], results: list[dict]):
+        """
+        Totales de un trabajo completo (todas sus planchas).
+
+        :return: Diccionario con ``planchas`` (los datos de ``sheet`` de cada una),
+            ``area_total``, ``area_usada``, ``desperdicio``, ``aprovechamiento``,
+            ``costo`` y ``precio_planchas``
+        :rtype: dict
+        """
+        planchas = [self.sheet(frame, result) for frame, result in zip(frames, results)]
+        area_total = sum(h["area_total"] for h in planchas)
+        desperdicio = sum(h["desperdicio"] for h in planchas)
+        return {
+            "planchas": planchas,
+            "area_total": area_total,
+            "area_usada": sum(h["area_usada"] for h in planchas),
+            "desperdicio": desperdicio,
+            "aprovechamiento": (1 - desperdicio / area_total) * 100 if area_total else 0.0,
+            "costo": sum(h["costo"] for h in planchas),
+            "precio_planchas": sum(h["precio_plancha"] for h in planchas),
+        }
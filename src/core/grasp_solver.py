@@ -1,7 +1,34 @@
 import random
+import time
+from collections import defaultdict
+from collections.abc import Callable
 from src.models import Frame, Placement, PolygonPiece
-from .nfp import NFPComputer
-from shapely.geometry import Point
+from src.utils.helpers import firma_tipo
+from .compaction import compact_layout
+from .nfp import NFPCache
+from .spacing import ClearanceShapes
+from .stats import NULL_STATS, SolverStats, run_profiled
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Point, box
+
+
+# Versión del comportamiento del solver. Se incrementa cuando un cambio altera las
+# soluciones que produce, para invalidar los resultados guardados en caché.
+SOLVER_VERSION = "3"
+
+
+def _inner_fit(x0: float, y0: float, x1: float, y1: float):
+    """
+    Traslaciones que mantienen la pieza dentro del marco: un rectángulo, o un segmento
+    o un punto cuando la pieza mide lo mismo que el marco en alguna dirección.
+    """
+    if x1 - x0 > 1e-9 and y1 - y0 > 1e-9:
+        return box(x0, y0, x1, y1)
+    if x1 - x0 > 1e-9 or y1 - y0 > 1e-9:
+        return LineString([(x0, y0), (x1, y1)])
+    return Point(x0, y0)
+
 
 class GraspSolver:
     """
@@ -14,9 +41,34 @@ class GraspSolver:
     :vartype pieces: list[PolygonPiece]
     :var iterations: Número de iteraciones para la búsqueda GRASP.
     :vartype iterations: int
+    :var time_limit: Tiempo máximo en segundos para la búsqueda (None = sin límite).
+    :vartype time_limit: float or None
+    :var seed: Semilla del generador aleatorio (None = no reproducible).
+    :vartype seed: int or None
+    :var seed_solutions: Soluciones previas usadas para construir las primeras iteraciones.
+    :vartype seed_solutions: list[list[Placement]]
+    :var stats: Estadísticas de la ejecución (``NULL_STATS`` si están desactivadas).
+    :vartype stats: SolverStats or NullStats
+    :var clearance: Contornos de separación usados en los NFP y las pruebas de solapamiento.
+    :vartype clearance: ClearanceShapes
     """
 
-    def __init__(self, pieces: list[PolygonPiece], frames: list[Frame], iterations: int = 10, rcl_size: int = 3):
+    def __init__(
+        self,
+        pieces: list[PolygonPiece],
+        frames: list[Frame],
+        iterations: int = 10,
+        rcl_size: int = 3,
+        time_limit: float | None = None,
+        seed: int | None = None,
+        seed_solutions: list | None = None,
+        stats: bool = False,
+        profile: str | None = None,
+        nfp_cache: NFPCache | None = None,
+        spacing: float = 0.0,
+        compact: bool = True,
+        stop: Callable[[], bool] | None = None,
+    ):
         """
         Inicializa el solver GRASP para el problema de colocación de piezas poligonales.
 
@@ -24,58 +76,115 @@ class GraspSolver:
         :param frames: Lista de marcos rectangulares donde colocar las piezas
         :param iterations: Número de iteraciones del algoritmo GRASP
         :param rcl_size: Tamaño de la lista restringida de candidatos (RCL)
+        :param time_limit: Tiempo máximo en segundos; al agotarse se devuelve la mejor
+            solución encontrada (siempre se completa al menos una iteración)
+        :param seed: Semilla para que la búsqueda sea reproducible
+        :param seed_solutions: Soluciones de una ejecución anterior o de un trabajo parecido
+            (resultados de ``solve`` o listas de ``Placement``). Cada una arranca una de las
+            primeras iteraciones: se reutilizan sus colocaciones en el mismo orden y se
+            completan con la construcción GRASP habitual. Si alguna iteración semilla coloca
+            al menos tantas piezas como su semilla, la búsqueda termina ahí.
+        :param stats: Registrar contadores y tiempos de las operaciones costosas; se
+            devuelven en la entrada ``stats`` del resultado
+        :param profile: Perfilar la ejecución con ``"cprofile"`` o ``"pyinstrument"``;
+            el reporte se agrega a ``stats`` (implica ``stats=True``)
+        :param nfp_cache: Caché de NFP compartida (por ejemplo, entre planchas); si no se
+            indica, el solver usa una propia
+        :param spacing: Distancia mínima entre piezas (ancho de corte más separación).
+            Los NFP y las pruebas de solapamiento usan cada pieza agrandada en la mitad
+            de esta distancia; las colocaciones conservan el contorno real, que es el
+            que se dibuja y se cotiza, y el que debe quedar dentro de la plancha
+        :param compact: Si quedan piezas sin colocar, compactar cada construcción por
+            gravedad y volver a intentarlas en el espacio liberado (ver ``compact_layout``)
+        :param stop: Se consulta después de cada iteración; si devuelve True la búsqueda
+            termina con la mejor solución hasta ahora (por ejemplo, cuando otro motor
+            del portafolio ya colocó todas las piezas)
         """
         self.pieces = pieces
         self.frames = frames
         self.iterations = iterations
         self.rcl_size = rcl_size
+        self.time_limit = time_limit
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.seed_solutions = [
+            s["placements"] if isinstance(s, dict) else s
+            for s in (seed_solutions or [])
+            if s
+        ]
+        self.profile = profile
+        self.stats = SolverStats() if (stats or profile) else NULL_STATS
+        self.nfp_cache = nfp_cache if nfp_cache is not None else NFPCache()
+        self.clearance = ClearanceShapes(spacing)
+        self.compact = compact
+        self.stop = stop
 
     def solve(self):
         """
         Ejecuta el algoritmo GRASP para encontrar la mejor distribución de piezas en los marcos.
+
+        :return: Diccionario con ``placements``, ``not_placed``, ``waste`` y ``stats``
+            (None si la instrumentación está desactivada)
+        :rtype: dict
         """
+        if self.profile:
+            result, reporte = run_profiled(self.profile, self._solve)
+            self.stats.profile = reporte
+        else:
+            result = self._solve()
+        result["stats"] = self.stats.as_dict()
+        return result
+
+    def _solve(self):
+        hits, misses = self.nfp_cache.hits, self.nfp_cache.misses
         best_solution = None
         best_not_placed = None
         best_waste = float("inf")
         best_placed_count = -1
+        start = time.perf_counter()
 
-        for _ in range(self.iterations):
+        for iteration in range(self.iterations):
+            iteration_start = time.perf_counter()
             pieces_left = self.pieces[:]  # Usar una copia de la lista, no de los objetos
             placements = []
             used_frames = [frame.copy() for frame in self.frames]
             not_placed = []
 
+            # Arranque en caliente: las primeras iteraciones parten de las soluciones semilla
+            if iteration < len(self.seed_solutions):
+                self.place_seed(self.seed_solutions[iteration], pieces_left, placements, used_frames)
+
             while pieces_left:
                 # Ordena por área descendente y toma las N más grandes como candidatos (RCL)
                 pieces_sorted = sorted(pieces_left, key=lambda p: p.polygon.area, reverse=True)
                 rcl = pieces_sorted[:self.rcl_size] if len(pieces_sorted) >= self.rcl_size else pieces_sorted
-                piece = random.choice(rcl)
+                piece = self.random.choice(rcl)
                 pieces_left.remove(piece)
 
                 placed = False
                 for frame in used_frames:
-                    # Intentar colocar la pieza en diferentes posiciones
-                    for attempt in range(5):  # Intentar hasta 5 veces con diferentes posiciones
-                        pos = self.find_feasible_position_nfp(frame, placements, piece)
-                        if pos:
-                            moved_piece = piece.move(*pos)
-                            # Verificar que no hay solapamiento
-                            if not any(moved_piece.polygon.intersects(p.piece.polygon) for p in placements):
-                                placements.append(Placement(moved_piece, frame, pos))
-                                placed = True
-                                break
-                        if placed:
+                    # La búsqueda es determinista: si no encuentra lugar, repetirla no cambia nada
+                    pos = self.find_feasible_position_nfp(frame, placements, piece)
+                    if pos:
+                        moved_piece = piece.move(*pos)
+                        # Verificar que no hay solapamiento
+                        if not self._overlaps(moved_piece, placements):
+                            placements.append(Placement(moved_piece, frame, pos, source=piece))
+                            placed = True
                             break
-                    if placed:
-                        break
 
                 if not placed:
                     not_placed.append(piece)
 
+            # Compactar libera espacio contiguo para las piezas que no entraron
+            if self.compact and not_placed:
+                placements, not_placed = compact_layout(self, used_frames, placements, not_placed)
+
             waste = sum(frame.polygon.area for frame in used_frames) - sum(
                 p.piece.polygon.area for p in placements
             )
             placed_count = len(placements)
+            self.stats.add_iteration(time.perf_counter() - iteration_start)
 
             # Prioriza la mayor cantidad de piezas colocadas, luego el menor desperdicio
             if (placed_count > best_placed_count) or (
@@ -86,16 +195,172 @@ class GraspSolver:
                 best_waste = waste
                 best_placed_count = placed_count
 
+            # Con todas las piezas colocadas el desperdicio ya no puede mejorar
+            if best_placed_count == len(self.pieces):
+                break
+            # Si las semillas ya alcanzan la calidad de la ejecución anterior no se sigue buscando
+            if self.seed_solutions and iteration == len(self.seed_solutions) - 1 and best_placed_count >= max(
+                len(seed) for seed in self.seed_solutions
+            ):
+                break
+            if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                break
+            if self.stop is not None and self.stop():
+                break
+
+        self.stats.count("nfp_cache_aciertos", self.nfp_cache.hits - hits)
+        self.stats.count("nfp_calculados", self.nfp_cache.misses - misses)
         return {
             "placements": best_solution,
             "not_placed": best_not_placed,
             "waste": best_waste,
         }
 
+    def place_seed(
+        self,
+        seed: list[Placement],
+        pieces_left: list[PolygonPiece],
+        placements: list[Placement],
+        used_frames: list[Frame],
+    ):
+        """
+        Repite las colocaciones de una solución semilla sobre las piezas actuales.
+
+        Cada colocación de la semilla se asigna a una pieza pendiente del mismo tipo
+        (misma firma geométrica) y se conserva su posición si sigue siendo factible.
+        Las colocaciones sin pieza equivalente o que ya no caben se omiten; esas piezas
+        quedan en ``pieces_left`` para la construcción normal.
+
+        :param seed: Colocaciones de la solución semilla, en su orden original
+        :param pieces_left: Piezas pendientes (se modifica)
+        :param placements: Colocaciones de la iteración actual (se modifica)
+        :param used_frames: Marcos de la iteración actual
+        """
+        pendientes = defaultdict(list)
+        for piece in reversed(pieces_left):
+            pendientes[firma_tipo(piece)].append(piece)
+
+        # Los marcos de la semilla se asocian a los marcos actuales en orden de aparición
+        frame_map = {}
+        for p in seed:
+            if id(p.frame) not in frame_map and len(frame_map) < len(used_frames):
+                frame_map[id(p.frame)] = used_frames[len(frame_map)]
+
+        for p in seed:
+            frame = frame_map.get(id(p.frame))
+            candidatas = pendientes.get(firma_tipo(p.piece, p.position))
+            if frame is None or not candidatas:
+                continue
+            piece = candidatas[-1]
+            moved_piece = piece.move(*p.position)
+            if not frame.contains(moved_piece):
+                continue
+            if self._overlaps(moved_piece, placements, frame):
+                continue
+            candidatas.pop()
+            pieces_left.remove(piece)
+            placements.append(Placement(moved_piece, frame, p.position, p.rotation, source=piece))
+
+    def _overlaps(self, piece: PolygonPiece, placements: list[Placement], frame: Frame | None = None):
+        """
+        Indica si la pieza se solapa con alguna de las colocaciones (opcionalmente, solo
+        con las del marco indicado), comparando sus contornos de separación. Las piezas
+        que solo se tocan en el borde no se solapan.
+        """
+        clearance = self.clearance
+        polygon = clearance.of(piece).polygon
+        for p in placements:
+            if frame is not None and p.frame != frame:
+                continue
+            self.stats.count("pruebas_solapamiento")
+            other = clearance.of(p.piece).polygon
+            if polygon.intersects(other) and not polygon.touches(other):
+                return True
+        return False
+
+    def bottom_left_position(
+        self,
+        frame: Frame,
+        placements: list[Placement],
+        piece: PolygonPiece,
+        slide: bool = False,
+        max_candidates: int = 256,
+    ):
+        """
+        Busca la traslación que deja la pieza lo más abajo y a la izquierda posible.
+
+        La región factible es el rectángulo de traslaciones que mantienen la pieza dentro
+        del marco menos la unión de los NFP de las piezas del marco. Los candidatos son
+        los vértices de la región y los puntos del borde de los NFP dentro del rectángulo
+        (encajes exactos y contactos al ras, que la diferencia reduce a puntos o
+        segmentos y descarta). Se prueban en orden (menor ``y``, luego menor ``x``) y se
+        devuelve el primero que pasa la prueba de solapamiento.
+
+        :param slide: Deslizar la pieza desde donde está: solo se considera la parte de la
+            región factible que contiene su posición actual y solo se aceptan posiciones
+            más bajas (o igual de bajas y más a la izquierda)
+        :param max_candidates: Vértices que se prueban como máximo
+        :return: Traslación ``(dx, dy)`` para ``piece.move``, o None si no hay lugar (o,
+            con ``slide``, si no hay una posición mejor)
+        :rtype: tuple[float, float] or None
+        """
+        stats = self.stats
+        fx0, fy0, fx1, fy1 = frame.polygon.bounds
+        px0, py0, px1, py1 = piece.polygon.bounds
+        if px1 - px0 > fx1 - fx0 or py1 - py0 > fy1 - fy0:
+            return None
+        region = _inner_fit(fx0 - px0, fy0 - py0, fx1 - px1, fy1 - py1)
+        puntos = [shapely.get_coordinates(region)]
+
+        moving = self.clearance.of(piece)
+        nfps = []
+        t0 = time.perf_counter()
+        for p in placements:
+            if p.frame is frame:
+                nfps.append(self.nfp_cache.get(self.clearance.of(p.piece), moving))
+        stats.add_time("nfp", time.perf_counter() - t0)
+        stats.count("nfp", len(nfps))
+        union = None
+        if nfps:
+            t0 = time.perf_counter()
+            union = shapely.union_all(nfps)
+            contorno = region
+            region = region.difference(union)
+            # Los encajes exactos y los contactos al ras quedan sobre el borde de los NFP
+            # (puntos o segmentos) y la diferencia los descarta: se agregan aparte
+            puntos = [shapely.get_coordinates(region), shapely.get_coordinates(union.boundary.intersection(contorno))]
+            stats.add_time("diferencia", time.perf_counter() - t0)
+            stats.count("diferencia")
+
+        candidatos = np.unique(np.vstack(puntos), axis=0)
+        if union is not None and len(candidatos):
+            # Los puntos del interior de algún NFP nunca son factibles
+            candidatos = candidatos[~shapely.contains_xy(union, candidatos[:, 0], candidatos[:, 1])]
+        if slide:
+            # Solo la parte de la región donde está la pieza (traslación nula)
+            partes = [g for g in getattr(region, "geoms", [region]) if not g.is_empty]
+            if not partes:
+                return None
+            origen = Point(0.0, 0.0)
+            parte = min(partes, key=origen.distance)
+            candidatos = candidatos[shapely.dwithin(parte, shapely.points(candidatos), 1e-9)]
+            x, y = candidatos[:, 0], candidatos[:, 1]
+            candidatos = candidatos[(y < -1e-9) | ((np.abs(y) <= 1e-9) & (x < -1e-9))]
+        candidatos = candidatos[np.lexsort((candidatos[:, 0], candidatos[:, 1]))]
+
+        for dx, dy in candidatos[:max_candidates].tolist():
+            stats.count("candidatos")
+            moved = piece.move(dx, dy)
+            if frame.contains(moved) and not self._overlaps(moved, placements, frame):
+                return (dx, dy)
+        return None
+
     def find_feasible_position_nfp(self, frame: Frame, placements: list[Placement], piece: PolygonPiece):
         """
         Busca una posición factible para la pieza en el marco usando NFP.
         """
+        stats = self.stats
+        stats.count("busquedas")
         # Si no hay piezas colocadas aún, usar la esquina inferior izquierda del marco
         if not any(p.frame == frame for p in placements):
             minx, miny, _, _ = frame.polygon.bounds
@@ -106,17 +371,27 @@ class GraspSolver:
 
         # Calcula los NFP para todas las piezas ya colocadas en este marco
         nfp_union = None
+        moving = self.clearance.of(piece)
         for p in placements:
             if p.frame == frame:
-                nfp = NFPComputer.compute_nfp(p.piece, piece)
+                t0 = time.perf_counter()
+                nfp = self.nfp_cache.get(self.clearance.of(p.piece), moving)
+                stats.add_time("nfp", time.perf_counter() - t0)
+                stats.count("nfp")
                 if nfp_union is None:
                     nfp_union = nfp
                 else:
+                    t0 = time.perf_counter()
                     nfp_union = nfp_union.union(nfp)
+                    stats.add_time("union", time.perf_counter() - t0)
+                    stats.count("union")
 
         # La región factible es el área disponible menos la unión de los NFP
         if nfp_union:
+            t0 = time.perf_counter()
             feasible_region = available_region.difference(nfp_union)
+            stats.add_time("diferencia", time.perf_counter() - t0)
+            stats.count("diferencia")
         else:
             feasible_region = available_region
 
@@ -125,30 +400,27 @@ class GraspSolver:
             return None
 
         # Buscar una posición factible en la región
-        if feasible_region.geom_type == "Polygon":
-            # Intentar diferentes puntos dentro del polígono
-            minx, miny, maxx, maxy = feasible_region.bounds
-            for x in range(int(minx), int(maxx), 2):  # Paso de 2 para reducir el número de intentos
-                for y in range(int(miny), int(maxy), 2):
-                    point = (x, y)
-                    if feasible_region.contains(Point(point)):
-                        test_piece = piece.move(x, y)
-                        if frame.contains(test_piece) and not any(
-                            test_piece.polygon.intersects(p.piece.polygon) for p in placements if p.frame == frame
-                        ):
-                            return point
-        elif feasible_region.geom_type == "MultiPolygon":
-            # Intentar en cada polígono de la región factible
-            for poly in feasible_region.geoms:
+        t0 = time.perf_counter()
+        try:
+            if feasible_region.geom_type == "Polygon":
+                regions = [feasible_region]
+            elif feasible_region.geom_type == "MultiPolygon":
+                # Intentar en cada polígono de la región factible
+                regions = list(feasible_region.geoms)
+            else:
+                return None
+
+            for poly in regions:
+                # Intentar diferentes puntos dentro del polígono
                 minx, miny, maxx, maxy = poly.bounds
-                for x in range(int(minx), int(maxx), 2):
+                for x in range(int(minx), int(maxx), 2):  # Paso de 2 para reducir el número de intentos
                     for y in range(int(miny), int(maxy), 2):
                         point = (x, y)
+                        stats.count("candidatos")
                         if poly.contains(Point(point)):
                             test_piece = piece.move(x, y)
-                            if frame.contains(test_piece) and not any(
-                                test_piece.polygon.intersects(p.piece.polygon) for p in placements if p.frame == frame
-                            ):
+                            if frame.contains(test_piece) and not self._overlaps(test_piece, placements, frame):
                                 return point
-
-        return None
+            return None
+        finally:
+            stats.add_time("busqueda_candidatos", time.perf_counter() - t0)
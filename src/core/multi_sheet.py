@@ -0,0 +1,97 @@
+import time
+
+from src.models import Frame, PolygonPiece
+from .nfp import NFPCache
+from .result_cache import job_key
+from .solvers import get_solver
+
+
+# Parámetros que solo cambian cómo se ejecuta el motor (no el trabajo): no forman
+# parte de la clave de la caché de resultados
+_EXECUTION_PARAMS = ("workers",)
+
+
+def solve_sheets(
+    pieces: list[PolygonPiece],
+    width: float,
+    height: float,
+    time_limit: float | None = None,
+    cache=None,
+    seed_results: list[dict] | None = None,
+    solver: str | type = "grasp",
+    **solver_kwargs,
+):
+    """
+    Resuelve la colocación en múltiples planchas y entrega cada plancha apenas termina.
+
+    En cada paso se crea una plancha nueva de ``width`` x ``height`` y se intentan
+    colocar solo las piezas que quedaron sin colocar en las planchas anteriores.
+    Al ser un generador, quien lo consume puede mostrar o exportar la primera
+    plancha mientras las siguientes todavía no se han calculado.
+
+    :param pieces: Piezas a colocar
+    :type pieces: list[PolygonPiece]
+    :param width: Base de cada plancha
+    :type width: float
+    :param height: Altura de cada plancha
+    :type height: float
+    :param time_limit: Tiempo máximo en segundos para todas las planchas. Cuando se
+        agota, las planchas restantes se resuelven con una sola iteración
+    :type time_limit: float or None
+    :param cache: Caché de resultados (``ResultCache``); si el trabajo ya fue resuelto
+        se entregan las planchas guardadas sin ejecutar el solver
+    :type cache: ResultCache or None
+    :param seed_results: Resultados por plancha de una ejecución anterior; el de la
+        plancha ``k`` se usa como semilla de arranque en caliente del solver de esa plancha
+    :type seed_results: list[dict] or None
+    :param solver: Motor que resuelve cada plancha: nombre del registro (``"grasp"``,
+        ``"genetico"``, ``"portafolio"``, ver ``SOLVERS``) o la clase del motor
+    :type solver: str or type
+    :param solver_kwargs: Parámetros adicionales para el motor. Si no se pasa
+        ``nfp_cache``, todas las planchas comparten una misma caché de NFP
+    :return: Generador de tuplas ``(frame, result)`` por plancha
+    :rtype: Iterator[tuple[Frame, dict]]
+    """
+    if isinstance(solver, str):
+        solver = get_solver(solver)
+    if cache is not None:
+        params = {k: v for k, v in solver_kwargs.items() if k not in _EXECUTION_PARAMS}
+        params["time_limit"] = time_limit
+        if solver is not get_solver("grasp"):
+            params["motor"] = solver.__name__
+        key = job_key(pieces, width, height, params)
+        cached = cache.get(key, pieces)
+        if cached is not None:
+            yield from cached
+            return
+        frames, results = [], []
+
+    # Se agrega después de calcular la clave: la caché de NFP no cambia el resultado
+    solver_kwargs.setdefault("nfp_cache", NFPCache())
+    piezas_restantes = pieces[:]
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    # Límite de iteraciones para evitar bucles infinitos
+    max_iter = len(piezas_restantes)
+    iter_count = 0
+    while piezas_restantes and iter_count < max_iter:
+        frame = Frame(width, height)
+        if deadline is not None:
+            solver_kwargs["time_limit"] = max(deadline - time.perf_counter(), 0.0)
+        if seed_results and iter_count < len(seed_results):
+            solver_kwargs["seed_solutions"] = [seed_results[iter_count]]
+        else:
+            solver_kwargs.pop("seed_solutions", None)
+        result = solver(pieces=piezas_restantes, frames=[frame], **solver_kwargs).solve()
+        if cache is not None:
+            frames.append(frame)
+            results.append(result)
+        yield frame, result
+
+        piezas_restantes = result["not_placed"]
+        if not result["placements"]:
+            break
+        iter_count += 1
+
+    if cache is not None and frames:
+        cache.put(key, frames, results, getattr(pieces[0], "precio_m2", 0.0))
@@ -82,3 +82,59 @@ class NFPComputer:
                     feasible.append((x, y))
 
         return feasible
+
+
+class NFPCache:
+    """
+    Caché de NFP por par de tipos de pieza.
+
+    El NFP solo depende de la forma de las piezas: si la pieza fija está desplazada
+    ``a`` y la móvil ``b`` respecto de su forma normalizada, el NFP es el de las formas
+    normalizadas trasladado en ``a - b``. Por eso se calcula una sola vez por par de
+    tipos y luego solo se traslada.
+
+    :var hits: Cantidad de NFP obtenidos desde la caché.
+    :vartype hits: int
+    :var misses: Cantidad de NFP calculados.
+    :vartype misses: int
+    """
+
+    def __init__(self):
+        self._nfps = {}
+        self._keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _normalized(self, piece: PolygonPiece):
+        """
+        Devuelve la firma de la forma normalizada de la pieza y su desplazamiento.
+        La forma se guarda en la pieza para no recalcularla en cada consulta; se
+        recalcula si la pieza cambió de vértices (por ejemplo, al escalarla).
+        """
+        forma = getattr(piece, "_forma_normalizada", None)
+        if forma is None or forma[2] is not piece.vertices:
+            minx, miny, _, _ = piece.polygon.bounds
+            vertices = tuple((round(x - minx, 6) + 0.0, round(y - miny, 6) + 0.0) for x, y in piece.vertices)
+            forma = piece._forma_normalizada = (vertices, (minx, miny), piece.vertices)
+        vertices, offset, _ = forma
+        key = self._keys.get(vertices)
+        if key is None:
+            key = self._keys[vertices] = len(self._keys)
+        return key, vertices, offset
+
+    def get(self, fixed: PolygonPiece, moving: PolygonPiece):
+        """
+        Devuelve el NFP entre dos piezas, calculándolo solo si el par de tipos es nuevo.
+
+        :rtype: shapely.geometry.Polygon o MultiPolygon
+        """
+        key_f, verts_f, (ax, ay) = self._normalized(fixed)
+        key_m, verts_m, (bx, by) = self._normalized(moving)
+        nfp = self._nfps.get((key_f, key_m))
+        if nfp is None:
+            self.misses += 1
+            nfp = NFPComputer.compute_nfp(PolygonPiece(fixed.name, list(verts_f)), PolygonPiece(moving.name, list(verts_m)))
+            self._nfps[(key_f, key_m)] = nfp
+        else:
+            self.hits += 1
+        return translate(nfp, ax - bx, ay - by)
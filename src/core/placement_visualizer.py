@@ -1,14 +1,83 @@
 import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon as MplPolygon
-from shapely.affinity import translate
+import numpy as np
+import shapely
+from matplotlib.collections import PolyCollection
 
 from src.models import Frame, Placement, PolygonPiece
 
 
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
+# Una etiqueta se muestra si su pieza ocupa al menos esta fracción del ancho visible
+LABEL_MIN_FRACTION = 0.04
+# Máximo de etiquetas visibles a la vez (se priorizan las piezas más grandes)
+MAX_LABELS = 150
+
+
+def _stacked_rings(polygons: list):
+    """
+    Convierte polígonos en la lista de anillos que espera ``PolyCollection``,
+    extrayendo todas las coordenadas en un solo arreglo apilado.
+
+    :return: Tupla ``(anillos, coordenadas, indices)`` donde ``indices`` indica a qué
+        polígono pertenece cada fila de ``coordenadas``
+    """
+    exteriors = shapely.get_exterior_ring(np.asarray(polygons, dtype=object))
+    coords, index = shapely.get_coordinates(exteriors, return_index=True)
+    splits = np.flatnonzero(np.diff(index)) + 1
+    return np.split(coords, splits), coords, index
+
+
+class _LabelLayer:
+    """
+    Etiquetas de un conjunto de piezas con decimación según el zoom: al cambiar los
+    límites del eje solo se muestran las piezas visibles que son suficientemente
+    grandes, y nunca más de ``MAX_LABELS``. Los textos se reutilizan entre
+    actualizaciones en lugar de crear un artista por pieza.
+    """
+
+    def __init__(self, ax, centers: np.ndarray, widths: np.ndarray, texts: list[str], color: str):
+        self.ax = ax
+        self.centers = centers
+        self.widths = widths
+        self.texts = texts
+        self.color = color
+        self.artists = []
+        # Piezas más grandes primero: son las que se conservan al decimar
+        self.order = np.argsort(-widths, kind="stable")
+        ax.callbacks.connect("xlim_changed", self.update)
+        ax.callbacks.connect("ylim_changed", self.update)
+
+    def update(self, ax=None):
+        ax = self.ax
+        x0, x1 = sorted(ax.get_xlim())
+        y0, y1 = sorted(ax.get_ylim())
+        cx, cy = self.centers[self.order, 0], self.centers[self.order, 1]
+        visible = (
+            (cx >= x0) & (cx <= x1) & (cy >= y0) & (cy <= y1)
+            & (self.widths[self.order] >= (x1 - x0) * LABEL_MIN_FRACTION)
+        )
+        chosen = self.order[visible][:MAX_LABELS]
+
+        while len(self.artists) < len(chosen):
+            self.artists.append(
+                ax.text(0, 0, "", fontsize=8, ha="center", va="center", color=self.color, clip_on=True)
+            )
+        for artist, i in zip(self.artists, chosen):
+            artist.set_position(self.centers[i])
+            artist.set_text(self.texts[i])
+            artist.set_visible(True)
+        for artist in self.artists[len(chosen):]:
+            artist.set_visible(False)
+
+
 class PlacementVisualizer:
     """
     Clase para visualizar gráficamente los resultados de la colocación de piezas en los marcos.
 
+    Todas las piezas colocadas se dibujan como una sola ``PolyCollection`` (y las no
+    colocadas como otra), de modo que el costo de dibujo casi no depende de la
+    cantidad de piezas. Las etiquetas se reducen según el nivel de zoom.
+
     :var frames: Lista de marcos utilizados.
     :type frames: list[Frame]
     :var placements: Lista de colocaciones realizadas.
@@ -41,13 +110,40 @@ class PlacementVisualizer:
         self.placements = placements
         self.not_placed = not_placed
         self.waste = waste
+        self.label_layers = []
 
-    def show(self):
+    def _draw_pieces(self, ax, polygons: list, texts: list[str], label_color: str, offsets=None, **style):
         """
-        Muestra una visualización gráfica de los marcos, las piezas colocadas y las no colocadas.
+        Dibuja un conjunto de polígonos como una sola colección y registra sus etiquetas.
         """
-        fig, ax = plt.subplots()
-        colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
+        rings, coords, index = _stacked_rings(polygons)
+        if offsets is not None:
+            coords = coords + offsets[index]
+            rings = np.split(coords, np.flatnonzero(np.diff(index)) + 1)
+        collection = PolyCollection(rings, closed=True, **style)
+        ax.add_collection(collection)
+
+        mins = np.full((len(polygons), 2), np.inf)
+        maxs = np.full((len(polygons), 2), -np.inf)
+        np.minimum.at(mins, index, coords)
+        np.maximum.at(maxs, index, coords)
+        centers = shapely.get_coordinates(shapely.centroid(np.asarray(polygons, dtype=object)))
+        if offsets is not None:
+            centers = centers + offsets
+        self.label_layers.append(_LabelLayer(ax, centers, maxs[:, 0] - mins[:, 0], texts, label_color))
+        return collection, mins.min(axis=0), maxs.max(axis=0)
+
+    def draw(self, ax):
+        """
+        Núcleo común de ``show`` y ``visualize``: dibuja marcos, piezas colocadas,
+        piezas no colocadas y etiquetas en el eje indicado.
+
+        :param ax: Eje de matplotlib donde dibujar
+        :type ax: matplotlib.axes.Axes
+        """
+        self.label_layers = []
+        lower = np.array([np.inf, np.inf])
+        upper = np.array([-np.inf, -np.inf])
 
         # Dibujar marcos
         for idx, frame in enumerate(self.frames):
@@ -59,71 +155,74 @@ class PlacementVisualizer:
                 linewidth=2,
                 label=f"Marco {idx+1}" if idx == 0 else "",
             )
+            minx, miny, maxx, maxy = frame.polygon.bounds
+            lower = np.minimum(lower, (minx, miny))
+            upper = np.maximum(upper, (maxx, maxy))
 
         # Dibujar piezas colocadas
-        for i, placement in enumerate(self.placements):
-            poly = placement.piece.polygon
-            patch = MplPolygon(
-                list(poly.exterior.coords),
-                closed=True,
-                facecolor=colors[i % len(colors)],
+        if self.placements:
+            pieces = [p.piece for p in self.placements]
+            _, lo, hi = self._draw_pieces(
+                ax,
+                [piece.polygon for piece in pieces],
+                [getattr(piece, "etiqueta", piece.name) for piece in pieces],
+                "black",
+                facecolors=[COLORS[i % len(COLORS)] for i in range(len(pieces))],
+                edgecolors="black",
                 alpha=0.6,
-                edgecolor="black",
-                label=None,
-            )
-            ax.add_patch(patch)
-            # Etiqueta con el nombre de la pieza
-            centroid = poly.centroid
-            ax.text(
-                centroid.x,
-                centroid.y,
-                placement.piece.name,
-                fontsize=8,
-                ha="center",
-                va="center",
-                color="black",
             )
+            lower, upper = np.minimum(lower, lo), np.maximum(upper, hi)
 
-        # Dibujar piezas no colocadas (en una esquina)
+        # Dibujar piezas no colocadas (apiladas a la derecha de los marcos)
         if self.not_placed:
+            polygons = [piece.polygon for piece in self.not_placed]
+            bounds = shapely.bounds(np.asarray(polygons, dtype=object))
+            heights = bounds[:, 3] - bounds[:, 1]
             offset_x = max([frame.polygon.bounds[2] for frame in self.frames]) + 10
-            offset_y = 0
-            for i, piece in enumerate(self.not_placed):
-                poly = piece.polygon
-                moved_poly = translate(poly, xoff=offset_x, yoff=offset_y)
-                patch = MplPolygon(
-                    list(moved_poly.exterior.coords),
-                    closed=True,
-                    facecolor="none",
-                    edgecolor="red",
-                    linestyle="--",
-                    label="No colocada" if i == 0 else "",
-                )
-                ax.add_patch(patch)
-                centroid = moved_poly.centroid
-                ax.text(
-                    centroid.x,
-                    centroid.y,
-                    piece.name,
-                    fontsize=8,
-                    ha="center",
-                    va="center",
-                    color="red",
-                )
-                offset_y += poly.bounds[3] - poly.bounds[1] + 5  # Espaciado
+            offsets = np.column_stack([
+                np.full(len(polygons), offset_x),
+                np.concatenate([[0.0], np.cumsum(heights + 5)[:-1]]),  # Espaciado
+            ])
+            _, lo, hi = self._draw_pieces(
+                ax,
+                polygons,
+                [getattr(piece, "etiqueta", piece.name) for piece in self.not_placed],
+                "red",
+                offsets=offsets,
+                facecolors="none",
+                edgecolors="red",
+                linestyles="--",
+                label="No colocada",
+            )
+            lower, upper = np.minimum(lower, lo), np.maximum(upper, hi)
+
+        # Las colecciones no actualizan los límites automáticamente
+        if np.all(np.isfinite(lower)):
+            margin = (upper - lower) * 0.05
+            ax.set_xlim(lower[0] - margin[0], upper[0] + margin[0])
+            ax.set_ylim(lower[1] - margin[1], upper[1] + margin[1])
 
         # Mostrar desperdicio
         ax.set_title(f"Colocación de piezas - Desperdicio: {self.waste:.2f} unidades²")
         ax.set_aspect("equal")
         ax.legend(loc="upper right")
-        plt.xlabel("X")
-        plt.ylabel("Y")
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        for layer in self.label_layers:
+            layer.update()
+
+    def show(self):
+        """
+        Muestra una visualización gráfica de los marcos, las piezas colocadas y las no colocadas.
+        """
+        fig, ax = plt.subplots()
+        self.draw(ax)
         plt.show()
 
     def visualize(self, fig, ax=None):
         """
         Visualiza la colocación en una figura de matplotlib.
-        
+
         :param fig: Figura de matplotlib donde dibujar
         :type fig: matplotlib.figure.Figure
         :param ax: Eje de matplotlib donde dibujar (opcional)
@@ -131,76 +230,4 @@ class PlacementVisualizer:
         """
         if ax is None:
             ax = fig.add_subplot(111)
-        colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
-
-        # Dibujar marcos
-        for idx, frame in enumerate(self.frames):
-            x, y = frame.polygon.exterior.xy
-            ax.plot(
-                x,
-                y,
-                color="black",
-                linewidth=2,
-                label=f"Marco {idx+1}" if idx == 0 else "",
-            )
-
-        # Dibujar piezas colocadas
-        for i, placement in enumerate(self.placements):
-            poly = placement.piece.polygon
-            patch = MplPolygon(
-                list(poly.exterior.coords),
-                closed=True,
-                facecolor=colors[i % len(colors)],
-                alpha=0.6,
-                edgecolor="black",
-                label=None,
-            )
-            ax.add_patch(patch)
-            # Etiqueta con el identificador único de la pieza
-            etiqueta = getattr(placement.piece, 'etiqueta', placement.piece.name)
-            centroid = poly.centroid
-            ax.text(
-                centroid.x,
-                centroid.y,
-                etiqueta,
-                fontsize=8,
-                ha="center",
-                va="center",
-                color="black",
-            )
-
-        # Dibujar piezas no colocadas (en una esquina)
-        if self.not_placed:
-            offset_x = max([frame.polygon.bounds[2] for frame in self.frames]) + 10
-            offset_y = 0
-            for i, piece in enumerate(self.not_placed):
-                poly = piece.polygon
-                moved_poly = translate(poly, xoff=offset_x, yoff=offset_y)
-                patch = MplPolygon(
-                    list(moved_poly.exterior.coords),
-                    closed=True,
-                    facecolor="none",
-                    edgecolor="red",
-                    linestyle="--",
-                    label="No colocada" if i == 0 else "",
-                )
-                ax.add_patch(patch)
-                etiqueta = getattr(piece, 'etiqueta', piece.name)
-                centroid = moved_poly.centroid
-                ax.text(
-                    centroid.x,
-                    centroid.y,
-                    etiqueta,
-                    fontsize=8,
-                    ha="center",
-                    va="center",
-                    color="red",
-                )
-                offset_y += poly.bounds[3] - poly.bounds[1] + 5  # Espaciado
-
-        # Mostrar desperdicio
-        ax.set_title(f"Colocación de piezas - Desperdicio: {self.waste:.2f} unidades²")
-        ax.set_aspect("equal")
-        ax.legend(loc="upper right")
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
+        self.draw(ax)
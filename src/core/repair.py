@@ -0,0 +1,121 @@
+from src.models import Frame, Placement, PolygonPiece
+from .grasp_solver import GraspSolver
+from .multi_sheet import solve_sheets
+
+
+def _sheet_result(frame: Frame, placements: list[Placement]):
+    waste = frame.polygon.area - sum(p.piece.polygon.area for p in placements)
+    return {"placements": placements, "not_placed": [], "waste": waste}
+
+
+def _fits(solver: GraspSolver, frame: Frame, placements: list[Placement], piece: PolygonPiece, pos):
+    moved = piece.move(*pos)
+    if not frame.contains(moved):
+        return None
+    if solver._overlaps(moved, placements):
+        return None
+    return moved
+
+
+def repair_solution(
+    frames: list[Frame],
+    results: list[dict],
+    pieces: list[PolygonPiece],
+    **solver_kwargs,
+):
+    """
+    Actualiza una solución existente después de editar o eliminar piezas, sin
+    volver a resolver todo el trabajo.
+
+    Se conservan las colocaciones cuyas piezas siguen en ``pieces``; las de piezas
+    eliminadas o reemplazadas se quitan. Las piezas pendientes (nuevas, editadas o
+    que antes no cabían) se prueban primero en los huecos liberados y luego en
+    cualquier región libre de las planchas existentes usando NFP. Solo las que
+    aún no caben se resuelven con GRASP en planchas nuevas.
+
+    :param frames: Planchas de la solución actual
+    :type frames: list[Frame]
+    :param results: Resultados por plancha de la solución actual
+    :type results: list[dict]
+    :param pieces: Piezas actuales del sistema
+    :type pieces: list[PolygonPiece]
+    :param solver_kwargs: Parámetros para ``GraspSolver`` al abrir planchas nuevas
+    :return: Tupla ``(frames, results)`` reparada, o None si la solución no se puede
+        reparar (por ejemplo, colocaciones sin pieza de origen) y hay que resolver completo
+    :rtype: tuple[list[Frame], list[dict]] or None
+    """
+    if not frames:
+        return None
+
+    vigentes = {id(p) for p in pieces}
+    colocadas = set()
+    hojas = []
+    huecos = []
+    for frame, result in zip(frames, results):
+        # Las colocaciones apuntan a la copia del marco que usó el solver, no a la
+        # plancha recibida; la búsqueda NFP filtra por ese objeto
+        marco = next((p.frame for p in result["placements"] or []), frame)
+        conservadas = []
+        for p in result["placements"] or []:
+            if p.source is None:
+                return None
+            if id(p.source) in vigentes and id(p.source) not in colocadas:
+                conservadas.append(p)
+                colocadas.add(id(p.source))
+            else:
+                huecos.append((len(hojas), p.position))
+        hojas.append((frame, marco, conservadas))
+
+    pendientes = sorted(
+        (p for p in pieces if id(p) not in colocadas),
+        key=lambda p: p.polygon.area,
+        reverse=True,
+    )
+
+    buscador = GraspSolver(pieces=[], frames=[], spacing=solver_kwargs.get("spacing", 0.0))
+    sin_lugar = []
+    for piece in pendientes:
+        colocada = None
+        # Primero en la posición de una pieza quitada (cambio de tamaño en el lugar)
+        for idx, pos in huecos:
+            _, marco, placements = hojas[idx]
+            moved = _fits(buscador, marco, placements, piece, pos)
+            if moved is not None:
+                colocada = (idx, pos, moved)
+                break
+        # Luego en cualquier región libre de las planchas existentes
+        if colocada is None:
+            for idx, (_, marco, placements) in enumerate(hojas):
+                pos = buscador.find_feasible_position_nfp(marco, placements, piece)
+                if pos is None:
+                    continue
+                moved = _fits(buscador, marco, placements, piece, pos)
+                if moved is not None:
+                    colocada = (idx, pos, moved)
+                    break
+        if colocada is None:
+            sin_lugar.append(piece)
+            continue
+        idx, pos, moved = colocada
+        _, marco, placements = hojas[idx]
+        placements.append(Placement(moved, marco, pos, source=piece))
+
+    # Las planchas que quedaron vacías se descartan
+    hojas = [(frame, placements) for frame, _, placements in hojas if placements]
+    new_frames = [frame for frame, _ in hojas]
+    new_results = [_sheet_result(frame, placements) for frame, placements in hojas]
+
+    if sin_lugar:
+        ancho, alto = frames[0].width, frames[0].height
+        for frame, result in solve_sheets(sin_lugar, ancho, alto, **solver_kwargs):
+            new_frames.append(frame)
+            new_results.append(result)
+
+    # Piezas no colocadas por plancha: las que terminaron en planchas posteriores
+    # más las que no se pudieron colocar en ninguna
+    restantes = list(new_results[-1]["not_placed"]) if new_results and sin_lugar else []
+    for result in reversed(new_results):
+        result["not_placed"] = list(restantes)
+        restantes = [p.source for p in result["placements"]] + restantes
+
+    return new_frames, new_results
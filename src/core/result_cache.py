@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+
+from src.models import PolygonPiece
+from src.utils.helpers import firma_tipo
+from src.utils.solution_io import load_solution, save_solution
+from .grasp_solver import SOLVER_VERSION
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".simulador_cortes", "cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def job_key(pieces: list[PolygonPiece], width: float, height: float, solver_params: dict | None = None):
+    """
+    Calcula el hash canónico de un trabajo: dimensiones de la plancha, tipos de
+    pieza con sus cantidades y parámetros del solver (incluida la semilla).
+    El orden en que se agregaron las piezas no influye en el hash.
+
+    :rtype: str
+    """
+    tipos = Counter(firma_tipo(p) for p in pieces)
+    canonico = {
+        "plancha": [float(width), float(height)],
+        "tipos": sorted([nombre, [list(v) for v in vertices], cantidad] for (nombre, vertices), cantidad in tipos.items()),
+        "parametros": {k: solver_params[k] for k in sorted(solver_params or {})},
+    }
+    datos = json.dumps(canonico, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché en disco de soluciones completas, direccionada por el contenido del trabajo.
+
+    Cada entrada es un archivo de solución (ver ``solution_io``) que registra la
+    versión del solver que lo produjo; las entradas de otra versión se descartan al
+    leerlas. Cuando el directorio supera ``max_bytes`` se eliminan primero las
+    entradas usadas hace más tiempo.
+
+    :var directory: Directorio donde se guardan las entradas.
+    :vartype directory: str
+    :var max_bytes: Tamaño máximo total de la caché en bytes.
+    :vartype max_bytes: int
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, pieces: list[PolygonPiece]):
+        """
+        Busca un trabajo en la caché y, si existe, devuelve sus planchas asociadas a
+        las piezas actuales (etiquetas y precios de las piezas recibidas).
+
+        :param key: Hash del trabajo (ver ``job_key``)
+        :type key: str
+        :param pieces: Piezas del trabajo actual
+        :type pieces: list[PolygonPiece]
+        :return: Lista de tuplas ``(frame, result)`` o None si no hay entrada válida
+        :rtype: list[tuple[Frame, dict]] or None
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            frames, results, meta = load_solution(path)
+        except (OSError, ValueError):
+            self._remove(path)
+            return None
+        if meta.get("extra", {}).get("solver_version") != SOLVER_VERSION:
+            self._remove(path)
+            return None
+
+        # Marcar la entrada como usada recientemente para la política de desalojo
+        os.utime(path)
+        self._rebind(results, pieces)
+        return list(zip(frames, results))
+
+    def put(self, key: str, frames: list, results: list[dict], precio_m2: float = 0.0):
+        """
+        Guarda la solución de un trabajo y aplica la política de desalojo por tamaño.
+        """
+        path = self._path(key)
+        tmp = path + ".tmp"
+        save_solution(tmp, frames, results, precio_m2, extra={"solver_version": SOLVER_VERSION, "clave": key})
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Elimina las entradas menos usadas hasta que la caché quede bajo ``max_bytes``.
+        """
+        entradas = []
+        total = 0
+        for nombre in os.listdir(self.directory):
+            if not nombre.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, nombre)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entradas.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for nombre in os.listdir(self.directory):
+            if nombre.endswith(".json"):
+                self._remove(os.path.join(self.directory, nombre))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _rebind(results: list[dict], pieces: list[PolygonPiece]):
+        """
+        Asigna a cada pieza de la solución cacheada la etiqueta y el precio de una
+        pieza equivalente (misma firma de tipo) del trabajo actual.
+        """
+        disponibles = defaultdict(list)
+        for pieza in reversed(pieces):
+            disponibles[firma_tipo(pieza)].append(pieza)
+
+        # Las piezas no colocadas de cada plancha se repiten en las planchas siguientes,
+        # por eso se asignan a través de su etiqueta original
+        asignadas = {}
+
+        def asignar(pieza, offset):
+            candidatas = disponibles.get(firma_tipo(pieza, offset))
+            if not candidatas:
+                return None
+            original = candidatas.pop()
+            asignadas[getattr(pieza, "etiqueta", None)] = original
+            pieza.etiqueta = getattr(original, "etiqueta", original.name)
+            pieza.precio_m2 = getattr(original, "precio_m2", 0)
+            return original
+
+        for result in results:
+            for p in result["placements"]:
+                p.source = asignar(p.piece, p.position)
+        if results:
+            # Las piezas no colocadas se reemplazan por las piezas originales del trabajo
+            results[-1]["not_placed"] = [asignar(pieza, (0.0, 0.0)) or pieza for pieza in results[-1]["not_placed"]]
+            for result in results[:-1]:
+                result["not_placed"] = [
+                    asignadas.get(getattr(pieza, "etiqueta", None), pieza) for pieza in result["not_placed"]
+                ]
@@ -0,0 +1,316 @@
+import random
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+from src.models import Frame, Placement, PolygonPiece
+from src.utils.helpers import firma_tipo
+from .grasp_solver import GraspSolver
+from .nfp import NFPCache
+from .stats import NULL_STATS, SolverStats, run_profiled
+
+
+# Estado de cada proceso del pool: variantes giradas, marcos y buscador de posiciones
+_worker = {}
+
+
+def _init_worker(variants, frames, spacing):
+    _worker["variants"] = variants
+    _worker["frames"] = frames
+    _worker["finder"] = GraspSolver(pieces=[], frames=[], spacing=spacing)
+
+
+def _evaluate_worker(genome):
+    _, _, fitness = _decode(genome, _worker["variants"], _worker["frames"], _worker["finder"])
+    return fitness
+
+
+def _decode(genome, variants, frames, finder, pieces=None):
+    """
+    Decodificador inferior izquierdo: coloca las piezas en el orden del genoma, cada
+    una con su orientación, en la posición más baja y a la izquierda de la primera
+    plancha donde cabe (ver ``GraspSolver.bottom_left_position``). Si ningún candidato
+    sirve se recurre a la búsqueda de GRASP, así que el decodificador coloca al menos
+    lo mismo que una construcción GRASP con el mismo orden.
+
+    :param pieces: Piezas originales, para el ``source`` de cada colocación (no hace
+        falta cuando solo se necesita la aptitud)
+    :return: Tupla ``(placements, no_colocadas, fitness)``; ``no_colocadas`` son índices
+        de pieza y ``fitness`` se minimiza
+    """
+    orden, giros = genome
+    used_frames = [frame.copy() for frame in frames]
+    placements = []
+    no_colocadas = []
+    for i in orden:
+        piece = variants[i][giros[i]]
+        for frame in used_frames:
+            pos = finder.bottom_left_position(frame, placements, piece)
+            if pos is None:
+                # Los NFP se aproximan por traslaciones de vértices, así que algunos
+                # huecos solo aparecen con la búsqueda por grilla de GRASP
+                pos = finder.find_feasible_position_nfp(frame, placements, piece)
+            if pos is not None:
+                source = pieces[i] if pieces is not None else None
+                placements.append(Placement(piece.move(*pos), frame, pos, piece.rotacion, source=source))
+                break
+        else:
+            no_colocadas.append(i)
+    return placements, no_colocadas, _fitness(placements, no_colocadas, variants, used_frames)
+
+
+def _fitness(placements, no_colocadas, variants, frames):
+    """
+    Aptitud de una distribución (menor es mejor): área sin colocar, planchas usadas,
+    desperdicio de las planchas usadas y, para desempatar, la altura ocupada de la
+    última plancha (más espacio contiguo libre para las piezas siguientes).
+    """
+    area_sin_colocar = sum(variants[i][0].polygon.area for i in no_colocadas)
+    usadas = [f for f in frames if any(p.frame is f for p in placements)]
+    area_usada = sum(f.polygon.area for f in usadas)
+    desperdicio = area_usada - sum(p.piece.polygon.area for p in placements)
+    altura = max((p.piece.polygon.bounds[3] for p in placements if usadas and p.frame is usadas[-1]), default=0.0)
+    return (round(area_sin_colocar, 9), len(usadas), round(desperdicio, 9), altura)
+
+
+def _perfect(fitness):
+    # Con todas las piezas en una sola plancha no hay nada que mejorar
+    return fitness[0] == 0 and fitness[1] <= 1
+
+
+class SequenceSolver:
+    """
+    Motor metaheurístico sobre secuencias: un algoritmo genético busca el orden y la
+    orientación de las piezas, y cada secuencia se convierte en una distribución con
+    un decodificador inferior izquierdo que reutiliza los NFP en caché.
+
+    A diferencia de GRASP, las buenas secuencias se heredan entre generaciones (cruce
+    por orden y mutaciones de intercambio y giro). La evaluación de cada generación se
+    puede repartir en un pool de procesos. ``solve`` devuelve el mismo diccionario que
+    ``GraspSolver.solve``.
+
+    :var pieces: Piezas a colocar
+    :vartype pieces: list[PolygonPiece]
+    :var frames: Marcos donde colocarlas
+    :vartype frames: list[Frame]
+    :var iterations: Generaciones del algoritmo genético
+    :vartype iterations: int
+    :var population: Tamaño de la población
+    :vartype population: int
+    :var rotations: Ángulos permitidos para cada pieza
+    :vartype rotations: tuple[float, ...]
+    :var stats: Estadísticas de la ejecución (``NULL_STATS`` si están desactivadas)
+    :vartype stats: SolverStats or NullStats
+    """
+
+    def __init__(
+        self,
+        pieces: list[PolygonPiece],
+        frames: list[Frame],
+        iterations: int = 5,
+        population: int = 8,
+        rotations: tuple[float, ...] = (0, 90, 180, 270),
+        mutation_rate: float = 0.2,
+        time_limit: float | None = None,
+        seed: int | None = None,
+        seed_solutions: list | None = None,
+        workers: int = 0,
+        stats: bool = False,
+        profile: str | None = None,
+        nfp_cache: NFPCache | None = None,
+        spacing: float = 0.0,
+        stop: Callable[[], bool] | None = None,
+    ):
+        """
+        :param pieces: Piezas a colocar
+        :param frames: Marcos rectangulares donde colocarlas
+        :param iterations: Generaciones del algoritmo genético
+        :param population: Individuos por generación
+        :param rotations: Ángulos (en grados) que puede tomar cada pieza
+        :param mutation_rate: Probabilidad de mutar cada hijo
+        :param time_limit: Tiempo máximo en segundos; siempre se evalúa al menos el
+            primer individuo (en el pool, la población inicial completa)
+        :param seed: Semilla para que la búsqueda sea reproducible
+        :param seed_solutions: Soluciones previas; su orden de colocación se usa como uno
+            de los individuos iniciales
+        :param workers: Procesos para evaluar la población (0 = en este proceso)
+        :param stats: Registrar contadores y tiempos; se devuelven en ``stats``
+        :param profile: Perfilar la ejecución con ``"cprofile"`` o ``"pyinstrument"``
+        :param nfp_cache: Caché de NFP compartida (solo se usa en este proceso)
+        :param spacing: Distancia mínima entre piezas (ver ``GraspSolver``)
+        :param stop: Se consulta antes de cada generación; si devuelve True la búsqueda
+            termina (ver ``GraspSolver``)
+        """
+        self.pieces = pieces
+        self.frames = frames
+        self.iterations = iterations
+        self.population = max(2, population)
+        self.rotations = tuple(rotations) or (0,)
+        self.mutation_rate = mutation_rate
+        self.time_limit = time_limit
+        self.random = random.Random(seed)
+        self.seed_solutions = [
+            s["placements"] if isinstance(s, dict) else s
+            for s in (seed_solutions or [])
+            if s
+        ]
+        self.workers = workers
+        self.spacing = spacing
+        self.profile = profile
+        self.stop = stop
+        self.stats = SolverStats() if (stats or profile) else NULL_STATS
+        self.finder = GraspSolver(pieces=[], frames=[], nfp_cache=nfp_cache, spacing=spacing)
+        self.finder.stats = self.stats
+        # Cada pieza girada en cada ángulo, calculada una sola vez
+        self.variants = []
+        for piece in pieces:
+            giradas = []
+            for angulo in self.rotations:
+                girada = piece.rotate(angulo)
+                girada.rotacion = angulo
+                giradas.append(girada)
+            self.variants.append(giradas)
+
+    def solve(self):
+        """
+        Ejecuta el algoritmo genético y devuelve la mejor distribución encontrada.
+
+        :return: Diccionario con ``placements``, ``not_placed``, ``waste`` y ``stats``
+        :rtype: dict
+        """
+        if self.profile:
+            result, reporte = run_profiled(self.profile, self._solve)
+            self.stats.profile = reporte
+        else:
+            result = self._solve()
+        result["stats"] = self.stats.as_dict()
+        return result
+
+    def _initial_population(self):
+        n = len(self.pieces)
+        por_area = sorted(range(n), key=lambda i: self.pieces[i].polygon.area, reverse=True)
+        poblacion = [(por_area, [0] * n)]
+        for seed in self.seed_solutions:
+            poblacion.append((self._seed_order(seed, por_area), [0] * n))
+        while len(poblacion) < self.population:
+            orden = por_area[:]
+            # Variaciones del orden por área: intercambios locales y giros al azar
+            for _ in range(max(1, n // 3)):
+                a = self.random.randrange(n)
+                b = min(n - 1, a + self.random.randint(1, 3))
+                orden[a], orden[b] = orden[b], orden[a]
+            giros = [self.random.randrange(len(self.rotations)) for _ in range(n)]
+            poblacion.append((orden, giros))
+        return poblacion[:self.population]
+
+    def _seed_order(self, seed: list[Placement], por_area: list[int]):
+        """
+        Orden que repite la secuencia de una solución previa: primero las piezas del
+        mismo tipo que sus colocaciones (en ese orden) y luego el resto por área.
+        """
+        pendientes = {}
+        for i in reversed(por_area):
+            pendientes.setdefault(firma_tipo(self.pieces[i]), []).append(i)
+        orden = []
+        for p in seed:
+            candidatas = pendientes.get(firma_tipo(p.piece, p.position))
+            if candidatas:
+                orden.append(candidatas.pop())
+        usados = set(orden)
+        return orden + [i for i in por_area if i not in usados]
+
+    def _crossover(self, padre, madre):
+        """Cruce por orden (OX): un tramo del padre y el resto en el orden de la madre."""
+        n = len(padre[0])
+        a, b = sorted(self.random.sample(range(n + 1), 2))
+        tramo = padre[0][a:b]
+        en_tramo = set(tramo)
+        resto = [i for i in madre[0] if i not in en_tramo]
+        orden = resto[:a] + tramo + resto[a:]
+        giros = [padre[1][i] if self.random.random() < 0.5 else madre[1][i] for i in range(n)]
+        return orden, giros
+
+    def _mutate(self, genome):
+        orden, giros = list(genome[0]), list(genome[1])
+        n = len(orden)
+        if n > 1 and self.random.random() < 0.5:
+            a, b = self.random.sample(range(n), 2)
+            orden[a], orden[b] = orden[b], orden[a]
+        elif len(self.rotations) > 1:
+            i = self.random.randrange(n)
+            giros[i] = self.random.randrange(len(self.rotations))
+        return orden, giros
+
+    def _tournament(self, evaluados, k=3):
+        return min(self.random.sample(evaluados, min(k, len(evaluados))), key=lambda e: e[0])[1]
+
+    def _evaluate(self, genomes, pool, deadline=None):
+        """
+        Aptitud de cada genoma. En este proceso se deja de decodificar al vencer
+        ``deadline`` (los genomas sin evaluar se descartan).
+        """
+        t0 = time.perf_counter()
+        if pool is not None:
+            fitness = list(pool.map(_evaluate_worker, genomes))
+        else:
+            fitness = []
+            for g in genomes:
+                if deadline is not None and fitness and time.perf_counter() >= deadline:
+                    break
+                fitness.append(_decode(g, self.variants, self.frames, self.finder)[2])
+        self.stats.count("decodificaciones", len(fitness))
+        self.stats.add_time("decodificacion", time.perf_counter() - t0)
+        return list(zip(fitness, genomes))
+
+    def _solve(self):
+        if not self.pieces:
+            return {"placements": [], "not_placed": [], "waste": sum(f.polygon.area for f in self.frames)}
+        cache = self.finder.nfp_cache
+        hits, misses = cache.hits, cache.misses
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        pool = None
+        if self.workers > 0:
+            pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(self.variants, self.frames, self.spacing)
+            )
+        try:
+            poblacion = self._initial_population()
+            # El orden por área (y las semillas) suele bastar: si ya deja todo en una
+            # plancha no se evalúa el resto de la población
+            iniciales = 1 + len(self.seed_solutions) if pool is None else len(poblacion)
+            evaluados = self._evaluate(poblacion[:iniciales], pool, deadline)
+            if not _perfect(min(evaluados, key=lambda e: e[0])[0]):
+                evaluados += self._evaluate(poblacion[iniciales:], pool, deadline)
+            for _ in range(self.iterations):
+                if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                    break
+                if self.stop is not None and self.stop():
+                    break
+                generation_start = time.perf_counter()
+                evaluados.sort(key=lambda e: e[0])
+                if _perfect(evaluados[0][0]):
+                    break
+                elite = evaluados[:2]
+                hijos = []
+                while len(hijos) < self.population - len(elite):
+                    hijo = self._crossover(self._tournament(evaluados), self._tournament(evaluados))
+                    if self.random.random() < self.mutation_rate:
+                        hijo = self._mutate(hijo)
+                    hijos.append(hijo)
+                evaluados = elite + self._evaluate(hijos, pool, deadline)
+                self.stats.add_iteration(time.perf_counter() - generation_start)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        _, mejor = min(evaluados, key=lambda e: e[0])
+        placements, no_colocadas, _ = _decode(mejor, self.variants, self.frames, self.finder, self.pieces)
+        waste = sum(frame.polygon.area for frame in self.frames) - sum(p.piece.polygon.area for p in placements)
+        self.stats.count("nfp_cache_aciertos", cache.hits - hits)
+        self.stats.count("nfp_calculados", cache.misses - misses)
+        return {
+            "placements": placements,
+            "not_placed": [self.pieces[i] for i in no_colocadas],
+            "waste": waste,
+        }
@@ -0,0 +1,255 @@
+import math
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.models import Frame, PolygonPiece
+from .grasp_solver import GraspSolver
+from .nfp import NFPCache
+from .sequence_solver import SequenceSolver
+
+
+# Motores disponibles por nombre. Todos se construyen con ``(pieces=..., frames=...,
+# **parametros)`` y su ``solve()`` devuelve el diccionario de ``GraspSolver.solve``;
+# aceptan además ``time_limit``, ``seed``, ``seed_solutions``, ``spacing``, ``stats``,
+# ``nfp_cache`` y ``stop``.
+SOLVERS = {
+    "grasp": GraspSolver,
+    "genetico": SequenceSolver,
+}
+
+# Configuraciones que compiten por defecto en el portafolio: ``(motor, parametros)``
+DEFAULT_PORTFOLIO = [
+    ("grasp", {}),
+    ("grasp", {"rcl_size": 1, "iterations": 1}),
+    ("grasp", {"rcl_size": 6}),
+    ("genetico", {}),
+    ("genetico", {"rotations": (0, 180), "population": 16}),
+]
+
+
+def register_solver(name: str, solver: type):
+    """
+    Agrega un motor al registro para poder elegirlo por nombre (en ``solve_sheets``,
+    en la interfaz o en el portafolio).
+
+    :param name: Nombre del motor
+    :param solver: Clase con la interfaz de ``GraspSolver``
+    :return: La misma clase, para usarla como decorador
+    """
+    SOLVERS[name] = solver
+    return solver
+
+
+def get_solver(name: str):
+    """
+    Clase del motor registrado con ``name``.
+
+    :raises ValueError: Si no hay un motor con ese nombre
+    :rtype: type
+    """
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Motor desconocido: {name} (disponibles: {', '.join(sorted(SOLVERS))})") from None
+
+
+def _score(result: dict):
+    # El mismo criterio que GRASP: más piezas colocadas y luego menos desperdicio
+    return len(result["not_placed"] or []), result["waste"]
+
+
+def _run(name, parametros, pieces, frames, completo, deadline):
+    """
+    Ejecuta una configuración del portafolio. Si coloca todas las piezas activa
+    ``completo``, la señal de parada que consultan las demás configuraciones: con los
+    mismos marcos el desperdicio de una distribución completa es siempre el mismo, así
+    que ninguna puede mejorarla.
+    """
+    time_limit = max(deadline - time.time(), 0.0) if deadline is not None else None
+    result = get_solver(name)(
+        pieces=pieces, frames=frames, time_limit=time_limit, stop=completo.is_set, **parametros
+    ).solve()
+    if not result["not_placed"]:
+        completo.set()
+    result["motor"] = name
+    return result
+
+
+# Estado de cada proceso del portafolio: piezas, marcos y señal de parada compartida
+_worker = {}
+
+
+def _init_worker(pieces, frames, completo):
+    _worker["pieces"] = pieces
+    _worker["frames"] = frames
+    _worker["completo"] = completo
+
+
+def _run_worker(name, parametros, deadline):
+    pieces = _worker["pieces"]
+    result = _run(name, parametros, pieces, _worker["frames"], _worker["completo"], deadline)
+    # Las piezas del proceso son copias: se devuelven índices para reasociarlas
+    indices = {id(p): i for i, p in enumerate(pieces)}
+    placements = result["placements"] or []
+    result["fuentes"] = [indices[id(p.source)] for p in placements]
+    for p in placements:
+        p.source = None
+    result["not_placed"] = [indices[id(p)] for p in result["not_placed"] or []]
+    return result
+
+
+class PortfolioSolver:
+    """
+    Portafolio de motores: varias configuraciones (motor y parámetros) compiten sobre
+    el mismo problema, cada una en su proceso, y se devuelve la mejor distribución.
+
+    Con ``workers`` procesos las configuraciones se ejecutan por tandas de a
+    ``workers``, y cada una tiene garantizada su parte del plazo (el plazo dividido por
+    la cantidad de tandas), aunque empiece cuando otras ya lo consumieron; si las
+    anteriores terminan antes, la que empieza aprovecha el tiempo que sobró. Sin
+    procesos (``workers=0``) se ejecutan una tras otra con el mismo reparto. El plazo
+    es, por lo tanto, aproximado.
+
+    Cada configuración que empieza recibe la mejor distribución encontrada hasta ese
+    momento como semilla (``seed_solutions``), así que parte de ese resultado en lugar
+    de buscar desde cero. Además comparten una señal de parada: cuando una coloca
+    todas las piezas (un resultado que ninguna otra puede mejorar), las demás terminan
+    en su siguiente iteración en lugar de agotar su parte del plazo.
+
+    :var pieces: Piezas a colocar
+    :vartype pieces: list[PolygonPiece]
+    :var frames: Marcos donde colocarlas
+    :vartype frames: list[Frame]
+    :var configs: Configuraciones ``(motor, parametros)`` que compiten
+    :vartype configs: list[tuple[str, dict]]
+    """
+
+    def __init__(
+        self,
+        pieces: list[PolygonPiece],
+        frames: list[Frame],
+        configs: list[tuple[str, dict]] | None = None,
+        time_limit: float | None = None,
+        workers: int = 0,
+        seed: int | None = None,
+        nfp_cache: NFPCache | None = None,
+        **solver_kwargs,
+    ):
+        """
+        :param pieces: Piezas a colocar
+        :param frames: Marcos rectangulares donde colocarlas
+        :param configs: Configuraciones ``(motor, parametros)``; por defecto
+            ``DEFAULT_PORTFOLIO``
+        :param time_limit: Plazo en segundos para todo el portafolio
+        :param workers: Procesos en paralelo (0 = una configuración tras otra en este proceso)
+        :param seed: Semilla base; la configuración ``k`` usa ``seed + k``
+        :param nfp_cache: Caché de NFP compartida (solo se usa sin procesos)
+        :param solver_kwargs: Parámetros comunes a todas las configuraciones (``spacing``,
+            ``seed_solutions``, ``stats``, ...); los de cada configuración tienen prioridad
+        """
+        self.pieces = pieces
+        self.frames = frames
+        self.configs = list(configs or DEFAULT_PORTFOLIO)
+        self.time_limit = time_limit
+        self.workers = workers
+        self.seed = seed
+        self.nfp_cache = nfp_cache if nfp_cache is not None else NFPCache()
+        self.solver_kwargs = solver_kwargs
+
+    def _parametros(self, k: int, parametros: dict, best: dict | None = None):
+        comunes = dict(self.solver_kwargs)
+        if self.seed is not None:
+            comunes["seed"] = self.seed + k
+        parametros = {**comunes, **parametros}
+        # La mejor distribución hasta ahora es el punto de partida de la siguiente
+        if best is not None and best["placements"]:
+            parametros["seed_solutions"] = list(parametros.get("seed_solutions") or []) + [best["placements"]]
+        return parametros
+
+    def _plazo(self, deadline, pendientes: int, paralelas: int):
+        """
+        Fin del plazo de una configuración que empieza ahora: el tiempo que queda
+        repartido entre las tandas pendientes (incluida la suya), pero nunca menos que
+        su parte del plazo total, aunque las anteriores se hayan excedido.
+        """
+        if deadline is None:
+            return None
+        garantizado = self.time_limit / math.ceil(len(self.configs) / paralelas)
+        reparto = max(deadline - time.time(), 0.0) / math.ceil(pendientes / paralelas)
+        return time.time() + max(reparto, garantizado)
+
+    def solve(self):
+        """
+        Ejecuta las configuraciones y devuelve el mejor resultado.
+
+        :return: Diccionario de ``GraspSolver.solve`` más ``motor``, el nombre del motor
+            que encontró la distribución
+        :rtype: dict
+        """
+        if not self.pieces:
+            return {"placements": [], "not_placed": [], "waste": sum(f.polygon.area for f in self.frames), "stats": None}
+        deadline = time.time() + self.time_limit if self.time_limit is not None else None
+        completo = multiprocessing.Event()
+        if self.workers > 0:
+            return self._solve_parallel(completo, deadline)
+        return self._solve_serial(completo, deadline)
+
+    def _solve_serial(self, completo, deadline):
+        best = None
+        for k, (name, parametros) in enumerate(self.configs):
+            plazo = self._plazo(deadline, len(self.configs) - k, 1)
+            parametros = dict(self._parametros(k, parametros, best), nfp_cache=self.nfp_cache)
+            result = _run(name, parametros, self.pieces, self.frames, completo, plazo)
+            if best is None or _score(result) < _score(best):
+                best = result
+            if not best["not_placed"]:
+                break
+        return best
+
+    def _solve_parallel(self, completo, deadline):
+        best = None
+        paralelas = min(self.workers, len(self.configs))
+        pool = ProcessPoolExecutor(paralelas, initializer=_init_worker, initargs=(self.pieces, self.frames, completo))
+        siguientes = deque(enumerate(self.configs))
+        # Configuraciones en marcha y el fin de su plazo
+        pendientes = {}
+        vencido = False
+        try:
+            while siguientes or pendientes:
+                # Cada proceso libre toma la siguiente configuración, con la mejor
+                # distribución hasta ahora como semilla
+                while siguientes and len(pendientes) < paralelas:
+                    plazo = self._plazo(deadline, len(siguientes), paralelas)
+                    k, (name, parametros) = siguientes.popleft()
+                    future = pool.submit(_run_worker, name, self._parametros(k, parametros, best), plazo)
+                    pendientes[future] = plazo
+                # Con un resultado en mano no se espera a las configuraciones que ya
+                # agotaron su parte del plazo
+                timeout = None
+                if best is not None and None not in pendientes.values():
+                    timeout = max(max(pendientes.values()) - time.time(), 0.0)
+                listos, _ = wait(pendientes, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not listos:
+                    vencido = True
+                    break
+                for future in listos:
+                    del pendientes[future]
+                    result = future.result()
+                    if best is None or _score(result) < _score(best):
+                        best = result
+                if not best["not_placed"]:
+                    break
+        finally:
+            # Los motores que siguen en marcha ven la señal de parada (o su propio plazo) y
+            # terminan en su siguiente iteración; vencido el plazo no se los espera
+            pool.shutdown(wait=not vencido, cancel_futures=True)
+
+        for p, i in zip(best["placements"] or [], best.pop("fuentes")):
+            p.source = self.pieces[i]
+        best["not_placed"] = [self.pieces[i] for i in best["not_placed"]]
+        return best
+
+
+register_solver("portafolio", PortfolioSolver)
@@ -0,0 +1,65 @@
+from shapely.geometry import Polygon
+
+from src.models import PolygonPiece
+
+
+class ClearanceShapes:
+    """
+    Contornos de separación de las piezas: cada pieza agrandada hacia afuera en la
+    mitad de la separación mínima, para que dos piezas cuyos contornos de separación
+    no se solapan queden al menos a ``spacing`` de distancia.
+
+    El desplazamiento (``buffer`` con uniones en inglete y luego simplificado) se
+    calcula una sola vez por tipo de pieza, sobre su forma normalizada; cada pieza
+    recibe una traslación de ese contorno, que queda guardada en la propia pieza.
+    Así los NFP y las pruebas de solapamiento usan el contorno de separación sin
+    hacer un ``buffer`` por candidato, y los contornos de un mismo tipo siguen siendo
+    traslaciones entre sí (la caché de NFP los reconoce como un solo tipo).
+
+    :var spacing: Distancia mínima entre piezas (ancho de corte más separación)
+    :vartype spacing: float
+    :var tolerance: Error máximo de la simplificación; se compensa agrandando el
+        contorno en la misma medida, así que la separación nunca queda por debajo de
+        ``spacing``
+    :vartype tolerance: float
+    """
+
+    def __init__(self, spacing: float = 0.0, tolerance: float | None = None):
+        """
+        :param spacing: Distancia mínima entre piezas; 0 usa los contornos reales
+        :param tolerance: Error de simplificación (por defecto, 5 % de la separación)
+        """
+        self.spacing = max(float(spacing or 0.0), 0.0)
+        self.tolerance = tolerance if tolerance is not None else 0.05 * self.spacing
+        self._types = {}
+
+    def _offset(self, vertices: tuple):
+        """
+        Contorno de separación de una forma normalizada (calculado una vez por tipo).
+        """
+        offset = self._types.get(vertices)
+        if offset is None:
+            distance = self.spacing / 2 + self.tolerance
+            buffered = Polygon(vertices).buffer(distance, join_style="mitre", mitre_limit=5.0)
+            # Solo importa el contorno exterior: una muesca cerrada por el buffer no aloja piezas
+            offset = Polygon(buffered.exterior).simplify(self.tolerance, preserve_topology=True)
+            offset = self._types[vertices] = list(offset.exterior.coords)[:-1]
+        return offset
+
+    def of(self, piece: PolygonPiece):
+        """
+        Devuelve el contorno de separación de la pieza, en sus mismas coordenadas.
+        Sin separación devuelve la pieza misma.
+
+        :rtype: PolygonPiece
+        """
+        if not self.spacing:
+            return piece
+        guardado = getattr(piece, "_contorno_separacion", None)
+        if guardado is not None and guardado[0] == self.spacing and guardado[1] is piece.vertices:
+            return guardado[2]
+        minx, miny, _, _ = piece.polygon.bounds
+        vertices = tuple((round(x - minx, 6) + 0.0, round(y - miny, 6) + 0.0) for x, y in piece.vertices)
+        shape = PolygonPiece(piece.name, [(x + minx, y + miny) for x, y in self._offset(vertices)])
+        piece._contorno_separacion = (self.spacing, piece.vertices, shape)
+        return shape
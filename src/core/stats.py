@@ -0,0 +1,135 @@
+import io
+from collections import defaultdict
+
+
+class SolverStats:
+    """
+    Contadores y temporizadores de las operaciones costosas del solver
+    (cálculo de NFP, uniones, diferencias, puntos candidatos, pruebas de solapamiento,
+    aciertos de caché) y duración de cada iteración.
+
+    :var counters: Cantidad de veces que se ejecutó cada operación.
+    :vartype counters: dict[str, int]
+    :var timers: Tiempo acumulado en segundos por operación.
+    :vartype timers: dict[str, float]
+    :var iterations: Duración en segundos de cada iteración.
+    :vartype iterations: list[float]
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.iterations = []
+        self.profile = None
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def add_time(self, name: str, seconds: float):
+        self.timers[name] += seconds
+
+    def add_iteration(self, seconds: float):
+        self.iterations.append(seconds)
+
+    def as_dict(self):
+        """
+        Devuelve las estadísticas como un diccionario serializable.
+
+        :rtype: dict
+        """
+        datos = {
+            "contadores": dict(self.counters),
+            "tiempos": dict(self.timers),
+            "iteraciones": list(self.iterations),
+            "tiempo_total": sum(self.iterations),
+        }
+        if self.profile is not None:
+            datos["perfil"] = self.profile
+        return datos
+
+
+class NullStats:
+    """
+    Estadísticas desactivadas: todas las operaciones son no-ops, para que la
+    instrumentación no tenga costo cuando no se usa.
+    """
+
+    enabled = False
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def add_time(self, name: str, seconds: float):
+        pass
+
+    def add_iteration(self, seconds: float):
+        pass
+
+    def as_dict(self):
+        return None
+
+
+NULL_STATS = NullStats()
+
+
+def merge_stats(stats_list: list[dict]):
+    """
+    Suma las estadísticas de varias ejecuciones (por ejemplo, una por plancha).
+
+    :param stats_list: Entradas ``stats`` de varios resultados (se ignoran las None)
+    :type stats_list: list[dict or None]
+    :rtype: dict
+    """
+    total = {"contadores": defaultdict(int), "tiempos": defaultdict(float), "iteraciones": [], "tiempo_total": 0.0}
+    for stats in stats_list:
+        if not stats:
+            continue
+        for name, value in stats["contadores"].items():
+            total["contadores"][name] += value
+        for name, value in stats["tiempos"].items():
+            total["tiempos"][name] += value
+        total["iteraciones"].extend(stats["iteraciones"])
+        total["tiempo_total"] += stats["tiempo_total"]
+    total["contadores"] = dict(total["contadores"])
+    total["tiempos"] = dict(total["tiempos"])
+    return total
+
+
+def run_profiled(mode: str, funcion):
+    """
+    Ejecuta ``funcion`` bajo un perfilador y devuelve su resultado junto al reporte en texto.
+
+    :param mode: ``"cprofile"`` o ``"pyinstrument"`` (este último requiere tener pyinstrument instalado)
+    :type mode: str
+    :return: Tupla ``(resultado, reporte)``
+    :rtype: tuple[object, str]
+    :raises ValueError: Si el modo no es conocido
+    :raises RuntimeError: Si se pide pyinstrument y no está instalado
+    """
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        resultado = profiler.runcall(funcion)
+        salida = io.StringIO()
+        pstats.Stats(profiler, stream=salida).sort_stats("cumulative").print_stats(30)
+        return resultado, salida.getvalue()
+
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("El modo de perfil 'pyinstrument' requiere instalar pyinstrument.")
+        profiler = Profiler()
+        profiler.start()
+        try:
+            resultado = funcion()
+        finally:
+            profiler.stop()
+        return resultado, profiler.output_text()
+
+    raise ValueError(f"Modo de perfil desconocido: {mode}")
+
@@ -0,0 +1,434 @@
+import math
+
+import numpy as np
+
+from .common_line import merge_common_lines, sheet_rings
+
+
+class CutPath:
+    """
+    Trazo de corte: un contorno cerrado (se corta completo y se termina en el punto
+    de perforación) o una polilínea abierta (se entra por un extremo y se sale por
+    el otro).
+
+    :var label: Etiqueta de la pieza o del tramo
+    :vartype label: str
+    :var coords: Vértices del trazo, sin repetir el primero en los cerrados
+    :vartype coords: list[tuple[float, float]]
+    :var closed: Si el trazo es un contorno cerrado
+    :vartype closed: bool
+    """
+
+    def __init__(self, label: str, coords: list[tuple[float, float]], closed: bool = True):
+        self.label = label
+        self.coords = [tuple(map(float, c)) for c in coords]
+        self.closed = closed
+
+    @property
+    def length(self):
+        """Longitud de corte del trazo."""
+        puntos = np.asarray(self.points())
+        return float(np.hypot(*np.diff(puntos, axis=0).T).sum())
+
+    def points(self):
+        """
+        Puntos que recorre la herramienta, desde la perforación hasta el final del
+        trazo (en los cerrados, el primer punto se repite al final).
+
+        :rtype: list[tuple[float, float]]
+        """
+        return self.coords + [self.coords[0]] if self.closed else list(self.coords)
+
+    def start_at(self, index: int):
+        """
+        Trazo cerrado equivalente que empieza en el vértice ``index``.
+
+        :rtype: CutPath
+        """
+        return CutPath(self.label, self.coords[index:] + self.coords[:index], self.closed)
+
+    def reversed(self):
+        """Mismo trazo recorrido en sentido contrario."""
+        if self.closed:
+            return CutPath(self.label, self.coords[:1] + self.coords[:0:-1], True)
+        return CutPath(self.label, self.coords[::-1], False)
+
+
+class ToolPath:
+    """
+    Secuencia de corte de una plancha.
+
+    :var cuts: Trazos en el orden en que se cortan, cada uno orientado y empezando en
+        su punto de perforación
+    :vartype cuts: list[CutPath]
+    :var start: Posición inicial de la herramienta
+    :vartype start: tuple[float, float]
+    """
+
+    def __init__(self, cuts: list[CutPath], start: tuple[float, float] = (0.0, 0.0)):
+        self.cuts = cuts
+        self.start = start
+
+    def rapids(self):
+        """
+        Desplazamientos en vacío entre trazos, como pares ``(desde, hasta)``.
+
+        :rtype: list[tuple[tuple[float, float], tuple[float, float]]]
+        """
+        movimientos = []
+        actual = self.start
+        for cut in self.cuts:
+            puntos = cut.points()
+            movimientos.append((actual, puntos[0]))
+            actual = puntos[-1]
+        return movimientos
+
+    @property
+    def travel(self):
+        """Distancia total recorrida en vacío."""
+        return sum(math.dist(a, b) for a, b in self.rapids())
+
+    @property
+    def cut_length(self):
+        """Longitud total de corte."""
+        return sum(cut.length for cut in self.cuts)
+
+
+class _PointGrid:
+    """
+    Índice espacial de puntos en una grilla uniforme, con bajas. Cada punto pertenece
+    a un dueño (un trazo); las búsquedas devuelven el punto o los dueños más cercanos.
+    """
+
+    def __init__(self, points: np.ndarray, owners: np.ndarray):
+        self.points = points.tolist()
+        self.owners = owners.tolist()
+        minx, miny = points.min(axis=0)
+        maxx, maxy = points.max(axis=0)
+        area = max((maxx - minx) * (maxy - miny), 1e-9)
+        # Unos dos puntos por celda
+        self.cell = max(math.sqrt(2 * area / len(points)), 1e-6)
+        self.origin = (minx, miny)
+        self.span = int(max(maxx - minx, maxy - miny) / self.cell) + 2
+        self.cells = {}
+        self.by_owner = {}
+        for i, (x, y) in enumerate(self.points):
+            self.cells.setdefault(self._key(x, y), set()).add(i)
+            self.by_owner.setdefault(self.owners[i], []).append(i)
+
+    def _key(self, x, y):
+        return int((x - self.origin[0]) // self.cell), int((y - self.origin[1]) // self.cell)
+
+    def remove_owner(self, owner: int):
+        for i in self.by_owner.pop(owner, ()):
+            celda = self.cells[self._key(*self.points[i])]
+            celda.discard(i)
+
+    def _rings(self, x, y):
+        """Recorre las celdas en anillos cuadrados crecientes alrededor de (x, y)."""
+        cx, cy = self._key(x, y)
+        for r in range(self.span + abs(cx) + abs(cy) + 1):
+            celdas = []
+            for dx in range(-r, r + 1):
+                celdas.append((cx + dx, cy - r))
+                if r:
+                    celdas.append((cx + dx, cy + r))
+            for dy in range(-r + 1, r):
+                celdas.append((cx - r, cy + dy))
+                celdas.append((cx + r, cy + dy))
+            yield r, [self.cells[c] for c in celdas if self.cells.get(c)]
+
+    def nearest(self, x: float, y: float):
+        """
+        Índice del punto más cercano, o None si no quedan puntos.
+        """
+        mejor, mejor_d = None, math.inf
+        for r, celdas in self._rings(x, y):
+            for celda in celdas:
+                for i in celda:
+                    px, py = self.points[i]
+                    d = math.hypot(px - x, py - y)
+                    if d < mejor_d:
+                        mejor, mejor_d = i, d
+            # Las celdas de anillos siguientes están al menos a r celdas de distancia
+            if mejor is not None and mejor_d <= r * self.cell:
+                break
+        return mejor
+
+    def nearest_owners(self, x: float, y: float, k: int, exclude: int | None = None):
+        """
+        Los ``k`` dueños más cercanos a (x, y), del más cercano al más lejano.
+        """
+        distancias = {}
+        for r, celdas in self._rings(x, y):
+            for celda in celdas:
+                for i in celda:
+                    owner = self.owners[i]
+                    if owner == exclude:
+                        continue
+                    px, py = self.points[i]
+                    d = math.hypot(px - x, py - y)
+                    if d < distancias.get(owner, math.inf):
+                        distancias[owner] = d
+            if len(distancias) >= k and sorted(distancias.values())[k - 1] <= r * self.cell:
+                break
+            if len(distancias) == len(self.by_owner) - (exclude in self.by_owner):
+                break
+        return sorted(distancias, key=distancias.get)[:k]
+
+
+def _nearest_neighbour(paths: list[CutPath], start):
+    """
+    Orden inicial por vecino más cercano: desde la posición actual se va al vértice
+    más cercano de un trazo pendiente (en los abiertos, solo a sus extremos), que
+    pasa a ser su punto de perforación.
+    """
+    puntos, owners = [], []
+    for k, path in enumerate(paths):
+        candidatos = path.coords if path.closed else [path.coords[0], path.coords[-1]]
+        puntos.extend(candidatos)
+        owners.extend([k] * len(candidatos))
+    grid = _PointGrid(np.asarray(puntos, dtype=float), np.asarray(owners))
+    base = np.cumsum([0] + [len(p.coords) if p.closed else 2 for p in paths])
+
+    orden = []
+    actual = start
+    for _ in range(len(paths)):
+        i = grid.nearest(*actual)
+        k = int(owners[i])
+        grid.remove_owner(k)
+        path = paths[k]
+        if path.closed:
+            path = path.start_at(int(i - base[k]))
+        elif i != base[k]:
+            path = path.reversed()
+        orden.append(path)
+        actual = path.points()[-1]
+    return orden
+
+
+class _Tour:
+    """
+    Recorrido abierto sobre los trazos, con sus puntos de entrada y salida, para las
+    mejoras 2-opt y Or-opt. Invertir un tramo del recorrido invierte también el
+    sentido de cada trazo abierto del tramo (en los cerrados entrada y salida coinciden).
+    """
+
+    def __init__(self, paths: list[CutPath], start):
+        self.paths = paths
+        self.start = tuple(start)
+        self.entry = [p.points()[0] for p in paths]
+        self.exit = [p.points()[-1] for p in paths]
+        self.order = list(range(len(paths)))
+        self.flipped = [False] * len(paths)
+        self.pos = list(range(len(paths)))
+
+    def entrada(self, node):
+        return self.exit[node] if self.flipped[node] else self.entry[node]
+
+    def salida(self, node):
+        return self.entry[node] if self.flipped[node] else self.exit[node]
+
+    def salida_en(self, i):
+        """Punto de salida de la posición ``i`` (la posición -1 es el inicio)."""
+        return self.start if i < 0 else self.salida(self.order[i])
+
+    def entrada_en(self, i):
+        """Punto de entrada de la posición ``i`` (None más allá del final)."""
+        return self.entrada(self.order[i]) if i < len(self.order) else None
+
+    def reverse(self, i, j):
+        """Invierte las posiciones ``i..j`` (inclusive)."""
+        tramo = self.order[i:j + 1][::-1]
+        self.order[i:j + 1] = tramo
+        for k, node in enumerate(tramo, start=i):
+            self.pos[node] = k
+            if not self.paths[node].closed:
+                self.flipped[node] = not self.flipped[node]
+
+    def move(self, i, j, k, flip):
+        """
+        Mueve el tramo ``i..j`` para que quede después de la posición ``k`` (fuera
+        del tramo), invertido si ``flip``.
+        """
+        tramo = self.order[i:j + 1]
+        if flip:
+            tramo = tramo[::-1]
+            for node in tramo:
+                if not self.paths[node].closed:
+                    self.flipped[node] = not self.flipped[node]
+        resto = self.order[:i] + self.order[j + 1:]
+        destino = k + 1 if k < i else k - len(tramo) + 1
+        self.order = resto[:destino] + tramo + resto[destino:]
+        for n, node in enumerate(self.order):
+            self.pos[node] = n
+
+
+def _d(a, b):
+    if a is None or b is None:
+        return 0.0
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def _two_opt(tour: _Tour, vecinos: list[list[int]]):
+    """
+    Una pasada de 2-opt con listas de vecinos: para cada salida se prueba unirla con
+    la entrada invertida de un trazo cercano.
+    """
+    mejoro = False
+    n = len(tour.order)
+    for i in range(-1, n - 1):
+        a = tour.salida_en(i)
+        siguiente = tour.order[i + 1]
+        for c in vecinos[siguiente] if i < 0 else vecinos[tour.order[i]]:
+            j = tour.pos[c]
+            if j <= i + 1:
+                continue
+            b = tour.entrada_en(i + 1)
+            cs = tour.salida_en(j)
+            d_next = tour.entrada_en(j + 1)
+            # Al invertir i+1..j, se entra por la salida de j y se sale por la entrada de i+1
+            delta = _d(a, cs) + _d(b, d_next) - _d(a, b) - _d(cs, d_next)
+            if delta < -1e-9:
+                tour.reverse(i + 1, j)
+                mejoro = True
+                a = tour.salida_en(i)
+    return mejoro
+
+
+def _or_opt(tour: _Tour, vecinos: list[list[int]], max_len: int = 3):
+    """
+    Una pasada de Or-opt: tramos de hasta ``max_len`` trazos se reubican (en uno u
+    otro sentido) junto a un trazo cercano si eso acorta el recorrido.
+    """
+    mejoro = False
+    n = len(tour.order)
+    for largo in range(1, max_len + 1):
+        i = 0
+        while i + largo <= n:
+            j = i + largo - 1
+            entra, sale = tour.entrada_en(i), tour.salida_en(j)
+            antes, despues = tour.salida_en(i - 1), tour.entrada_en(j + 1)
+            quitar = _d(antes, entra) + _d(sale, despues) - _d(antes, despues)
+            mejor = None
+            # Se inserta antes o después de cada trazo cercano
+            posiciones = set()
+            for c in vecinos[tour.order[i]] + vecinos[tour.order[j]]:
+                posiciones.update((tour.pos[c] - 1, tour.pos[c]))
+            for k in posiciones:
+                if i - 1 <= k <= j:
+                    continue
+                p, q = tour.salida_en(k), tour.entrada_en(k + 1)
+                # Normal o invertido (en un solo contorno cerrado da igual)
+                for flip, e, s in ((False, entra, sale), (True, sale, entra)):
+                    if flip and e == entra and s == sale:
+                        continue
+                    delta = _d(p, e) + _d(s, q) - _d(p, q) - quitar
+                    if delta < -1e-9 and (mejor is None or delta < mejor[0]):
+                        mejor = (delta, k, flip)
+            if mejor is not None:
+                _, k, flip = mejor
+                tour.move(i, j, k, flip)
+                mejoro = True
+            i += 1
+    return mejoro
+
+
+def _refine_pierce(paths: list[CutPath], start):
+    """
+    Reelige el punto de perforación de cada contorno cerrado: el vértice que minimiza
+    la llegada desde el trazo anterior más la salida hacia el siguiente.
+    """
+    resultado = list(paths)
+    for k, path in enumerate(resultado):
+        if not path.closed:
+            continue
+        previo = start if k == 0 else resultado[k - 1].points()[-1]
+        siguiente = resultado[k + 1].points()[0] if k + 1 < len(resultado) else None
+        coords = np.asarray(path.coords)
+        costo = np.hypot(*(coords - previo).T)
+        if siguiente is not None:
+            costo = costo + np.hypot(*(coords - siguiente).T)
+        mejor = int(np.argmin(costo))
+        if mejor:
+            resultado[k] = path.start_at(mejor)
+    return resultado
+
+
+def plan_cuts(
+    paths: list[CutPath],
+    start: tuple[float, float] = (0.0, 0.0),
+    neighbours: int = 8,
+    max_passes: int = 20,
+):
+    """
+    Ordena los trazos de corte para minimizar el recorrido en vacío de la herramienta.
+
+    Se arma un recorrido inicial por vecino más cercano (con una grilla espacial sobre
+    los vértices, así que escala a miles de trazos) y se mejora con pasadas de 2-opt y
+    Or-opt restringidas a los ``neighbours`` trazos más cercanos de cada uno. Al final
+    se reelige el punto de perforación de cada contorno cerrado.
+
+    :param paths: Trazos a cortar
+    :param start: Posición inicial de la herramienta
+    :param neighbours: Vecinos considerados por trazo en las mejoras
+    :param max_passes: Máximo de pasadas de mejora
+    :rtype: ToolPath
+    """
+    if not paths:
+        return ToolPath([], start)
+    orden = _nearest_neighbour(paths, start)
+    if len(orden) > 2:
+        tour = _Tour(orden, start)
+        extremos = np.asarray(tour.entry + tour.exit, dtype=float)
+        grid = _PointGrid(extremos, np.concatenate([np.arange(len(orden))] * 2))
+        vecinos = [
+            grid.nearest_owners(*tour.entry[k], k=neighbours, exclude=k) for k in range(len(orden))
+        ]
+        for _ in range(max_passes):
+            if not (_two_opt(tour, vecinos) | _or_opt(tour, vecinos)):
+                break
+        orden = [
+            orden[node].reversed() if tour.flipped[node] else orden[node]
+            for node in tour.order
+        ]
+    return ToolPath(_refine_pierce(orden, start), start)
+
+
+def sheet_paths(result: dict, common_line_tolerance: float | None = None):
+    """
+    Trazos de corte de las piezas colocadas en una plancha (contorno real, en
+    sentido horario).
+
+    :param result: Resultado del solver para la plancha
+    :param common_line_tolerance: Si se indica, las aristas compartidas por piezas
+        vecinas (a menos de esta distancia) se cortan una sola vez: los contornos
+        afectados se entregan como polilíneas abiertas
+    :rtype: list[CutPath]
+    """
+    placements = result["placements"] or []
+    labels = [getattr(p.piece, "etiqueta", p.piece.name) for p in placements]
+    rings = sheet_rings(result)
+    if common_line_tolerance is None:
+        return [CutPath(label, ring) for label, ring in zip(labels, rings)]
+    trazos, _ = merge_common_lines(rings, common_line_tolerance)
+    return [CutPath(labels[k], coords, closed) for k, coords, closed in trazos]
+
+
+def plan_sheet(
+    result: dict,
+    start: tuple[float, float] = (0.0, 0.0),
+    common_line_tolerance: float | None = None,
+    **kwargs,
+):
+    """
+    Secuencia de corte de una plancha resuelta.
+
+    :param result: Resultado del solver para la plancha
+    :param start: Posición inicial de la herramienta
+    :param common_line_tolerance: Tolerancia del corte en línea común (None = cortar
+        cada contorno completo)
+    :param kwargs: Parámetros de ``plan_cuts``
+    :rtype: ToolPath
+    """
+    return plan_cuts(sheet_paths(result, common_line_tolerance), start, **kwargs)
@@ -1,5 +1,6 @@
 from .frame import Frame
+from .piece_library import PieceLibrary
 from .placement import Placement
 from .polygon_piece import PolygonPiece
 
-__all__ = ["Frame", "Placement", "PolygonPiece"]
+__all__ = ["Frame", "PieceLibrary", "Placement", "PolygonPiece"]
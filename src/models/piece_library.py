@@ -0,0 +1,166 @@
+import os
+import sqlite3
+
+import numpy as np
+from shapely import Polygon
+
+from .polygon_piece import EDGE_SEPARATOR, EDGES_SEPARATOR, PolygonPiece
+
+
+DEFAULT_LIBRARY_PATH = os.path.join(os.path.expanduser("~"), ".simulador_cortes", "piezas.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS piezas (
+    nombre TEXT PRIMARY KEY,
+    vertices BLOB NOT NULL,
+    area REAL NOT NULL,
+    ancho REAL NOT NULL,
+    alto REAL NOT NULL
+)
+"""
+
+
+def _entry(piece: PolygonPiece):
+    """
+    Fila de la biblioteca para una pieza: vértices normalizados (la dimensión mayor
+    mide 1, como en el formato de texto) en un blob de float64, con su área y tamaño.
+    """
+    vertices = np.asarray(piece.unit_vertices(), dtype=np.float64)
+    polygon = Polygon(vertices)
+    minx, miny, maxx, maxy = polygon.bounds
+    return piece.name, vertices.tobytes(), polygon.area, maxx - minx, maxy - miny
+
+
+def _parse_txt_line(line: str):
+    """
+    Interpreta una línea del formato de texto ``nombre::::(x,y)::(x,y)...``.
+    """
+    name, verts_str = line.strip().split(EDGE_SEPARATOR)
+    coords = verts_str.replace("(", "").replace(")", "").replace(EDGES_SEPARATOR, ",")
+    valores = np.array(coords.split(","), dtype=np.float64)
+    return PolygonPiece(name, [tuple(v) for v in valores.reshape(-1, 2).tolist()])
+
+
+class PieceLibrary:
+    """
+    Biblioteca de formas de pieza guardada en SQLite, indexada por nombre.
+
+    Cada entrada guarda la forma normalizada (vértices en un blob) junto con su área
+    y su ancho y alto normalizados, así que se pueden listar o filtrar formas sin
+    reconstruir su geometría. Guardar una forma reemplaza solo su fila.
+
+    :var path: Ruta del archivo de la biblioteca
+    :vartype path: str
+    """
+
+    def __init__(self, path: str = DEFAULT_LIBRARY_PATH):
+        """
+        :param path: Ruta del archivo de la biblioteca; ``":memory:"`` para una en memoria
+        :type path: str
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM piezas").fetchone()[0]
+
+    def __contains__(self, name: str):
+        return self._db.execute("SELECT 1 FROM piezas WHERE nombre = ?", (name,)).fetchone() is not None
+
+    def save(self, piece: PolygonPiece):
+        """
+        Guarda (o reemplaza) la forma de una pieza. La pieza no se modifica.
+        """
+        self.save_many([piece])
+
+    def save_many(self, pieces):
+        """
+        Guarda muchas formas en una sola transacción.
+
+        :param pieces: Iterable de piezas
+        :return: Cantidad de formas guardadas
+        :rtype: int
+        """
+        with self._db:
+            cursor = self._db.executemany(
+                "INSERT INTO piezas (nombre, vertices, area, ancho, alto) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(nombre) DO UPDATE SET vertices = excluded.vertices, area = excluded.area, "
+                "ancho = excluded.ancho, alto = excluded.alto",
+                (_entry(p) for p in pieces),
+            )
+        return cursor.rowcount
+
+    def delete(self, name: str):
+        with self._db:
+            self._db.execute("DELETE FROM piezas WHERE nombre = ?", (name,))
+
+    def get(self, name: str):
+        """
+        Devuelve la forma normalizada guardada con ese nombre, o None si no existe.
+
+        :rtype: PolygonPiece or None
+        """
+        fila = self._db.execute("SELECT nombre, vertices FROM piezas WHERE nombre = ?", (name,)).fetchone()
+        return self._piece(*fila) if fila else None
+
+    def entries(self):
+        """
+        Recorre los datos precalculados de cada forma sin construir su geometría.
+
+        :return: Generador de diccionarios con ``nombre``, ``area``, ``ancho`` y ``alto``
+        :rtype: Iterator[dict]
+        """
+        for nombre, area, ancho, alto in self._db.execute("SELECT nombre, area, ancho, alto FROM piezas ORDER BY nombre"):
+            yield {"nombre": nombre, "area": area, "ancho": ancho, "alto": alto}
+
+    def load_all(self):
+        """
+        Devuelve todas las formas de la biblioteca.
+
+        :rtype: list[PolygonPiece]
+        """
+        return [self._piece(*fila) for fila in self._db.execute("SELECT nombre, vertices FROM piezas ORDER BY nombre")]
+
+    @staticmethod
+    def _piece(name: str, blob: bytes):
+        vertices = np.frombuffer(blob, dtype=np.float64).reshape(-1, 2)
+        return PolygonPiece(name, [tuple(v) for v in vertices.tolist()])
+
+    def import_txt(self, filepath: str):
+        """
+        Importa un archivo con el formato de texto de ``PolygonPiece.save_to_txt``.
+        Si un nombre aparece más de una vez, queda la última forma.
+
+        :return: Cantidad de formas importadas
+        :rtype: int
+        """
+        with open(filepath, "r") as f:
+            return self.save_many(_parse_txt_line(line) for line in f if line.strip())
+
+    def export_txt(self, filepath: str):
+        """
+        Exporta la biblioteca al formato de texto de ``PolygonPiece.save_to_txt``.
+
+        :return: Cantidad de formas exportadas
+        :rtype: int
+        """
+        n = 0
+        with open(filepath, "w") as f:
+            for nombre, blob in self._db.execute("SELECT nombre, vertices FROM piezas ORDER BY nombre"):
+                vertices = np.frombuffer(blob, dtype=np.float64).reshape(-1, 2).tolist()
+                f.write(f"{nombre}{EDGE_SEPARATOR}{EDGES_SEPARATOR.join(f'({x},{y})' for x, y in vertices)}\n")
+                n += 1
+        return n
@@ -4,8 +4,16 @@ from .polygon_piece import PolygonPiece
 
 class Placement:
     def __init__(
-        self, piece: PolygonPiece, frame: Frame, position: tuple[float, float]
+        self,
+        piece: PolygonPiece,
+        frame: Frame,
+        position: tuple[float, float],
+        rotation: float = 0.0,
+        source: PolygonPiece | None = None,
     ):
         self.piece = piece
         self.frame = frame
         self.position = position
+        self.rotation = rotation
+        # Pieza original (sin mover) a la que corresponde esta colocación
+        self.source = source
@@ -2,7 +2,7 @@ import copy
 import os
 
 from shapely import Polygon
-from shapely.affinity import translate
+from shapely.affinity import rotate, translate
 
 
 EDGE_SEPARATOR = "::::"
@@ -25,16 +25,19 @@ class PolygonPiece:
         self.precio = precio
         self.polygon = Polygon(vertices)
 
-    def scale_to_unit(self):
+    def unit_vertices(self):
         xs, ys = zip(*self.vertices)
         min_x, max_x = min(xs), max(xs)
         min_y, max_y = min(ys), max(ys)
         width = max_x - min_x
         height = max_y - min_y
         scale = 1.0 / max(width, height)
-        self.vertices = [
+        return [
             ((x - min_x) * scale, (y - min_y) * scale) for x, y in self.vertices
         ]
+
+    def scale_to_unit(self):
+        self.vertices = self.unit_vertices()
         self.polygon = Polygon(self.vertices)
 
     def create_instance(self, width: float, height: float):
@@ -50,8 +53,34 @@ class PolygonPiece:
     def move(self, dx, dy):
         moved_poly = translate(self.polygon, dx, dy)
         nueva_pieza = PolygonPiece(self.name, list(moved_poly.exterior.coords)[:-1])
-        if hasattr(self, 'etiqueta'):
-            nueva_pieza.etiqueta = self.etiqueta
+        for attr in ("etiqueta", "precio_m2"):
+            if hasattr(self, attr):
+                setattr(nueva_pieza, attr, getattr(self, attr))
+        return nueva_pieza
+
+    def rotate(self, angle: float):
+        # Gira alrededor del origen y vuelve a apoyar la pieza en la misma esquina
+        # inferior izquierda; los múltiplos de 90° se calculan de forma exacta
+        vueltas = angle / 90
+        if vueltas == int(vueltas):
+            giro = int(vueltas) % 4
+            if giro == 0:
+                rotated = list(self.vertices)
+            elif giro == 1:
+                rotated = [(-y, x) for x, y in self.vertices]
+            elif giro == 2:
+                rotated = [(-x, -y) for x, y in self.vertices]
+            else:
+                rotated = [(y, -x) for x, y in self.vertices]
+        else:
+            rotated = list(rotate(self.polygon, angle, origin=(0, 0)).exterior.coords)[:-1]
+        min_x, min_y, _, _ = self.polygon.bounds
+        rx = min(x for x, _ in rotated)
+        ry = min(y for _, y in rotated)
+        nueva_pieza = PolygonPiece(self.name, [(x - rx + min_x, y - ry + min_y) for x, y in rotated])
+        for attr in ("etiqueta", "precio_m2"):
+            if hasattr(self, attr):
+                setattr(nueva_pieza, attr, getattr(self, attr))
         return nueva_pieza
 
     def reflect(self):
@@ -59,8 +88,8 @@ class PolygonPiece:
         return PolygonPiece(self.name, reflected)
 
     def save_to_txt(self, filepath: str):
-        self.scale_to_unit()
-        new_line = f"{self.name}{EDGE_SEPARATOR}{EDGES_SEPARATOR.join(f'({x},{y})' for x, y in self.vertices)}\n"
+        # Se guarda la forma normalizada sin modificar la pieza
+        new_line = f"{self.name}{EDGE_SEPARATOR}{EDGES_SEPARATOR.join(f'({x},{y})' for x, y in self.unit_vertices())}\n"
         lines: list[str] = []
         found = False
         if os.path.exists(filepath):
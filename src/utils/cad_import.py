@@ -0,0 +1,633 @@
+import heapq
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+
+from src.models import PolygonPiece
+
+
+# Distancia máxima entre una curva y los segmentos que la aproximan
+DEFAULT_TOLERANCE = 0.1
+# Vértices máximos por pieza después de simplificar
+DEFAULT_MAX_VERTICES = 32
+# Tolerancia relativa para considerar un vértice alineado con sus vecinos
+_COLLINEAR = 1e-9
+
+
+# ---------------------------------------------------------------------------
+# Aplanado de curvas
+# ---------------------------------------------------------------------------
+
+def _arc_segments(radius: float, angle: float, tolerance: float):
+    """
+    Cantidad de segmentos para aproximar un arco sin alejarse más de ``tolerance``.
+    """
+    if radius <= tolerance:
+        return max(1, math.ceil(abs(angle) / (math.pi / 2)))
+    paso = 2 * math.acos(1 - tolerance / radius)
+    return max(1, math.ceil(abs(angle) / paso))
+
+
+def _flatten_bezier(points: list[tuple[float, float]], tolerance: float, out: list, depth: int = 0):
+    """
+    Aplana una curva de Bézier (cuadrática o cúbica) por subdivisión adaptativa:
+    se subdivide hasta que los puntos de control quedan a menos de ``tolerance``
+    de la cuerda. Agrega a ``out`` los puntos sin incluir el inicial.
+    """
+    p0, pn = np.asarray(points[0]), np.asarray(points[-1])
+    cuerda = pn - p0
+    largo = math.hypot(*cuerda)
+    if largo == 0:
+        distancia = max(math.hypot(*(np.asarray(p) - p0)) for p in points[1:-1])
+    else:
+        distancia = max(abs(np.cross(cuerda, np.asarray(p) - p0)) / largo for p in points[1:-1])
+    if distancia <= tolerance or depth > 16:
+        out.append(tuple(points[-1]))
+        return
+    # Subdivisión de De Casteljau en t = 0.5
+    niveles = [np.asarray(points, dtype=float)]
+    while len(niveles[-1]) > 1:
+        anterior = niveles[-1]
+        niveles.append((anterior[:-1] + anterior[1:]) / 2)
+    izquierda = [tuple(nivel[0]) for nivel in niveles]
+    derecha = [tuple(nivel[-1]) for nivel in reversed(niveles)]
+    _flatten_bezier(izquierda, tolerance, out, depth + 1)
+    _flatten_bezier(derecha, tolerance, out, depth + 1)
+
+
+def _flatten_arc(center, radius_x, radius_y, rotation, start, sweep, tolerance, out):
+    """
+    Aplana un arco elíptico dado por su centro, radios, rotación y ángulos.
+    """
+    n = _arc_segments(max(radius_x, radius_y), sweep, tolerance)
+    cos_r, sin_r = math.cos(rotation), math.sin(rotation)
+    for i in range(1, n + 1):
+        t = start + sweep * i / n
+        x, y = radius_x * math.cos(t), radius_y * math.sin(t)
+        out.append((center[0] + x * cos_r - y * sin_r, center[1] + x * sin_r + y * cos_r))
+
+
+def _svg_arc(p0, rx, ry, phi_deg, large, sweep_flag, p1, tolerance, out):
+    """
+    Aplana un comando ``A`` de SVG (parametrización por extremos, SVG 1.1 apéndice F.6).
+    """
+    if rx == 0 or ry == 0 or p0 == p1:
+        out.append(p1)
+        return
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(phi_deg)
+    cos_p, sin_p = math.cos(phi), math.sin(phi)
+    dx, dy = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1 = cos_p * dx + sin_p * dy
+    y1 = -sin_p * dx + cos_p * dy
+    escala = (x1 / rx) ** 2 + (y1 / ry) ** 2
+    if escala > 1:
+        rx, ry = rx * math.sqrt(escala), ry * math.sqrt(escala)
+    num = rx**2 * ry**2 - rx**2 * y1**2 - ry**2 * x1**2
+    den = rx**2 * y1**2 + ry**2 * x1**2
+    factor = math.sqrt(max(num / den, 0)) if den else 0.0
+    if large == sweep_flag:
+        factor = -factor
+    cx1, cy1 = factor * rx * y1 / ry, -factor * ry * x1 / rx
+    cx = cos_p * cx1 - sin_p * cy1 + (p0[0] + p1[0]) / 2
+    cy = sin_p * cx1 + cos_p * cy1 + (p0[1] + p1[1]) / 2
+    inicio = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    fin = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx)
+    barrido = fin - inicio
+    if sweep_flag and barrido < 0:
+        barrido += 2 * math.pi
+    elif not sweep_flag and barrido > 0:
+        barrido -= 2 * math.pi
+    _flatten_arc((cx, cy), rx, ry, phi, inicio, barrido, tolerance, out)
+    out[-1] = p1
+
+
+def _bulge_arc(p0, p1, bulge, tolerance, out):
+    """
+    Aplana un tramo de polilínea DXF con abultamiento (``bulge`` = tan(ángulo/4)).
+    """
+    if bulge == 0:
+        out.append(p1)
+        return
+    angulo = 4 * math.atan(bulge)
+    cuerda = math.hypot(p1[0] - p0[0], p1[1] - p0[1])
+    radio = cuerda / (2 * math.sin(abs(angulo) / 2))
+    # El centro está sobre la mediatriz de la cuerda
+    mx, my = (p0[0] + p1[0]) / 2, (p0[1] + p1[1]) / 2
+    distancia = radio * math.cos(angulo / 2)
+    ux, uy = (p1[0] - p0[0]) / cuerda, (p1[1] - p0[1]) / cuerda
+    signo = 1 if bulge > 0 else -1
+    cx, cy = mx - signo * uy * distancia, my + signo * ux * distancia
+    inicio = math.atan2(p0[1] - cy, p0[0] - cx)
+    _flatten_arc((cx, cy), radio, radio, 0.0, inicio, angulo, tolerance, out)
+    out[-1] = p1
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+_SVG_TOKEN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_SVG_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+
+def _svg_transform(texto: str | None):
+    """
+    Convierte un atributo ``transform`` de SVG en una matriz afín de 3x3.
+    """
+    matriz = np.eye(3)
+    for nombre, argumentos in _SVG_TRANSFORM.findall(texto or ""):
+        v = [float(a) for a in re.split(r"[\s,]+", argumentos.strip()) if a]
+        if nombre == "matrix":
+            m = np.array([[v[0], v[2], v[4]], [v[1], v[3], v[5]], [0, 0, 1]])
+        elif nombre == "translate":
+            m = np.array([[1, 0, v[0]], [0, 1, v[1] if len(v) > 1 else 0], [0, 0, 1]])
+        elif nombre == "scale":
+            sy = v[1] if len(v) > 1 else v[0]
+            m = np.array([[v[0], 0, 0], [0, sy, 0], [0, 0, 1]])
+        elif nombre == "rotate":
+            a = math.radians(v[0])
+            m = np.array([[math.cos(a), -math.sin(a), 0], [math.sin(a), math.cos(a), 0], [0, 0, 1]])
+            if len(v) == 3:
+                t = np.array([[1, 0, v[1]], [0, 1, v[2]], [0, 0, 1]])
+                m = t @ m @ np.linalg.inv(t)
+        elif nombre == "skewX":
+            m = np.array([[1, math.tan(math.radians(v[0])), 0], [0, 1, 0], [0, 0, 1]])
+        else:
+            m = np.array([[1, 0, 0], [math.tan(math.radians(v[0])), 1, 0], [0, 0, 1]])
+        matriz = matriz @ m
+    return matriz
+
+
+def _svg_path_rings(d: str, tolerance: float):
+    """
+    Aplana el atributo ``d`` de un ``<path>`` en anillos (uno por subtrayecto).
+    """
+    tokens = _SVG_TOKEN.findall(d)
+    anillos, actual = [], []
+    pos = (0.0, 0.0)
+    inicio = pos
+    comando = None
+    control = None  # Último punto de control (para S y T)
+    i = 0
+
+    def numeros(n):
+        nonlocal i
+        valores = [float(t) for t in tokens[i:i + n]]
+        i += n
+        return valores
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            comando = tokens[i]
+            i += 1
+            if comando in "Zz":
+                if len(actual) > 2:
+                    anillos.append(actual)
+                actual = []
+                pos = inicio
+                control = None
+                continue
+        elif comando is None:
+            raise ValueError("trayecto SVG sin comando inicial")
+
+        relativo = comando.islower()
+        base = pos if relativo else (0.0, 0.0)
+        c = comando.upper()
+        if c == "M":
+            x, y = numeros(2)
+            if len(actual) > 2:
+                anillos.append(actual)
+            pos = (base[0] + x, base[1] + y)
+            inicio = pos
+            actual = [pos]
+            # Los pares siguientes de un M son líneas
+            comando = "l" if relativo else "L"
+            control = None
+        elif c == "L":
+            x, y = numeros(2)
+            pos = (base[0] + x, base[1] + y)
+            actual.append(pos)
+            control = None
+        elif c == "H":
+            (x,) = numeros(1)
+            pos = (base[0] + x, pos[1])
+            actual.append(pos)
+            control = None
+        elif c == "V":
+            (y,) = numeros(1)
+            pos = (pos[0], base[1] + y)
+            actual.append(pos)
+            control = None
+        elif c in "CS":
+            if c == "C":
+                x1, y1, x2, y2, x, y = numeros(6)
+                c1 = (base[0] + x1, base[1] + y1)
+            else:
+                x2, y2, x, y = numeros(4)
+                c1 = (2 * pos[0] - control[0], 2 * pos[1] - control[1]) if control and control[2] == "C" else pos
+            c2 = (base[0] + x2, base[1] + y2)
+            fin = (base[0] + x, base[1] + y)
+            _flatten_bezier([pos, c1, c2, fin], tolerance, actual)
+            control = (c2[0], c2[1], "C")
+            pos = fin
+        elif c in "QT":
+            if c == "Q":
+                x1, y1, x, y = numeros(4)
+                c1 = (base[0] + x1, base[1] + y1)
+            else:
+                x, y = numeros(2)
+                c1 = (2 * pos[0] - control[0], 2 * pos[1] - control[1]) if control and control[2] == "Q" else pos
+            fin = (base[0] + x, base[1] + y)
+            _flatten_bezier([pos, c1, fin], tolerance, actual)
+            control = (c1[0], c1[1], "Q")
+            pos = fin
+        elif c == "A":
+            rx, ry, phi, large, sweep, x, y = numeros(7)
+            fin = (base[0] + x, base[1] + y)
+            _svg_arc(pos, rx, ry, phi, bool(large), bool(sweep), fin, tolerance, actual)
+            pos = fin
+            control = None
+        else:
+            raise ValueError(f"comando SVG no soportado: {comando}")
+    if len(actual) > 2:
+        anillos.append(actual)
+    return anillos
+
+
+def _svg_element_rings(elemento, tolerance: float):
+    tag = elemento.tag.rsplit("}", 1)[-1]
+    attr = elemento.attrib
+    if tag == "path":
+        return _svg_path_rings(attr.get("d", ""), tolerance)
+    if tag in ("polygon", "polyline"):
+        valores = [float(v) for v in re.split(r"[\s,]+", attr.get("points", "").strip()) if v]
+        return [list(zip(valores[0::2], valores[1::2]))]
+    if tag == "rect":
+        x, y = float(attr.get("x", 0)), float(attr.get("y", 0))
+        w, h = float(attr["width"]), float(attr["height"])
+        return [[(x, y), (x + w, y), (x + w, y + h), (x, y + h)]]
+    if tag in ("circle", "ellipse"):
+        cx, cy = float(attr.get("cx", 0)), float(attr.get("cy", 0))
+        rx = float(attr.get("r", attr.get("rx", 0)))
+        ry = float(attr.get("r", attr.get("ry", 0)))
+        anillo = []
+        _flatten_arc((cx, cy), rx, ry, 0.0, 0.0, 2 * math.pi, tolerance, anillo)
+        return [anillo]
+    return []
+
+
+def leer_svg(path: str, tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Lee las formas cerradas de un SVG (``path``, ``polygon``, ``polyline``, ``rect``,
+    ``circle`` y ``ellipse``, con sus ``transform``) y aplana las curvas.
+
+    El eje Y de SVG apunta hacia abajo; las coordenadas se reflejan para que la pieza
+    se vea igual que en el dibujo original.
+
+    :return: Lista de ``(nombre, anillos)`` por elemento
+    :rtype: list[tuple[str, list[list[tuple[float, float]]]]]
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    formas = []
+
+    def recorrer(elemento, matriz):
+        matriz = matriz @ _svg_transform(elemento.attrib.get("transform"))
+        # Las tolerancias se expresan en unidades del documento
+        escala = math.sqrt(abs(np.linalg.det(matriz[:2, :2]))) or 1.0
+        anillos = _svg_element_rings(elemento, tolerance / escala)
+        if anillos:
+            transformados = []
+            for anillo in anillos:
+                puntos = np.column_stack([np.asarray(anillo, dtype=float), np.ones(len(anillo))]) @ matriz.T
+                transformados.append([(x, -y) for x, y in puntos[:, :2].tolist()])
+            nombre = elemento.attrib.get("id") or f"{stem}_{len(formas)+1}"
+            formas.append((nombre, transformados))
+        for hijo in elemento:
+            recorrer(hijo, matriz)
+
+    recorrer(ET.parse(path).getroot(), np.eye(3))
+    return formas
+
+
+# ---------------------------------------------------------------------------
+# DXF
+# ---------------------------------------------------------------------------
+
+def _dxf_pairs(path: str):
+    with open(path, "r", errors="replace") as f:
+        while True:
+            codigo = f.readline()
+            valor = f.readline()
+            if not codigo or not valor:
+                return
+            yield int(codigo.strip()), valor.strip()
+
+
+def _dxf_entities(path: str):
+    """
+    Agrupa las entidades de un DXF ASCII como ``(tipo, [(codigo, valor), ...])``.
+    """
+    entidad = None
+    for codigo, valor in _dxf_pairs(path):
+        if codigo == 0:
+            if entidad is not None:
+                yield entidad
+            entidad = (valor, [])
+        elif entidad is not None:
+            entidad[1].append((codigo, valor))
+    if entidad is not None:
+        yield entidad
+
+
+def _bulge_ring(vertices, bulges, tolerance):
+    anillo = [vertices[0]]
+    for k in range(len(vertices)):
+        siguiente = vertices[(k + 1) % len(vertices)]
+        _bulge_arc(vertices[k], siguiente, bulges[k], tolerance, anillo)
+    return anillo[:-1]
+
+
+def leer_dxf(path: str, tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Lee las polilíneas cerradas (``LWPOLYLINE`` y ``POLYLINE``, con arcos por
+    abultamiento) y los círculos de un DXF ASCII.
+
+    :return: Lista de ``(nombre, anillos)`` por entidad
+    :rtype: list[tuple[str, list[list[tuple[float, float]]]]]
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    formas = []
+    polilinea = None  # POLYLINE en curso: (cerrada, vértices, abultamientos)
+    for tipo, datos in _dxf_entities(path):
+        if tipo == "LWPOLYLINE":
+            vertices, bulges, cerrada = [], [], False
+            x = None
+            for codigo, valor in datos:
+                if codigo == 70:
+                    cerrada = bool(int(valor) & 1)
+                elif codigo == 10:
+                    x = float(valor)
+                elif codigo == 20:
+                    vertices.append((x, float(valor)))
+                    bulges.append(0.0)
+                elif codigo == 42 and bulges:
+                    bulges[-1] = float(valor)
+            if vertices and vertices[0] == vertices[-1] and len(vertices) > 1:
+                vertices, bulges, cerrada = vertices[:-1], bulges[:-1], True
+            if cerrada and len(vertices) >= 2:
+                formas.append((f"{stem}_{len(formas)+1}", [_bulge_ring(vertices, bulges, tolerance)]))
+        elif tipo == "POLYLINE":
+            flags = next((int(v) for c, v in datos if c == 70), 0)
+            polilinea = (bool(flags & 1), [], [])
+        elif tipo == "VERTEX" and polilinea is not None:
+            valores = dict(datos)
+            polilinea[1].append((float(valores.get(10, 0)), float(valores.get(20, 0))))
+            polilinea[2].append(float(valores.get(42, 0)))
+        elif tipo == "SEQEND" and polilinea is not None:
+            cerrada, vertices, bulges = polilinea
+            if vertices and vertices[0] == vertices[-1] and len(vertices) > 1:
+                vertices, bulges, cerrada = vertices[:-1], bulges[:-1], True
+            if cerrada and len(vertices) >= 2:
+                formas.append((f"{stem}_{len(formas)+1}", [_bulge_ring(vertices, bulges, tolerance)]))
+            polilinea = None
+        elif tipo == "CIRCLE":
+            valores = dict(datos)
+            anillo = []
+            centro = (float(valores.get(10, 0)), float(valores.get(20, 0)))
+            radio = float(valores.get(40, 0))
+            _flatten_arc(centro, radio, radio, 0.0, 0.0, 2 * math.pi, tolerance, anillo)
+            formas.append((f"{stem}_{len(formas)+1}", [anillo]))
+    return formas
+
+
+# ---------------------------------------------------------------------------
+# Simplificación hacia afuera
+# ---------------------------------------------------------------------------
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _line_intersection(p1, p2, p3, p4):
+    """
+    Intersección de las rectas p1-p2 y p3-p4 (None si son paralelas).
+    """
+    d = (p1[0] - p2[0]) * (p3[1] - p4[1]) - (p1[1] - p2[1]) * (p3[0] - p4[0])
+    if abs(d) < 1e-12:
+        return None
+    a = p1[0] * p2[1] - p1[1] * p2[0]
+    b = p3[0] * p4[1] - p3[1] * p4[0]
+    return (
+        (a * (p3[0] - p4[0]) - (p1[0] - p2[0]) * b) / d,
+        (a * (p3[1] - p4[1]) - (p1[1] - p2[1]) * b) / d,
+    )
+
+
+def _points_in_triangle(puntos: np.ndarray, a, b, c):
+    """
+    Indica qué puntos caen dentro (o sobre el borde) del triángulo a-b-c antihorario.
+    """
+    def lado(p, q):
+        return (q[0] - p[0]) * (puntos[:, 1] - p[1]) - (q[1] - p[1]) * (puntos[:, 0] - p[0])
+    eps = -1e-12
+    return (lado(a, b) >= eps) & (lado(b, c) >= eps) & (lado(c, a) >= eps)
+
+
+def _simplify_ring(pts: list[tuple[float, float]], max_vertices: int):
+    """
+    Simplificación voraz de un anillo antihorario (ver ``simplify_outward``).
+    """
+    pts = [tuple(p) for p in pts]
+    puntos = np.array(pts, dtype=float)
+    n = len(pts)
+    anterior = [(i - 1) % n for i in range(n)]
+    siguiente = [(i + 1) % n for i in range(n)]
+    vivo = [True] * n
+    version = [0] * n
+    restantes = n
+    heap = []
+
+    def candidato(i):
+        """Mejor operación centrada en el vértice i: (área agregada, tipo, punto nuevo)."""
+        p, q = anterior[i], siguiente[i]
+        a, v, b = pts[p], pts[i], pts[q]
+        giro = _cross(a, v, b)
+        if abs(giro) <= _COLLINEAR * ((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2):
+            # Vértice alineado: quitarlo no cambia el contorno
+            return 0.0, "alineado", None
+        if giro < 0:
+            # Vértice cóncavo: se rellena la muesca a-v-b
+            return -giro / 2, "concavo", None
+        # Arista v-b entre convexos: prolongar a-v y b-siguiente(b)
+        c = pts[siguiente[q]]
+        if _cross(v, b, c) < 0:
+            return None
+        x = _line_intersection(a, v, b, c)
+        # El punto nuevo debe quedar del lado exterior de v-b, sobre las prolongaciones
+        if (
+            x is None
+            or _cross(v, x, b) <= 0
+            or (x[0] - v[0]) * (v[0] - a[0]) + (x[1] - v[1]) * (v[1] - a[1]) <= 0
+            or (x[0] - b[0]) * (b[0] - c[0]) + (x[1] - b[1]) * (b[1] - c[1]) <= 0
+        ):
+            return None
+        return abs(_cross(v, x, b)) / 2, "arista", x
+
+    def encolar(i):
+        version[i] += 1
+        op = candidato(i)
+        if op is not None:
+            heapq.heappush(heap, (op[0], i, version[i], op[1], op[2]))
+
+    for i in range(n):
+        encolar(i)
+
+    while restantes > max_vertices and heap:
+        _, i, ver, tipo, x = heapq.heappop(heap)
+        if not vivo[i] or ver != version[i]:
+            continue
+        p, q = anterior[i], siguiente[i]
+        activos = np.flatnonzero(vivo)
+        if tipo in ("concavo", "alineado"):
+            # El triángulo de un vértice alineado no tiene área: todos los vértices
+            # sobre la misma recta contarían como interiores
+            otros = activos[(activos != p) & (activos != i) & (activos != q)]
+            if tipo == "concavo" and _points_in_triangle(puntos[otros], pts[p], pts[q], pts[i]).any():
+                continue
+            vivo[i] = False
+            siguiente[p], anterior[q] = q, p
+            restantes -= 1
+            for k in (p, q, anterior[p], siguiente[q]):
+                encolar(k)
+        else:
+            r = siguiente[q]
+            otros = activos[(activos != i) & (activos != q)]
+            if _points_in_triangle(puntos[otros], pts[i], x, pts[q]).any():
+                continue
+            # El vértice i pasa a ser la intersección y q desaparece
+            pts[i] = x
+            puntos[i] = x
+            vivo[q] = False
+            siguiente[i], anterior[r] = r, i
+            restantes -= 1
+            for k in (anterior[p], p, i, r, siguiente[r]):
+                encolar(k)
+
+    resultado, i = [], next(k for k in range(n) if vivo[k])
+    for _ in range(restantes):
+        resultado.append(pts[i])
+        i = siguiente[i]
+    return resultado
+
+
+def simplify_outward(coords: list[tuple[float, float]], max_vertices: int):
+    """
+    Reduce la cantidad de vértices de un polígono sin que pierda área: el resultado
+    siempre contiene al polígono original.
+
+    Es una simplificación voraz que en cada paso aplica la operación que menos área
+    agrega:
+
+    - quitar un vértice cóncavo (se rellena el triángulo que formaba la muesca), o
+    - reemplazar una arista entre dos vértices convexos por la intersección de las
+      prolongaciones de sus aristas vecinas (se agrega el triángulo exterior).
+
+    Una operación solo se acepta si ningún otro vértice queda dentro del triángulo
+    agregado, lo que garantiza que el polígono siga siendo simple. En contornos muy
+    dentados el camino voraz puede agregar más área que simplificar la envolvente
+    convexa, así que se prueban ambos y se queda el de menor área.
+
+    :param coords: Vértices del polígono (sin repetir el primero al final)
+    :param max_vertices: Cantidad máxima de vértices del resultado (al menos 3)
+    :return: Vértices simplificados en sentido antihorario
+    :rtype: list[tuple[float, float]]
+    """
+    poligono = orient(Polygon(coords), 1.0)
+    max_vertices = max(3, max_vertices)
+    pts = [tuple(p) for p in poligono.exterior.coords[:-1]]
+    if len(pts) <= max_vertices:
+        return pts
+    envolvente = orient(poligono.convex_hull, 1.0)
+    candidatos = [_simplify_ring(pts, max_vertices)]
+    if envolvente.geom_type == "Polygon":
+        candidatos.append(_simplify_ring(envolvente.exterior.coords[:-1], max_vertices))
+    return min(candidatos, key=lambda c: (len(c) > max_vertices, Polygon(c).area))
+
+
+# ---------------------------------------------------------------------------
+# Importación
+# ---------------------------------------------------------------------------
+
+def _outer_rings(anillos):
+    """
+    Descarta los anillos contenidos en otros (agujeros): la pieza se corta por su
+    contorno exterior.
+    """
+    poligonos = []
+    for anillo in anillos:
+        if len(anillo) < 3:
+            continue
+        poligono = Polygon(anillo)
+        if not poligono.is_valid:
+            poligono = poligono.buffer(0)
+        if poligono.geom_type == "MultiPolygon":
+            poligono = max(poligono.geoms, key=lambda g: g.area)
+        if poligono.area > 0:
+            poligonos.append(Polygon(poligono.exterior))
+    return [p for p in poligonos if not any(o is not p and o.contains(p) for o in poligonos)]
+
+
+def importar_cad(
+    path: str,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_vertices: int = DEFAULT_MAX_VERTICES,
+    escala: float = 1.0,
+):
+    """
+    Importa las piezas de un archivo SVG o DXF.
+
+    Las curvas se aplanan con ``tolerance`` y cada contorno se simplifica hacia afuera
+    hasta ``max_vertices`` vértices (el costo de los NFP crece con la cantidad de
+    vértices). La pieza simplificada siempre contiene al contorno original.
+
+    :param path: Ruta del archivo ``.svg`` o ``.dxf``
+    :param tolerance: Error máximo al aplanar curvas, en unidades del archivo
+    :param max_vertices: Vértices máximos por pieza
+    :param escala: Factor para convertir las unidades del archivo a las de la plancha
+    :return: Tupla ``(piezas, avisos)``; las piezas están llevadas al origen
+    :rtype: tuple[list[PolygonPiece], list[str]]
+    :raises ValueError: Si la extensión no es ``.svg`` ni ``.dxf``
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".svg":
+        formas = leer_svg(path, tolerance)
+    elif extension == ".dxf":
+        formas = leer_dxf(path, tolerance)
+    else:
+        raise ValueError(f"Formato CAD no soportado: {extension}")
+
+    piezas, avisos = [], []
+    for nombre, anillos in formas:
+        for k, original in enumerate(_outer_rings(anillos)):
+            etiqueta = nombre if k == 0 else f"{nombre}_{k+1}"
+            coords = original.exterior.coords[:-1]
+            simplificada = Polygon(simplify_outward(coords, max_vertices))
+            if not simplificada.is_valid or not simplificada.buffer(tolerance * 1e-3).contains(original):
+                avisos.append(f"{etiqueta}: no se pudo simplificar sin recortar la pieza; se usa la convexa")
+                # La envolvente también respeta el límite de vértices
+                simplificada = Polygon(simplify_outward(original.convex_hull.exterior.coords[:-1], max_vertices))
+            if len(simplificada.exterior.coords) - 1 > max_vertices:
+                avisos.append(
+                    f"{etiqueta}: quedó con {len(simplificada.exterior.coords) - 1} vértices "
+                    f"(límite {max_vertices})"
+                )
+            minx, miny, _, _ = simplificada.bounds
+            vertices = [((x - minx) * escala, (y - miny) * escala) for x, y in simplificada.exterior.coords[:-1]]
+            piezas.append(PolygonPiece(etiqueta, vertices))
+    return piezas, avisos
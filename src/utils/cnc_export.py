@@ -0,0 +1,131 @@
+import argparse
+import os
+
+from src.core.toolpath import ToolPath, plan_sheet
+from .solution_io import load_solution
+
+
+def _fmt(valor: float):
+    return f"{valor:.4f}".rstrip("0").rstrip(".") or "0"
+
+
+def exportar_gcode(path: str, toolpath: ToolPath, escala: float = 1.0, velocidad: float = 1000.0, titulo: str = ""):
+    """
+    Escribe la secuencia de corte como G-code: un desplazamiento rápido (``G0``) hasta
+    la perforación de cada trazo, encendido de la herramienta (``M3``), el trazo con
+    ``G1`` y apagado (``M5``).
+
+    :param path: Ruta del archivo (``.nc``, ``.gcode``, ...)
+    :param toolpath: Secuencia de corte de la plancha
+    :param escala: Factor de las unidades de la plancha a milímetros
+    :param velocidad: Velocidad de corte en mm/min
+    :param titulo: Comentario inicial (por ejemplo, la plancha)
+    :return: Cantidad de trazos escritos
+    :rtype: int
+    """
+    with open(path, "w") as f:
+        if titulo:
+            f.write(f"({titulo})\n")
+        f.write(f"(Trazos: {len(toolpath.cuts)}  Corte: {_fmt(toolpath.cut_length * escala)} mm  "
+                f"Recorrido en vacio: {_fmt(toolpath.travel * escala)} mm)\n")
+        f.write("G21\nG90\n")
+        for cut in toolpath.cuts:
+            puntos = cut.points()
+            f.write(f"({cut.label})\n")
+            f.write(f"G0 X{_fmt(puntos[0][0] * escala)} Y{_fmt(puntos[0][1] * escala)}\n")
+            f.write("M3\n")
+            primero = True
+            for x, y in puntos[1:]:
+                f.write(f"G1 X{_fmt(x * escala)} Y{_fmt(y * escala)}")
+                f.write(f" F{_fmt(velocidad)}\n" if primero else "\n")
+                primero = False
+            f.write("M5\n")
+        f.write(f"G0 X{_fmt(toolpath.start[0] * escala)} Y{_fmt(toolpath.start[1] * escala)}\nM30\n")
+    return len(toolpath.cuts)
+
+
+def _dxf(f, *pares):
+    for codigo, valor in pares:
+        f.write(f"{codigo}\n{valor}\n")
+
+
+def exportar_dxf(path: str, toolpath: ToolPath, escala: float = 1.0, recorridos: bool = True):
+    """
+    Escribe la secuencia de corte como DXF (R12): cada trazo es una ``POLYLINE`` en la
+    capa ``CORTE``, en el orden de corte y empezando en su perforación. Los
+    desplazamientos en vacío se agregan como ``LINE`` en la capa ``RECORRIDO``.
+
+    :param path: Ruta del archivo ``.dxf``
+    :param toolpath: Secuencia de corte de la plancha
+    :param escala: Factor aplicado a las coordenadas
+    :param recorridos: Incluir los desplazamientos en vacío
+    :return: Cantidad de trazos escritos
+    :rtype: int
+    """
+    with open(path, "w") as f:
+        _dxf(f, (0, "SECTION"), (2, "ENTITIES"))
+        rapidos = toolpath.rapids()
+        for cut, (desde, hasta) in zip(toolpath.cuts, rapidos):
+            if recorridos:
+                _dxf(
+                    f, (0, "LINE"), (8, "RECORRIDO"),
+                    (10, _fmt(desde[0] * escala)), (20, _fmt(desde[1] * escala)),
+                    (11, _fmt(hasta[0] * escala)), (21, _fmt(hasta[1] * escala)),
+                )
+            _dxf(f, (0, "POLYLINE"), (8, "CORTE"), (66, 1), (70, 1 if cut.closed else 0))
+            for x, y in cut.coords:
+                _dxf(f, (0, "VERTEX"), (8, "CORTE"), (10, _fmt(x * escala)), (20, _fmt(y * escala)))
+            _dxf(f, (0, "SEQEND"), (8, "CORTE"))
+        _dxf(f, (0, "ENDSEC"), (0, "EOF"))
+    return len(toolpath.cuts)
+
+
+def exportar_trayectorias_solucion(
+    solution_path: str,
+    path: str,
+    escala: float = 1.0,
+    velocidad: float = 1000.0,
+    linea_comun: float | None = None,
+):
+    """
+    Genera la secuencia de corte de cada plancha de una solución guardada con
+    ``save_solution``. Se escribe un archivo por plancha, con el formato que indica la
+    extensión de ``path`` (``.dxf`` o G-code) y el número de plancha agregado al nombre.
+
+    Con ``linea_comun`` las aristas compartidas por piezas vecinas (a menos de esa
+    distancia) se cortan una sola vez.
+
+    :return: Rutas de los archivos generados
+    :rtype: list[str]
+    """
+    frames, results, _ = load_solution(solution_path)
+    raiz, extension = os.path.splitext(path)
+    rutas = []
+    for i, result in enumerate(results, start=1):
+        ruta = f"{raiz}_plancha{i}{extension}"
+        toolpath = plan_sheet(result, common_line_tolerance=linea_comun)
+        if extension.lower() == ".dxf":
+            exportar_dxf(ruta, toolpath, escala)
+        else:
+            exportar_gcode(ruta, toolpath, escala, velocidad, titulo=f"Plancha {i}")
+        rutas.append(ruta)
+    return rutas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera la secuencia de corte (G-code o DXF) de una solución guardada.")
+    parser.add_argument("solucion", help="Solución guardada (.json o .npz)")
+    parser.add_argument("salida", help="Archivo de salida (.nc, .gcode o .dxf); se genera uno por plancha")
+    parser.add_argument("--escala", type=float, default=1.0, help="Factor de las unidades de la plancha a mm")
+    parser.add_argument("--velocidad", type=float, default=1000.0, help="Velocidad de corte en mm/min")
+    parser.add_argument(
+        "--linea-comun", type=float, default=None, metavar="TOLERANCIA",
+        help="Cortar una sola vez las aristas compartidas (distancia máxima entre ellas)",
+    )
+    args = parser.parse_args(argv)
+    for ruta in exportar_trayectorias_solucion(args.solucion, args.salida, args.escala, args.velocidad, args.linea_comun):
+        print(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from src.models import PolygonPiece
+
+
+# Figuras predeterminadas disponibles, en el orden en que se muestran en la interfaz
+FIGURAS_PREDETERMINADAS = [
+    "rectangulo", "cuadrado", "triangulo", "pentagono", "hexagono",
+    "rombo", "punta", "trapecio", "trapezoide",
+    "trapecio_inclinado", "escalera", "figura_L"
+]
+
+
+def cordenada_forma(name):
+    """
+    Retorna las coordenadas de los vértices para cada tipo de figura predeterminada.
+    Las coordenadas están normalizadas para que todas las figuras tengan un tamaño similar.
+    
+    :param name: Nombre de la figura
+    :type name: str
+    :return: Lista de tuplas (x,y) representando los vértices de la figura
+    :rtype: list[tuple[float, float]]
+    """
+    shapes = {
+        "rectangulo": [(10, 10), (70, 10), (70, 40), (10, 40)],
+        "cuadrado": [(10, 10), (50, 10), (50, 50), (10, 50)],
+        "triangulo": [(30, 5), (55, 50), (5, 50)],
+        "pentagono": [(30, 5), (60, 20), (50, 50), (10, 50), (0, 20)],
+        "hexagono": [(20, 5), (60, 5), (75, 30), (60, 55), (20, 55), (5, 30)],
+        "rombo": [(30, 5), (55, 30), (30, 55), (5, 30)],
+        "punta": [(30, 5), (60, 15), (30, 25), (0, 15)],
+        "trapecio": [(20, 10), (50, 10), (60, 50), (10, 50)],
+        "trapezoide": [(10, 10), (60, 10), (50, 50), (20, 50)],
+        "trapecio_inclinado": [(10, 10), (70, 10), (60, 50), (0, 50)],
+        "escalera": [(10, 10), (40, 10), (40, 25), (70, 25), (70, 50), (10, 50)],
+        "figura_L": [(10, 10), (30, 10), (30, 40), (60, 40), (60, 60), (10, 60)]
+    }
+    return shapes.get(name, [])
+
+
+def crear_pieza(nombre, ancho=None, alto=None, precio_m2=0.0):
+    """
+    Crea una pieza predeterminada escalada al tamaño indicado, igual que lo hace
+    la interfaz al agregar una figura al sistema.
+    Si no se proporcionan dimensiones, se usa un tamaño por defecto.
+
+    :param nombre: Nombre de la figura predeterminada
+    :type nombre: str
+    :param ancho: Ancho deseado de la pieza
+    :type ancho: float or None
+    :param alto: Alto deseado de la pieza
+    :type alto: float or None
+    :param precio_m2: Precio por unidad de área de la plancha
+    :type precio_m2: float
+    :return: Pieza escalada, o None si la figura no existe
+    :rtype: PolygonPiece or None
+    """
+    coords = cordenada_forma(nombre)
+    if not coords:
+        return None
+
+    pieza = PolygonPiece(nombre, coords)
+    # Escalar al tamaño especificado
+    if ancho is not None and alto is not None:
+        pieza.scale_to_size(float(ancho), float(alto))
+    else:
+        pieza.scale_to_size(8, 8)  # Tamaño por defecto
+    pieza.precio_m2 = precio_m2
+    return pieza
+
+
+def cabe_en_plancha(pieza, base_plancha, altura_plancha):
+    """
+    Indica si la pieza, en su posición actual, queda dentro de los límites de la plancha.
+
+    :param pieza: Pieza a validar
+    :type pieza: PolygonPiece
+    :param base_plancha: Base de la plancha
+    :type base_plancha: float
+    :param altura_plancha: Altura de la plancha
+    :type altura_plancha: float
+    :rtype: bool
+    """
+    minx, miny, maxx, maxy = pieza.polygon.bounds
+    return not (maxx > base_plancha or maxy > altura_plancha or minx < 0 or miny < 0)
+
+
+def firma_tipo(pieza, offset=(0.0, 0.0), decimales=6):
+    """
+    Devuelve una firma hashable del tipo de pieza: su nombre y sus vértices
+    relativos al desplazamiento indicado, redondeados para tolerar errores de
+    punto flotante. Dos piezas con la misma firma son intercambiables.
+
+    :param pieza: Pieza a identificar
+    :type pieza: PolygonPiece
+    :param offset: Desplazamiento que se resta a los vértices (por ejemplo, la posición de una colocación)
+    :type offset: tuple[float, float]
+    :param decimales: Decimales usados al redondear
+    :type decimales: int
+    :rtype: tuple
+    """
+    dx, dy = offset
+    return (
+        pieza.name,
+        tuple((round(x - dx, decimales) + 0.0, round(y - dy, decimales) + 0.0) for x, y in pieza.vertices),
+    )
@@ -0,0 +1,213 @@
+import csv
+import os
+import re
+import unicodedata
+
+from src.models import PolygonPiece
+from .helpers import cabe_en_plancha, crear_pieza
+
+
+# Nombres de columna aceptados (sin tildes ni mayúsculas) para cada campo del pedido
+COLUMNAS = {
+    "nombre": ("nombre", "figura", "forma", "tipo"),
+    "vertices": ("vertices", "coordenadas"),
+    "ancho": ("ancho", "base"),
+    "alto": ("alto", "altura"),
+    "cantidad": ("cantidad", "cant", "unidades"),
+    "precio": ("precio", "precio_m2", "precio m2"),
+}
+
+_NUMERO = re.compile(r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return texto.strip().lower()
+
+
+def _mapear_columnas(encabezado: list):
+    """
+    Asocia cada campo del pedido con la posición de su columna en el encabezado.
+
+    :raises ValueError: Si falta la columna de figura y la de vértices
+    """
+    posiciones = {}
+    for i, nombre in enumerate(encabezado):
+        nombre = _normalizar(nombre or "")
+        for campo, alias in COLUMNAS.items():
+            if nombre in alias and campo not in posiciones:
+                posiciones[campo] = i
+    if "nombre" not in posiciones and "vertices" not in posiciones:
+        raise ValueError("El pedido debe tener una columna 'nombre' o 'vertices'.")
+    return posiciones
+
+
+def _filas_csv(path: str):
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        # El separador se deduce del encabezado: en las filas, la columna de
+        # vértices puede contener comas aunque el separador sea otro
+        encabezado = f.readline()
+        f.seek(0)
+        separador = max(",;\t", key=encabezado.count)
+        yield from csv.reader(f, delimiter=separador)
+
+
+def _filas_xlsx(path: str):
+    from openpyxl import load_workbook
+
+    libro = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from libro.worksheets[0].iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer_filas(path: str):
+    """
+    Recorre las filas de un pedido CSV o XLSX sin cargar el archivo completo en memoria
+    (los XLSX se abren con openpyxl en modo de solo lectura).
+
+    :param path: Ruta del archivo ``.csv`` o ``.xlsx``
+    :return: Generador de tuplas ``(numero_de_fila, campos)`` con los campos por nombre;
+        las filas vacías se omiten
+    :rtype: Iterator[tuple[int, dict]]
+    :raises ValueError: Si la extensión no es conocida o falta el encabezado
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        filas = _filas_csv(path)
+    elif extension in (".xlsx", ".xlsm"):
+        filas = _filas_xlsx(path)
+    else:
+        raise ValueError(f"Formato de pedido no soportado: {extension}")
+
+    posiciones = None
+    for numero, fila in enumerate(filas, start=1):
+        if not fila or all(v is None or str(v).strip() == "" for v in fila):
+            continue
+        if posiciones is None:
+            posiciones = _mapear_columnas(fila)
+            continue
+        yield numero, {
+            campo: (fila[i] if i < len(fila) else None)
+            for campo, i in posiciones.items()
+        }
+    if posiciones is None:
+        raise ValueError("El pedido está vacío.")
+
+
+def _numero(valor, campo: str, defecto=None):
+    if valor is None or str(valor).strip() == "":
+        if defecto is None:
+            raise ValueError(f"falta '{campo}'")
+        return defecto
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    try:
+        return float(str(valor).strip().replace(",", "."))
+    except ValueError:
+        raise ValueError(f"'{campo}' no es un número: {valor}")
+
+
+def parsear_vertices(texto: str):
+    """
+    Convierte una lista de vértices escrita como texto (por ejemplo
+    ``"(0,0);(10,0);(10,5)"`` o ``"0 0, 10 0, 10 5"``) en coordenadas.
+
+    :rtype: list[tuple[float, float]]
+    :raises ValueError: Si no hay una cantidad par de números o hay menos de tres vértices
+    """
+    texto = str(texto)
+    # La coma separa coordenadas, así que los decimales se escriben con punto
+    numeros = [float(n) for n in _NUMERO.findall(texto)]
+    if len(numeros) % 2 or len(numeros) < 6:
+        raise ValueError(f"vértices inválidos: {texto}")
+    return list(zip(numeros[0::2], numeros[1::2]))
+
+
+def _pieza_de_fila(campos: dict, precio_m2: float):
+    """
+    Construye la pieza de una fila del pedido y su cantidad.
+
+    :raises ValueError: Con la descripción del problema de la fila
+    """
+    ancho = _numero(campos.get("ancho"), "ancho", defecto=0.0) or None
+    alto = _numero(campos.get("alto"), "alto", defecto=0.0) or None
+    if (ancho is None) != (alto is None):
+        raise ValueError("se deben indicar ancho y alto juntos")
+    if (ancho is not None and ancho <= 0) or (alto is not None and alto <= 0):
+        raise ValueError("ancho y alto deben ser positivos")
+
+    cantidad = _numero(campos.get("cantidad"), "cantidad", defecto=1.0)
+    if cantidad != int(cantidad) or cantidad < 1:
+        raise ValueError(f"cantidad inválida: {campos.get('cantidad')}")
+    precio = _numero(campos.get("precio"), "precio", defecto=precio_m2)
+
+    nombre = str(campos.get("nombre") or "").strip()
+    vertices = campos.get("vertices")
+    if vertices is not None and str(vertices).strip():
+        pieza = PolygonPiece(nombre or "personalizada", parsear_vertices(vertices))
+        if not pieza.polygon.is_valid or pieza.polygon.area <= 0:
+            raise ValueError("los vértices no forman un polígono válido")
+        if ancho is not None:
+            pieza.scale_to_size(ancho, alto)
+        else:
+            # Se lleva al origen, igual que las figuras escaladas
+            minx, miny, maxx, maxy = pieza.polygon.bounds
+            pieza.scale_to_size(maxx - minx, maxy - miny)
+        pieza.precio_m2 = precio
+    else:
+        if not nombre:
+            raise ValueError("falta 'nombre' o 'vertices'")
+        pieza = crear_pieza(nombre, ancho, alto, precio)
+        if pieza is None:
+            raise ValueError(f"figura desconocida: {nombre}")
+    return pieza, int(cantidad)
+
+
+def importar_pedido(path: str, base: float | None = None, altura: float | None = None, precio_m2: float = 0.0):
+    """
+    Lee un pedido CSV o XLSX y devuelve sus tipos de pieza con la cantidad de cada uno.
+
+    Cada fila describe un tipo de pieza: una figura predeterminada (columna ``nombre``)
+    o una lista de vértices (columna ``vertices``), con ``ancho`` y ``alto`` opcionales,
+    ``cantidad`` (1 por defecto) y ``precio`` por m² (``precio_m2`` por defecto).
+    Las filas con problemas no detienen la lectura: se informan todas juntas.
+
+    :param path: Ruta del pedido
+    :param base: Base de la plancha; si se indica junto a ``altura``, se rechazan las
+        piezas que no caben
+    :param altura: Altura de la plancha
+    :param precio_m2: Precio por m² usado cuando la fila no indica precio
+    :return: Tupla ``(tipos, errores)`` con ``tipos`` como lista de ``(pieza, cantidad)``
+        y ``errores`` como mensajes ``"Fila N: ..."``
+    :rtype: tuple[list[tuple[PolygonPiece, int]], list[str]]
+    :raises ValueError: Si el archivo no tiene un formato o encabezado válido
+    """
+    tipos, errores = [], []
+    for numero, campos in leer_filas(path):
+        try:
+            pieza, cantidad = _pieza_de_fila(campos, precio_m2)
+        except ValueError as e:
+            errores.append(f"Fila {numero}: {e}")
+            continue
+        if base is not None and altura is not None and not cabe_en_plancha(pieza, base, altura):
+            errores.append(f"Fila {numero}: la pieza '{pieza.name}' excede la plancha ({base} x {altura})")
+            continue
+        tipos.append((pieza, cantidad))
+    return tipos, errores
+
+
+def expandir_tipos(tipos: list[tuple[PolygonPiece, int]]):
+    """
+    Crea una pieza independiente por cada unidad pedida de cada tipo.
+
+    :rtype: list[PolygonPiece]
+    """
+    piezas = []
+    for tipo, cantidad in tipos:
+        for _ in range(cantidad):
+            pieza = PolygonPiece(tipo.name, list(tipo.vertices))
+            pieza.precio_m2 = getattr(tipo, "precio_m2", 0.0)
+            piezas.append(pieza)
+    return piezas
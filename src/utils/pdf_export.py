@@ -0,0 +1,507 @@
+import hashlib
+import io
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from src.core.costing import CostIndex
+from src.models import Frame, PolygonPiece
+from .helpers import firma_tipo
+
+
+# Mismos colores que PlacementVisualizer
+SHEET_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
+THUMBNAIL_COLOR = "#CCCCCC"
+THUMBNAIL_SIZE = 1 * cm
+LABEL_FONT_SIZE = 6
+# Planchas por bloque: cada bloque se arma en memoria con reportlab y se vuelca al
+# archivo apenas se completa, así que la memoria no crece con la cantidad de planchas
+SHEETS_PER_CHUNK = 25
+
+
+def _piece_label(piece: PolygonPiece):
+    return getattr(piece, "etiqueta", piece.name)
+
+
+def _type_key(piece: PolygonPiece):
+    """
+    Nombre del XObject de la miniatura: la misma forma (firma relativa a su esquina
+    inferior izquierda) comparte una sola miniatura en todo el documento.
+    """
+    minx, miny, _, _ = piece.polygon.bounds
+    firma = firma_tipo(piece, (minx, miny))
+    return "tipo_" + hashlib.sha1(repr(firma).encode()).hexdigest()[:16]
+
+
+def _coords(polygon):
+    return [(float(x), float(y)) for x, y in list(polygon.exterior.coords)[:-1]]
+
+
+def preparar_pagina(indice: int, frame: Frame, result: dict, costos: list[float] | None = None, precio_m2: float = 0.0):
+    """
+    Convierte una plancha en una lista de dibujo: solo datos simples (coordenadas,
+    textos y números), sin objetos de reportlab ni de shapely.
+
+    :param indice: Posición de la plancha (empezando en 0)
+    :param frame: Marco de la plancha
+    :param result: Resultado del solver para la plancha
+    :param costos: Costo de cada colocación, en el mismo orden que ``result["placements"]``
+    :param precio_m2: Precio por m² de la plancha
+    :rtype: dict
+    """
+    placements = result["placements"] or []
+    not_placed = result["not_placed"] or []
+    costos = costos if costos is not None else [0.0] * len(placements)
+    total_area = frame.width * frame.height
+
+    piezas, filas, tipos = [], [], {}
+    for i, (p, costo) in enumerate(zip(placements, costos)):
+        poly = p.piece.polygon
+        centroid = poly.centroid
+        piezas.append({
+            "coords": _coords(poly),
+            "color": SHEET_COLORS[i % len(SHEET_COLORS)],
+            "etiqueta": _piece_label(p.piece),
+            "centro": (centroid.x, centroid.y),
+        })
+        minx, miny, maxx, maxy = poly.bounds
+        tipo = _type_key(p.piece)
+        if tipo not in tipos:
+            original = p.source if p.source is not None else p.piece
+            tipos[tipo] = {
+                "coords": [(x - minx, y - miny) for x, y in _coords(poly)],
+                "ancho": maxx - minx,
+                "alto": maxy - miny,
+                "color": getattr(original, "color", THUMBNAIL_COLOR),
+            }
+        filas.append({
+            "nombre": p.piece.name,
+            "dimension": (maxx - minx, maxy - miny),
+            "area": poly.area,
+            "costo": costo,
+            "tipo": tipo,
+        })
+
+    # Piezas no colocadas apiladas a la derecha del marco, como en PlacementVisualizer
+    sin_colocar = []
+    offset_x = frame.polygon.bounds[2] + 10
+    offset_y = 0
+    for piece in not_placed:
+        minx, miny, maxx, maxy = piece.polygon.bounds
+        coords = [(x + offset_x, y + offset_y) for x, y in _coords(piece.polygon)]
+        centroid = piece.polygon.centroid
+        sin_colocar.append({
+            "coords": coords,
+            "etiqueta": _piece_label(piece),
+            "centro": (centroid.x + offset_x, centroid.y + offset_y),
+        })
+        offset_y += maxy - miny + 5
+
+    xs = [x for item in piezas + sin_colocar for x, _ in item["coords"]]
+    ys = [y for item in piezas + sin_colocar for _, y in item["coords"]]
+    fminx, fminy, fmaxx, fmaxy = frame.polygon.bounds
+    extension = (
+        min(xs + [fminx]),
+        min(ys + [fminy]),
+        max(xs + [fmaxx]),
+        max(ys + [fmaxy]),
+    )
+
+    return {
+        "indice": indice,
+        "marco": _coords(frame.polygon),
+        "extension": extension,
+        "piezas": piezas,
+        "sin_colocar": sin_colocar,
+        "tipos": tipos,
+        "filas": filas,
+        "base": frame.width,
+        "altura": frame.height,
+        "area_total": total_area,
+        "desperdicio": result["waste"],
+        "aprovechamiento": (1 - result["waste"] / total_area) * 100,
+        "costo_total": sum(costos),
+        "colocadas": len(placements),
+        "no_colocadas": len(not_placed),
+        "precio_m2": precio_m2,
+    }
+
+
+_REF = re.compile(rb"(\d+) 0 R")
+
+
+def _pdf_objects(data: bytes):
+    """
+    Objetos de un PDF generado por reportlab (tabla xref clásica, un solo árbol de
+    páginas plano).
+
+    :return: Tupla ``(objetos, catalogo, paginas)``: ``objetos`` es ``{numero: cuerpo}``
+        sin el encabezado ``n 0 obj`` ni ``endobj``; ``paginas`` es el número del nodo
+        ``/Pages`` y ``kids`` no se resuelve aquí
+    :rtype: tuple[dict[int, bytes], int, int]
+    :raises ValueError: Si el PDF no tiene la estructura esperada
+    """
+    fin = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", data)
+    cabecera = fin and re.compile(rb"xref\s+0\s+(\d+)\s+").match(data, int(fin.group(1)))
+    if not cabecera:
+        raise ValueError("PDF sin tabla xref clásica; no se puede concatenar")
+    inicio_xref = int(fin.group(1))
+    total = int(cabecera.group(1))
+    entradas = data[cabecera.end():cabecera.end() + 20 * total]
+    offsets = {}
+    for numero in range(1, total):
+        entrada = entradas[20 * numero:20 * numero + 20]
+        if entrada[17:18] == b"n":
+            offsets[numero] = int(entrada[:10])
+    # Cada objeto termina donde empieza el siguiente (los streams ASCII85 pueden
+    # contener la palabra "endobj")
+    limites = sorted(offsets.values()) + [inicio_xref]
+    siguiente = {a: b for a, b in zip(limites, limites[1:])}
+    objetos = {}
+    for numero, offset in offsets.items():
+        cuerpo = data[offset:siguiente[offset]]
+        cuerpo = cuerpo[cuerpo.index(b"obj") + 3:cuerpo.rindex(b"endobj")]
+        objetos[numero] = cuerpo.strip(b"\r\n")
+    raiz = re.search(rb"/Root (\d+) 0 R", data[cabecera.end() + 20 * total:])
+    nodo = raiz and re.search(rb"/Pages (\d+) 0 R", objetos.get(int(raiz.group(1)), b""))
+    if not nodo or not re.search(rb"/Kids \[[^\]]*\]", objetos.get(int(nodo.group(1)), b"")):
+        raise ValueError("PDF sin un árbol de páginas plano; no se puede concatenar")
+    return objetos, int(raiz.group(1)), int(nodo.group(1))
+
+
+class _PdfConcatenator:
+    """
+    Concatena en un archivo los PDF de reportlab de cada bloque de planchas. Los
+    objetos de cada bloque se renumeran y se escriben apenas llega el bloque; al
+    final solo se agregan el árbol de páginas, el catálogo y la tabla xref. El
+    documento usa la versión de PDF de los bloques (reportlab declara 1.4, necesaria
+    para la transparencia de las piezas).
+    """
+
+    # Números reservados para el árbol de páginas y el catálogo del documento
+    PAGES, CATALOG = 1, 2
+
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+        self.offsets = {}
+        self.kids = []
+        self.next_number = 3
+
+    def _header(self, version: bytes = b"%PDF-1.4"):
+        if self.file.tell() == 0:
+            self.file.write(version + b"\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, numero: int, cuerpo: bytes):
+        self.offsets[numero] = self.file.tell()
+        self.file.write(b"%d 0 obj\n" % numero + cuerpo + b"\nendobj\n")
+
+    def append(self, data: bytes):
+        objetos, catalogo, paginas = _pdf_objects(data)
+        self._header(data[:data.index(b"\n")].rstrip(b"\r"))
+        base = self.next_number - 1
+
+        def renumerar(m):
+            numero = int(m.group(1))
+            return b"%d 0 R" % (self.PAGES if numero == paginas else numero + base)
+
+        for numero in sorted(objetos):
+            if numero in (catalogo, paginas):
+                continue
+            cuerpo = objetos[numero]
+            # Las referencias solo aparecen en el diccionario, no en el stream
+            corte = re.search(rb">>\s*stream\r?\n", cuerpo)
+            if corte:
+                cuerpo = _REF.sub(renumerar, cuerpo[:corte.start()]) + cuerpo[corte.start():]
+            else:
+                cuerpo = _REF.sub(renumerar, cuerpo)
+            self._write(numero + base, cuerpo)
+        kids = re.search(rb"/Kids \[([^\]]*)\]", objetos[paginas]).group(1)
+        self.kids.extend(int(k) + base for k in _REF.findall(kids))
+        self.next_number = max(objetos) + base + 1
+
+    def close(self):
+        self._header()
+        kids = b" ".join(b"%d 0 R" % k for k in self.kids)
+        self._write(self.PAGES, b"<<\n/Count %d /Kids [ %s ] /Type /Pages\n>>" % (len(self.kids), kids))
+        self._write(self.CATALOG, b"<<\n/PageMode /UseNone /Pages %d 0 R /Type /Catalog\n>>" % self.PAGES)
+        inicio_xref = self.file.tell()
+        self.file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.next_number)
+        for numero in range(1, self.next_number):
+            if numero in self.offsets:
+                self.file.write(b"%010d 00000 n \n" % self.offsets[numero])
+            else:
+                self.file.write(b"0000000000 65535 f \n")
+        self.file.write(
+            b"trailer\n<<\n/Root %d 0 R /Size %d\n>>\nstartxref\n%d\n%%%%EOF\n"
+            % (self.CATALOG, self.next_number, inicio_xref)
+        )
+        self.file.close()
+
+
+class PdfSheetWriter:
+    """
+    Escribe planchas en un PDF como gráficos vectoriales de reportlab.
+
+    Las piezas se dibujan como trayectos a partir de su geometría, y la miniatura de
+    cada tipo de pieza se define una sola vez por bloque como XObject de formulario y
+    se reutiliza en todas las filas y páginas del bloque.
+
+    reportlab guarda todas las páginas de un documento hasta ``save()``, así que las
+    planchas se escriben en bloques de ``sheets_per_chunk``: cada bloque es un PDF en
+    memoria que se vuelca al archivo al completarse. La memoria queda acotada por el
+    tamaño de un bloque, sin importar cuántas planchas tenga el documento.
+
+    :var pagesize: Tamaño de página
+    :vartype pagesize: tuple[float, float]
+    """
+
+    def __init__(self, path: str, pagesize: tuple[float, float] = A4, sheets_per_chunk: int = SHEETS_PER_CHUNK):
+        """
+        :param path: Ruta del PDF a generar
+        :type path: str
+        :param pagesize: Tamaño de página
+        :type pagesize: tuple[float, float]
+        :param sheets_per_chunk: Planchas por bloque en memoria
+        :type sheets_per_chunk: int
+        """
+        self.pagesize = pagesize
+        self.sheets_per_chunk = max(1, sheets_per_chunk)
+        self._output = _PdfConcatenator(path)
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self._buffer = io.BytesIO()
+        self.canvas = canvas.Canvas(self._buffer, pagesize=self.pagesize)
+        self._forms = set()
+        self._sheets = 0
+
+    def _flush_chunk(self):
+        if self._sheets:
+            self.canvas.save()
+            self._output.append(self._buffer.getvalue())
+
+    def _path(self, coords):
+        path = self.canvas.beginPath()
+        path.moveTo(*coords[0])
+        for x, y in coords[1:]:
+            path.lineTo(x, y)
+        path.close()
+        return path
+
+    def _define_thumbnail(self, tipo: str, datos: dict):
+        """
+        Define (una sola vez por documento) la miniatura de un tipo de pieza,
+        escalada a un cuadrado de ``THUMBNAIL_SIZE``.
+        """
+        if tipo in self._forms:
+            return
+        c = self.canvas
+        c.beginForm(tipo, 0, 0, THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        escala = 0.9 * THUMBNAIL_SIZE / max(datos["ancho"], datos["alto"], 1e-9)
+        dx = (THUMBNAIL_SIZE - datos["ancho"] * escala) / 2
+        dy = (THUMBNAIL_SIZE - datos["alto"] * escala) / 2
+        coords = [(dx + x * escala, dy + y * escala) for x, y in datos["coords"]]
+        c.setFillColor(colors.HexColor(datos["color"]))
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(0.3)
+        c.drawPath(self._path(coords), stroke=1, fill=1)
+        c.endForm()
+        self._forms.add(tipo)
+
+    def _draw_sheet(self, pagina: dict, x0: float, y0: float, ancho: float, alto: float):
+        """
+        Dibuja el marco, las piezas colocadas y las no colocadas dentro del recuadro indicado.
+        """
+        c = self.canvas
+        minx, miny, maxx, maxy = pagina["extension"]
+        escala = min(ancho / max(maxx - minx, 1e-9), alto / max(maxy - miny, 1e-9))
+        # Centrar el dibujo en el recuadro
+        ox = x0 + (ancho - (maxx - minx) * escala) / 2 - minx * escala
+        oy = y0 + (alto - (maxy - miny) * escala) / 2 - miny * escala
+
+        def transformar(coords):
+            return [(ox + x * escala, oy + y * escala) for x, y in coords]
+
+        c.saveState()
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(0.4)
+        c.setFillAlpha(0.6)
+        for pieza in pagina["piezas"]:
+            c.setFillColor(colors.HexColor(pieza["color"]))
+            c.drawPath(self._path(transformar(pieza["coords"])), stroke=1, fill=1)
+
+        c.setStrokeColor(colors.red)
+        c.setDash(3, 2)
+        for pieza in pagina["sin_colocar"]:
+            c.drawPath(self._path(transformar(pieza["coords"])), stroke=1, fill=0)
+        c.setDash()
+
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1.5)
+        c.drawPath(self._path(transformar(pagina["marco"])), stroke=1, fill=0)
+        c.restoreState()
+
+        # Etiquetas solo donde caben dentro de la pieza
+        c.setFont("Helvetica", LABEL_FONT_SIZE)
+        for grupo, color in ((pagina["piezas"], colors.black), (pagina["sin_colocar"], colors.red)):
+            c.setFillColor(color)
+            for pieza in grupo:
+                xs = [x for x, _ in pieza["coords"]]
+                if stringWidth(pieza["etiqueta"], "Helvetica", LABEL_FONT_SIZE) > (max(xs) - min(xs)) * escala:
+                    continue
+                cx, cy = pieza["centro"]
+                c.drawCentredString(ox + cx * escala, oy + cy * escala - LABEL_FONT_SIZE / 3, pieza["etiqueta"])
+        c.setFillColor(colors.black)
+
+    def _table_header(self, y: float, titulo: str):
+        c = self.canvas
+        ancho_pagina, _ = self.pagesize
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(2*cm, y, titulo)
+        y -= 0.7*cm
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(2*cm, y, "Pieza")
+        c.drawString(4*cm, y, "Dimensión")
+        c.drawString(7*cm, y, "Área")
+        c.drawString(10*cm, y, "Costo")
+        c.drawString(13*cm, y, "Imagen")
+        y -= 0.7*cm
+        c.line(2*cm, y + 0.2*cm, ancho_pagina - 2*cm, y + 0.2*cm)
+        return y - 0.5*cm
+
+    def write_page(self, pagina: dict):
+        """
+        Escribe una plancha preparada con ``preparar_pagina`` (encabezado, dibujo,
+        estadísticas y tabla de piezas, que continúa en páginas nuevas si no cabe).
+        """
+        c = self.canvas
+        ancho_pagina, alto_pagina = self.pagesize
+        for tipo, datos in pagina["tipos"].items():
+            self._define_thumbnail(tipo, datos)
+
+        # --- Encabezado ---
+        c.setFont("Helvetica-Bold", 16)
+        c.drawCentredString(
+            ancho_pagina/2, alto_pagina - 2*cm,
+            f"Plancha {pagina['indice']+1} - Aprovechamiento: {pagina['aprovechamiento']:.2f}%",
+        )
+
+        # --- Dibujo de la plancha ---
+        img_width = 14*cm
+        img_height = min(14*cm, alto_pagina - 6*cm)
+        img_x = (ancho_pagina - img_width) / 2
+        img_y = alto_pagina - 5*cm - img_height
+        self._draw_sheet(pagina, img_x, img_y, img_width, img_height)
+
+        # --- Estadísticas debajo del dibujo ---
+        total_area = pagina["area_total"]
+        desperdicio = pagina["desperdicio"]
+        precio_m2 = pagina["precio_m2"]
+        y = img_y - 1.5*cm
+        c.setFont("Helvetica", 10)
+        c.drawString(2*cm, y, f"● Dimensiones: {pagina['base']:.2f}m x {pagina['altura']:.2f}m")
+        c.drawString(ancho_pagina/2, y, f"● Área utilizada: {total_area - desperdicio:.2f}m² de {total_area:.2f}m²")
+        y -= 0.7*cm
+        c.drawString(2*cm, y, f"● Piezas colocadas: {pagina['colocadas']}")
+        c.drawString(ancho_pagina/2, y, f"● Piezas no colocadas: {pagina['no_colocadas']}")
+        y -= 0.7*cm
+        c.drawString(2*cm, y, f"● Desperdicio: {desperdicio:.2f}m² ({desperdicio/total_area*100:.2f}%)")
+        c.drawString(ancho_pagina/2, y, f"● Costo total: {pagina['costo_total']:.2f} Bs.")
+        y -= 0.7*cm
+        c.drawString(2*cm, y, f"● Precio plancha por m²: {precio_m2:.2f} Bs.")
+        c.drawString(ancho_pagina/2, y, f"● Precio total de la plancha: {precio_m2*total_area:.2f} Bs.")
+        y -= 1.5*cm
+
+        # --- Tabla de piezas (solo si hay piezas) ---
+        filas = pagina["filas"]
+        if filas:
+            y = self._table_header(y, "Detalle de todas las piezas colocadas:")
+            for i, fila in enumerate(filas):
+                ancho, alto = fila["dimension"]
+                c.setFont("Helvetica", 10)
+                c.drawString(2*cm, y, fila["nombre"])
+                c.drawString(4*cm, y, f"{ancho:.2f} x {alto:.2f}")
+                c.drawString(7*cm, y, f"{fila['area']:.2f}")
+                c.drawString(10*cm, y, f"{fila['costo']:.2f} Bs.")
+                c.saveState()
+                c.translate(13*cm, y - 0.5*cm)
+                c.doForm(fila["tipo"])
+                c.restoreState()
+                y -= 0.7*cm
+
+                # Nueva página si no hay espacio
+                if y < 2*cm and i < len(filas) - 1:
+                    c.showPage()
+                    y = self._table_header(alto_pagina - 2*cm, "Detalle de piezas (continuación):")
+
+        c.showPage()
+        self._sheets += 1
+        if self._sheets >= self.sheets_per_chunk:
+            self._flush_chunk()
+            self._new_chunk()
+
+    def close(self):
+        """
+        Vuelca el último bloque y termina el documento.
+        """
+        self._flush_chunk()
+        self._output.close()
+
+
+def _pages(sheets, costing, precio_m2):
+    for i, (frame, result) in enumerate(sheets):
+        costos = costing.sheet(frame, result)["costos"].tolist()
+        yield i, frame, result, costos, precio_m2
+
+
+def exportar_pdf(path: str, sheets, costing: CostIndex | None = None, precio_m2: float = 0.0, workers: int = 0, progreso=None):
+    """
+    Exporta un PDF vectorial con una página (o más, si la tabla no cabe) por plancha.
+
+    Con ``workers`` mayor que 0 las listas de dibujo se preparan en un pool de
+    procesos, con a lo sumo ``2 * workers`` planchas en vuelo, y se escriben en orden
+    a medida que terminan. Las páginas escritas se vuelcan al archivo en bloques
+    (ver ``PdfSheetWriter``), así que la memoria no depende de la cantidad de planchas.
+
+    :param path: Ruta del PDF a generar
+    :param sheets: Iterable de tuplas ``(frame, result)``; puede ser un generador,
+        las planchas se escriben a medida que llegan
+    :param costing: Índice de costos de las piezas; por defecto, cada pieza usa su
+        propio ``precio_m2``. Los costos se calculan en el proceso que llama
+    :param precio_m2: Precio por m² de la plancha
+    :param workers: Procesos para preparar las páginas (0 para hacerlo en el proceso actual)
+    :param progreso: Función llamada con la cantidad de planchas escritas tras cada una
+    :return: Cantidad de planchas escritas
+    :rtype: int
+    """
+    costing = costing or CostIndex([], precio_m2)
+    writer = PdfSheetWriter(path)
+    n = 0
+
+    def escribir(pagina):
+        nonlocal n
+        writer.write_page(pagina)
+        n += 1
+        if progreso:
+            progreso(n)
+
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pendientes = deque()
+            for args in _pages(sheets, costing, precio_m2):
+                pendientes.append(executor.submit(preparar_pagina, *args))
+                if len(pendientes) >= 2 * workers:
+                    escribir(pendientes.popleft().result())
+            while pendientes:
+                escribir(pendientes.popleft().result())
+    else:
+        for args in _pages(sheets, costing, precio_m2):
+            escribir(preparar_pagina(*args))
+    writer.close()
+    return n
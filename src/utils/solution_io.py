@@ -0,0 +1,232 @@
+import json
+
+import numpy as np
+
+from src.models import Frame, Placement, PolygonPiece
+from .helpers import firma_tipo
+
+
+FORMAT_NAME = "simulador-cortes/solucion"
+FORMAT_VERSION = 1
+
+
+def _piece_label(piece: PolygonPiece):
+    return getattr(piece, "etiqueta", piece.name)
+
+
+class _TypeTable:
+    """
+    Tabla de tipos de pieza: cada geometría distinta (nombre + vértices en el origen)
+    con su precio se guarda una sola vez y las colocaciones la referencian por índice.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.types = []
+
+    def add(self, piece: PolygonPiece, offset: tuple[float, float]):
+        dx, dy = offset
+        vertices = [(x - dx, y - dy) for x, y in piece.vertices]
+        precio = getattr(piece, "precio_m2", 0)
+        key = (firma_tipo(piece, offset), precio)
+        idx = self.index.get(key)
+        if idx is None:
+            idx = len(self.types)
+            self.index[key] = idx
+            self.types.append({
+                "nombre": piece.name,
+                "vertices": [list(v) for v in vertices],
+                "precio_m2": precio,
+            })
+        return idx
+
+
+def _columns(frames: list[Frame], results: list[dict]):
+    """
+    Convierte las planchas en columnas paralelas (una entrada por colocación).
+    """
+    table = _TypeTable()
+    sheets = []
+    for frame, result in zip(frames, results):
+        placements = result["placements"] or []
+        not_placed = result["not_placed"] or []
+        sheets.append({
+            "base": frame.width,
+            "altura": frame.height,
+            "desperdicio": result["waste"],
+            "colocaciones": {
+                "tipo": [table.add(p.piece, p.position) for p in placements],
+                "x": [float(p.position[0]) for p in placements],
+                "y": [float(p.position[1]) for p in placements],
+                "rotacion": [float(p.rotation) for p in placements],
+                "etiqueta": [_piece_label(p.piece) for p in placements],
+            },
+            "no_colocadas": {
+                "tipo": [table.add(p, (0.0, 0.0)) for p in not_placed],
+                "etiqueta": [_piece_label(p) for p in not_placed],
+            },
+        })
+    return table.types, sheets
+
+
+def save_solution(path: str, frames: list[Frame], results: list[dict], precio_m2: float = 0.0, extra: dict | None = None):
+    """
+    Guarda una solución completa (todas las planchas y colocaciones) para poder
+    recargarla sin volver a ejecutar el solver.
+
+    Si la ruta termina en ``.npz`` se usa la variante binaria columnar (numpy
+    comprimido), pensada para trabajos grandes; en otro caso se escribe JSON.
+    Cada geometría distinta se guarda una sola vez en la tabla de tipos (ya con su
+    orientación aplicada) y cada colocación guarda solo tipo, desplazamiento,
+    rotación y etiqueta.
+
+    :param path: Ruta del archivo de salida
+    :type path: str
+    :param frames: Planchas de la solución
+    :type frames: list[Frame]
+    :param results: Resultado del solver por plancha
+    :type results: list[dict]
+    :param precio_m2: Precio por unidad de área de la plancha
+    :type precio_m2: float
+    :param extra: Datos adicionales (por ejemplo, un resumen) que se guardan tal cual
+    :type extra: dict or None
+    """
+    types, sheets = _columns(frames, results)
+    meta = {
+        "formato": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "plancha": {
+            "base": frames[0].width if frames else 0.0,
+            "altura": frames[0].height if frames else 0.0,
+            "precio_m2": precio_m2,
+        },
+    }
+    if extra:
+        meta["extra"] = extra
+
+    if path.endswith(".npz"):
+        _save_npz(path, meta, types, sheets)
+        return
+
+    datos = dict(meta)
+    datos["tipos"] = types
+    datos["planchas"] = sheets
+    with open(path, "w") as f:
+        json.dump(datos, f, separators=(",", ":"))
+
+
+def _save_npz(path: str, meta: dict, types: list[dict], sheets: list[dict]):
+    type_sizes = [len(t["vertices"]) for t in types]
+    type_coords = [v for t in types for v in t["vertices"]]
+
+    def columna(grupo, campo, dtype):
+        return np.array([v for s in sheets for v in s[grupo][campo]], dtype=dtype)
+
+    np.savez_compressed(
+        path,
+        meta=np.array(json.dumps(meta)),
+        type_names=np.array([t["nombre"] for t in types], dtype=str),
+        type_prices=np.array([t["precio_m2"] for t in types], dtype=np.float64),
+        type_offsets=np.concatenate([[0], np.cumsum(type_sizes)]).astype(np.int64),
+        type_coords=np.array(type_coords, dtype=np.float64).reshape(-1, 2),
+        sheet_dims=np.array([[s["base"], s["altura"]] for s in sheets], dtype=np.float64).reshape(-1, 2),
+        sheet_waste=np.array([s["desperdicio"] for s in sheets], dtype=np.float64),
+        placed_count=np.array([len(s["colocaciones"]["tipo"]) for s in sheets], dtype=np.int64),
+        placed_type=columna("colocaciones", "tipo", np.int64),
+        placed_x=columna("colocaciones", "x", np.float64),
+        placed_y=columna("colocaciones", "y", np.float64),
+        placed_rot=columna("colocaciones", "rotacion", np.float64),
+        placed_label=columna("colocaciones", "etiqueta", str),
+        missing_count=np.array([len(s["no_colocadas"]["tipo"]) for s in sheets], dtype=np.int64),
+        missing_type=columna("no_colocadas", "tipo", np.int64),
+        missing_label=columna("no_colocadas", "etiqueta", str),
+    )
+
+
+def _load_npz(path: str):
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        offsets = data["type_offsets"]
+        coords = data["type_coords"].tolist()
+        types = [
+            {"nombre": str(nombre), "vertices": coords[offsets[i]:offsets[i + 1]], "precio_m2": float(precio)}
+            for i, (nombre, precio) in enumerate(zip(data["type_names"], data["type_prices"]))
+        ]
+
+        sheets = []
+        p0 = m0 = 0
+        for (base, altura), waste, n_p, n_m in zip(
+            data["sheet_dims"].tolist(), data["sheet_waste"].tolist(),
+            data["placed_count"].tolist(), data["missing_count"].tolist(),
+        ):
+            p1, m1 = p0 + n_p, m0 + n_m
+            sheets.append({
+                "base": base,
+                "altura": altura,
+                "desperdicio": waste,
+                "colocaciones": {
+                    "tipo": data["placed_type"][p0:p1].tolist(),
+                    "x": data["placed_x"][p0:p1].tolist(),
+                    "y": data["placed_y"][p0:p1].tolist(),
+                    "rotacion": data["placed_rot"][p0:p1].tolist(),
+                    "etiqueta": data["placed_label"][p0:p1].tolist(),
+                },
+                "no_colocadas": {
+                    "tipo": data["missing_type"][m0:m1].tolist(),
+                    "etiqueta": data["missing_label"][m0:m1].tolist(),
+                },
+            })
+            p0, m0 = p1, m1
+    return meta, types, sheets
+
+
+def load_solution(path: str):
+    """
+    Carga una solución guardada con ``save_solution`` y reconstruye las planchas,
+    colocaciones y piezas no colocadas, listas para visualizar o exportar.
+
+    :param path: Ruta del archivo (JSON o ``.npz``)
+    :type path: str
+    :return: Tupla ``(frames, results, meta)``; ``meta`` contiene la plancha y los datos extra
+    :rtype: tuple[list[Frame], list[dict], dict]
+    :raises ValueError: Si el archivo no es una solución o su versión no es compatible
+    """
+    if path.endswith(".npz"):
+        meta, types, sheets = _load_npz(path)
+    else:
+        with open(path, "r") as f:
+            datos = json.load(f)
+        meta = {k: v for k, v in datos.items() if k not in ("tipos", "planchas")}
+        types, sheets = datos.get("tipos"), datos.get("planchas")
+
+    if meta.get("formato") != FORMAT_NAME or types is None or sheets is None:
+        raise ValueError("El archivo no contiene una solución guardada.")
+    if meta.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Versión de solución no soportada: {meta.get('version')}")
+
+    def instancia(tipo_idx, etiqueta, dx=0.0, dy=0.0):
+        tipo = types[tipo_idx]
+        pieza = PolygonPiece(tipo["nombre"], [(vx + dx, vy + dy) for vx, vy in tipo["vertices"]])
+        pieza.precio_m2 = tipo["precio_m2"]
+        pieza.etiqueta = etiqueta
+        return pieza
+
+    frames = []
+    results = []
+    for sheet in sheets:
+        frame = Frame(sheet["base"], sheet["altura"])
+        cols = sheet["colocaciones"]
+        placements = []
+        for tipo_idx, x, y, rot, etiqueta in zip(cols["tipo"], cols["x"], cols["y"], cols["rotacion"], cols["etiqueta"]):
+            placements.append(Placement(instancia(tipo_idx, etiqueta, x, y), frame, (x, y), rot))
+
+        faltantes = sheet["no_colocadas"]
+        not_placed = [instancia(t, e) for t, e in zip(faltantes["tipo"], faltantes["etiqueta"])]
+        frames.append(frame)
+        results.append({
+            "placements": placements,
+            "not_placed": not_placed,
+            "waste": sheet["desperdicio"],
+        })
+
+    return frames, results, meta
@@ -0,0 +1,120 @@
+import argparse
+
+from openpyxl import Workbook
+
+from src.core.costing import CostIndex
+from .solution_io import load_solution
+
+
+PLANCHA_COLUMNS = ["Etiqueta", "Tipo", "X", "Y", "Rotación", "Área", "Costo"]
+SUMMARY_COLUMNS = [
+    "Plancha",
+    "Base",
+    "Altura",
+    "Piezas colocadas",
+    "Piezas no colocadas",
+    "Área usada",
+    "Desperdicio",
+    "Aprovechamiento (%)",
+    "Costo piezas",
+    "Precio plancha",
+]
+
+
+def _piece_label(piece):
+    return getattr(piece, "etiqueta", piece.name)
+
+
+def exportar_xlsx(path: str, sheets, costing: CostIndex | None = None, precio_m2: float = 0.0):
+    """
+    Exporta la lista de cortes a Excel: una hoja por plancha con cada pieza colocada
+    (etiqueta, tipo, posición, rotación, área y costo) y una hoja ``Resumen`` con
+    aprovechamiento, desperdicio y costo por plancha.
+
+    Usa el modo de solo escritura de openpyxl: las filas se escriben a medida que se
+    generan y no se guardan en memoria, así que el consumo no depende de la
+    cantidad de piezas.
+
+    :param path: Ruta del archivo ``.xlsx``
+    :param sheets: Iterable de tuplas ``(frame, result)``; puede ser un generador
+    :param costing: Índice de costos de las piezas; por defecto, cada pieza usa su
+        propio ``precio_m2``
+    :param precio_m2: Precio por m² de la plancha
+    :return: Cantidad de planchas exportadas
+    :rtype: int
+    """
+    costing = costing or CostIndex([], precio_m2)
+    libro = Workbook(write_only=True)
+    resumen = libro.create_sheet("Resumen")
+    resumen.append(SUMMARY_COLUMNS)
+
+    n = 0
+    totales = [0, 0.0, 0.0, 0.0, 0.0]
+    for i, (frame, result) in enumerate(sheets):
+        hoja = libro.create_sheet(f"Plancha {i+1}")
+        hoja.append(PLANCHA_COLUMNS)
+        datos = costing.sheet(frame, result)
+        for p, area, costo in zip(result["placements"], datos["areas"].tolist(), datos["costos"].tolist()):
+            hoja.append([
+                _piece_label(p.piece),
+                p.piece.name,
+                float(p.position[0]),
+                float(p.position[1]),
+                float(p.rotation),
+                area,
+                costo,
+            ])
+
+        fila = [
+            i + 1,
+            frame.width,
+            frame.height,
+            datos["colocadas"],
+            datos["no_colocadas"],
+            datos["area_usada"],
+            datos["desperdicio"],
+            datos["aprovechamiento"],
+            datos["costo"],
+            datos["precio_plancha"],
+        ]
+        resumen.append(fila)
+        for j, valor in enumerate((fila[3], fila[5], fila[6], fila[8], fila[9])):
+            totales[j] += valor
+        n += 1
+
+    if n:
+        colocadas, usada, desperdicio, costo_piezas, precio_planchas = totales
+        # Las no colocadas de cada plancha pasan a la siguiente: solo cuentan las de la última
+        resumen.append([
+            "Total", None, None, colocadas, fila[4], usada, desperdicio,
+            usada / (usada + desperdicio) * 100 if usada + desperdicio else 0.0,
+            costo_piezas, precio_planchas,
+        ])
+    libro.save(path)
+    return n
+
+
+def exportar_xlsx_solucion(solution_path: str, path: str):
+    """
+    Exporta a Excel una solución guardada con ``save_solution``, sin ejecutar el solver.
+
+    :param solution_path: Ruta de la solución (``.json`` o ``.npz``)
+    :param path: Ruta del archivo ``.xlsx``
+    :return: Cantidad de planchas exportadas
+    :rtype: int
+    """
+    frames, results, meta = load_solution(solution_path)
+    return exportar_xlsx(path, zip(frames, results), precio_m2=meta["plancha"].get("precio_m2", 0.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta a Excel la lista de cortes de una solución guardada.")
+    parser.add_argument("solucion", help="Solución guardada (.json o .npz)")
+    parser.add_argument("salida", help="Archivo .xlsx a generar")
+    args = parser.parse_args(argv)
+    n = exportar_xlsx_solucion(args.solucion, args.salida)
+    print(f"{n} planchas exportadas a {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import pytest
+from shapely.geometry import Polygon
+
+from src.utils.cad_import import simplify_outward
+
+
+def _densificar(vertices, por_arista):
+    puntos = []
+    for a, b in zip(vertices, vertices[1:] + vertices[:1]):
+        for k in range(por_arista):
+            t = k / por_arista
+            puntos.append((a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t))
+    return puntos
+
+
+@pytest.mark.parametrize("vertices, max_vertices", [
+    ([(0, 0), (10, 0), (10, 4), (4, 4), (4, 10), (0, 10)], 6),
+    ([(0, 0), (12, 0), (12, 10), (8, 10), (8, 4), (4, 4), (4, 10), (0, 10)], 8),
+])
+def test_aristas_rectas_densas_se_reducen_sin_agregar_area(vertices, max_vertices):
+    original = Polygon(vertices)
+    resultado = Polygon(simplify_outward(_densificar(vertices, 15), max_vertices))
+
+    assert len(resultado.exterior.coords) - 1 <= max_vertices
+    assert resultado.area == pytest.approx(original.area)
+    assert resultado.buffer(1e-9).contains(original)
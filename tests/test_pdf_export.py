@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.instances import estilo_jakobs
+from src.core.multi_sheet import solve_sheets
+from src.utils.pdf_export import PdfSheetWriter, exportar_pdf, preparar_pagina
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def _planchas():
+    piezas, base, altura = estilo_jakobs()
+    return list(solve_sheets(piezas, base / 2, altura / 2, iterations=1, seed=0))
+
+
+def _escribir(path, planchas, sheets_per_chunk):
+    writer = PdfSheetWriter(path, sheets_per_chunk=sheets_per_chunk)
+    for i, (frame, result) in enumerate(planchas):
+        writer.write_page(preparar_pagina(i, frame, result))
+    writer.close()
+
+
+def test_pdf_por_bloques_es_igual_al_pdf_de_un_solo_bloque(tmp_path):
+    planchas = _planchas()
+    assert len(planchas) > 3
+    por_bloques, unico = str(tmp_path / "bloques.pdf"), str(tmp_path / "unico.pdf")
+    _escribir(por_bloques, planchas, 3)
+    _escribir(unico, planchas, len(planchas))
+
+    lector = pypdf.PdfReader(por_bloques, strict=True)
+    referencia = pypdf.PdfReader(unico, strict=True)
+    assert lector.pdf_header == "%PDF-1.4"
+    assert len(lector.pages) == len(referencia.pages) >= len(planchas)
+    for pagina, esperada in zip(lector.pages, referencia.pages):
+        assert pagina.extract_text() == esperada.extract_text()
+        assert set(pagina["/Resources"]["/XObject"]) == set(esperada["/Resources"]["/XObject"])
+
+
+def test_exportar_pdf_sin_planchas(tmp_path):
+    path = str(tmp_path / "vacio.pdf")
+    assert exportar_pdf(path, []) == 0
+    assert len(pypdf.PdfReader(path, strict=True).pages) == 0
@@ -0,0 +1,26 @@
+from src.core.multi_sheet import solve_sheets
+from src.core.repair import repair_solution
+from src.models import PolygonPiece
+
+
+def _cuadrado(lado):
+    return PolygonPiece("cuadrado", [(0, 0), (lado, 0), (lado, lado), (0, lado)])
+
+
+def test_pieza_agregada_usa_la_plancha_parcialmente_ocupada():
+    piezas = [_cuadrado(15), _cuadrado(10)]
+    frames, results = zip(*solve_sheets(piezas, 40, 30, iterations=1, seed=0))
+    assert len(frames) == 1
+
+    nueva = _cuadrado(3)
+    reparada = repair_solution(list(frames), list(results), piezas + [nueva], iterations=1, seed=0)
+
+    new_frames, new_results = reparada
+    assert len(new_frames) == 1
+    placements = new_results[0]["placements"]
+    assert {id(p.source) for p in placements} == {id(p) for p in piezas + [nueva]}
+    assert new_results[0]["not_placed"] == []
+    for i, a in enumerate(placements):
+        assert new_frames[0].contains(a.piece)
+        for b in placements[i + 1:]:
+            assert a.piece.polygon.intersection(b.piece.polygon).area < 1e-9
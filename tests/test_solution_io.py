@@ -0,0 +1,42 @@
+from collections import defaultdict
+
+import pytest
+
+from src.core.costing import CostIndex
+from src.core.multi_sheet import solve_sheets
+from src.models import PolygonPiece
+from src.utils.solution_io import load_solution, save_solution
+
+
+def _piezas():
+    piezas = []
+    for nombre, lado, precio, cantidad in [("grande", 12, 5.0, 3), ("chica", 5, 20.0, 4)]:
+        for _ in range(cantidad):
+            pieza = PolygonPiece(nombre, [(0, 0), (lado, 0), (lado, lado), (0, lado)])
+            pieza.precio_m2 = precio
+            piezas.append(pieza)
+    return piezas
+
+
+def _costo_por_tipo(frames, results, costos):
+    totales = defaultdict(float)
+    for frame, result in zip(frames, results):
+        datos = costos.sheet(frame, result)
+        for p, costo in zip(result["placements"], datos["costos"]):
+            totales[p.piece.name] += float(costo)
+    return dict(totales)
+
+
+@pytest.mark.parametrize("extension", ["json", "npz"])
+def test_guardar_y_cargar_conserva_el_costo_por_tipo(tmp_path, extension):
+    piezas = _piezas()
+    frames, results = zip(*solve_sheets(piezas, 30, 30, iterations=1, seed=0))
+    antes = _costo_por_tipo(frames, results, CostIndex(piezas, 1.0))
+
+    path = str(tmp_path / f"solucion.{extension}")
+    save_solution(path, list(frames), list(results), precio_m2=1.0)
+    frames, results, _ = load_solution(path)
+    despues = _costo_por_tipo(frames, results, CostIndex([], 1.0))
+
+    assert antes == pytest.approx({"grande": 3 * 144 * 5.0, "chica": 4 * 25 * 20.0})
+    assert despues == pytest.approx(antes)
@@ -0,0 +1,50 @@
+import time
+
+from src.core.multi_sheet import solve_sheets
+from src.core.result_cache import ResultCache
+from src.core.solvers import SOLVERS, PortfolioSolver
+from src.models import Frame, Placement, PolygonPiece
+
+
+class _Registro:
+    """Motor de prueba: coloca la primera pieza y anota con qué parámetros se lo creó."""
+
+    llamadas = []
+    demora = 0.0
+
+    def __init__(self, pieces, frames, time_limit=None, seed_solutions=None, **kwargs):
+        self.pieces, self.frames = pieces, frames
+        _Registro.llamadas.append({"time_limit": time_limit, "seed_solutions": seed_solutions, **kwargs})
+
+    def solve(self):
+        time.sleep(self.demora)
+        pieza = self.pieces[0]
+        placements = [Placement(pieza.move(0, 0), self.frames[0], (0, 0), source=pieza)]
+        return {"placements": placements, "not_placed": self.pieces[1:], "waste": 0.0, "stats": None}
+
+
+def _piezas(n):
+    return [PolygonPiece("cuadrado", [(0, 0), (4, 0), (4, 4), (0, 4)]) for _ in range(n)]
+
+
+def test_portafolio_garantiza_su_parte_y_pasa_la_mejor_como_semilla(monkeypatch):
+    monkeypatch.setitem(SOLVERS, "registro", _Registro)
+    monkeypatch.setattr(_Registro, "llamadas", [])
+    monkeypatch.setattr(_Registro, "demora", 0.3)
+    configs = [("registro", {}), ("registro", {})]
+
+    PortfolioSolver(_piezas(3), [Frame(10, 10)], configs=configs, time_limit=0.2).solve()
+
+    primera, segunda = _Registro.llamadas
+    assert primera["seed_solutions"] is None
+    assert len(segunda["seed_solutions"]) == 1
+    # La primera agotó todo el plazo, pero la segunda igual recibe su parte
+    assert segunda["time_limit"] >= 0.1 * 0.9
+
+
+def test_workers_no_cambia_la_clave_de_la_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(_Registro, "llamadas", [])
+    cache = ResultCache(str(tmp_path))
+    for workers in (0, 2):
+        list(solve_sheets(_piezas(1), 10, 10, cache=cache, solver=_Registro, workers=workers))
+    assert len(_Registro.llamadas) == 1
@@ -0,0 +1,38 @@
+import pytest
+from openpyxl import load_workbook
+
+from src.core.multi_sheet import solve_sheets
+from src.models import PolygonPiece
+from src.utils.solution_io import save_solution
+from src.utils.xlsx_export import SUMMARY_COLUMNS, exportar_xlsx_solucion
+
+
+def _piezas():
+    piezas = []
+    for nombre, lado, precio, cantidad in [("grande", 12, 5.0, 3), ("chica", 5, 20.0, 4)]:
+        for _ in range(cantidad):
+            pieza = PolygonPiece(nombre, [(0, 0), (lado, 0), (lado, lado), (0, lado)])
+            pieza.precio_m2 = precio
+            piezas.append(pieza)
+    return piezas
+
+
+@pytest.mark.parametrize("extension", ["json", "npz"])
+def test_exportar_solucion_guardada_conserva_los_costos(tmp_path, extension):
+    frames, results = zip(*solve_sheets(_piezas(), 20, 20, iterations=1, seed=0))
+    assert len(frames) > 1
+    solucion = str(tmp_path / f"solucion.{extension}")
+    save_solution(solucion, list(frames), list(results), precio_m2=1.0)
+
+    path = str(tmp_path / "cortes.xlsx")
+    assert exportar_xlsx_solucion(solucion, path) == len(frames)
+
+    libro = load_workbook(path, read_only=True)
+    costo_filas = sum(
+        fila[6] for k in range(len(frames)) for fila in libro[f"Plancha {k+1}"].iter_rows(min_row=2, values_only=True)
+    )
+    total = list(libro["Resumen"].iter_rows(values_only=True))[-1]
+    esperado = 3 * 144 * 5.0 + 4 * 25 * 20.0
+    assert costo_filas == pytest.approx(esperado)
+    assert total[0] == "Total"
+    assert total[SUMMARY_COLUMNS.index("Costo piezas")] == pytest.approx(esperado)